@@ -3,53 +3,185 @@ Flask Web Application for Menstrual Cycle Prediction
 Uses pre-trained MLP model for instant startup
 """
 
-from flask import Flask, render_template, request, jsonify
+import time
+STARTED_AT = time.perf_counter()  # for the startup liveness/readiness report
+
+from flask import Flask, render_template, request, jsonify, g, Response
 import os
+import hmac
+import threading
+import numpy as np
 from datetime import datetime, timedelta
-from model import MenstrualCyclePredictionModel, calculate_bmi
+from model import MenstrualCyclePredictionModel, calculate_bmi, DEFAULT_HORIZON, MAX_HORIZON
+from payload import parse_batch_body
+from artifact import artifact_exists
+from lut import PredictionLUT
+from reloader import ModelReloader
+from history_store import CycleHistoryStore, normalize_user_id, user_token, DEFAULT_PATH as HISTORY_PATH
+from calendar_feed import ics_lines
+import metrics
 
 app = Flask(__name__)
 
-# Global model instance
-mcp_model = MenstrualCyclePredictionModel()
+ARTIFACT_PATH = os.environ.get("MCP_ARTIFACT", "model_artifact")
+# "numpy" serves without TensorFlow, "keras" rebuilds the Keras model
+BACKEND = os.environ.get("MCP_BACKEND", "numpy")
+
+# Per-user cycle history, opened on first use
+history = CycleHistoryStore(os.environ.get("MCP_HISTORY_DB", HISTORY_PATH))
+
+def create_model():
+    """A new, unloaded model with the configured cache and micro-batching"""
+    model = MenstrualCyclePredictionModel(
+        cache_size=int(os.environ.get("MCP_CACHE_SIZE", "4096")),
+        cache_ttl=float(os.environ.get("MCP_CACHE_TTL", "3600"))
+    )
+    
+    # Optional micro-batching of concurrent /predict calls
+    if os.environ.get("MCP_MICROBATCH") == "1":
+        model.enable_batching(
+            max_batch=int(os.environ.get("MCP_BATCH_MAX", "64")),
+            max_wait_ms=float(os.environ.get("MCP_BATCH_WAIT_MS", "2"))
+        )
+    return model
+
+def build_model(artifact_path):
+    """Create and load a complete model from an artifact, ready to be swapped in"""
+    model = create_model()
+    model.load(artifact_path, backend=BACKEND)
+    
+    # Optional lookup-table mode: MCP_LUT=<path to a table built by lut.py>
+    lut_path = os.environ.get("MCP_LUT")
+    if lut_path:
+        try:
+            model.enable_lut(PredictionLUT.load(lut_path))
+            print(f"⚡ LUT mode enabled from '{lut_path}'")
+        except Exception as e:
+            print(f"⚠️  LUT not used ({e}), serving from the live model")
+    return model
+
+# Global model instance; replaced as a whole on reload, never modified in place
+mcp_model = create_model()
 model_loaded = False
 
+# Model loading state: idle -> loading -> ready | failed
+load_status = {'state': 'idle', 'error': None, 'seconds': None}
+load_thread = None
+RETRY_AFTER_SECONDS = os.environ.get("MCP_RETRY_AFTER", "2")
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    if metrics.ENABLED and request.url_rule is not None and request.url_rule.rule != '/metrics':
+        metrics.REQUEST_SECONDS.observe(
+            time.perf_counter() - g.request_start, request.url_rule.rule, str(response.status_code)
+        )
+    return response
+
+@metrics.registry.collector
+def cache_and_batching_metrics():
+    """Prediction cache and micro-batcher counters, read at scrape time"""
+    model = mcp_model
+    cache = model.cache.stats()
+    families = [
+        ("mcp_cache_hits_total", "counter", "Prediction cache hits", [({}, cache["hits"])]),
+        ("mcp_cache_misses_total", "counter", "Prediction cache misses", [({}, cache["misses"])]),
+        ("mcp_cache_evictions_total", "counter", "Prediction cache LRU evictions", [({}, cache["evictions"])]),
+        ("mcp_cache_entries", "gauge", "Prediction cache entries", [({}, cache["size"])]),
+        ("mcp_model_loaded", "gauge", "1 when a model is loaded", [({}, int(model_loaded))]),
+    ]
+    if model.batcher is not None:
+        batching = model.batcher.stats()
+        families += [
+            ("mcp_batches_total", "counter", "Micro-batches run", [({}, batching["batches"])]),
+            ("mcp_batched_rows_total", "counter", "Rows predicted through micro-batches", [({}, batching["rows"])]),
+        ]
+    return families
+
 def load_model():
     """Load the pre-trained model"""
-    global mcp_model, model_loaded
-    
+    load_status.update(state='loading', error=None, seconds=None)
+    started = time.perf_counter()
     print("="*60)
     print("Loading pre-trained model...")
     print("="*60)
     
-    model_path = "saved_model"
-    preprocessor_path = "preprocessor.pkl"
+    artifact_path = ARTIFACT_PATH
     
     # Check if model files exist
-    if not os.path.exists(model_path) or not os.path.exists(preprocessor_path):
+    if not artifact_exists(artifact_path):
         print("❌ Model files not found!")
         print("\nPlease train the model first by running:")
         print("   python train_model.py")
         print("\nThis will download the dataset and train the model (one-time setup)")
+        load_status.update(state='failed', error=f"Model artifact not found at '{artifact_path}'",
+                           seconds=time.perf_counter() - started)
         return False
     
     try:
-        mcp_model.load(model_path, preprocessor_path)
-        model_loaded = True
+        swap_model(build_model(artifact_path))
+        load_status['seconds'] = time.perf_counter() - started
         print(f"✅ Model loaded successfully!")
         print(f"   Accuracy: {mcp_model.model_accuracy:.2f}%")
+        print(f"   Ready after {time.perf_counter() - STARTED_AT:.2f}s")
         print("="*60)
         return True
     except Exception as e:
         print(f"❌ Error loading model: {e}")
         import traceback
         traceback.print_exc()
+        load_status.update(state='failed', error=str(e), seconds=time.perf_counter() - started)
         return False
 
+def swap_model(model):
+    """Publish a loaded model; requests already running keep the one they started with"""
+    global mcp_model, model_loaded
+    replaced, mcp_model = mcp_model, model
+    model_loaded = True
+    load_status.update(state='ready', error=None)
+    
+    # Stop the replaced model's batching thread; its in-flight requests are answered inline
+    if replaced is not model and replaced.batcher is not None:
+        replaced.batcher.close()
+
+reloader = ModelReloader(
+    build=build_model,
+    swap=swap_model,
+    current=lambda: mcp_model if model_loaded else None,
+    artifact_path=ARTIFACT_PATH
+)
+
+def start_background_load():
+    """Load the model on a daemon thread so the server accepts connections meanwhile"""
+    global load_thread
+    if load_thread is None or not load_thread.is_alive():
+        load_status['state'] = 'loading'
+        load_thread = threading.Thread(target=load_model, name="model-loader", daemon=True)
+        load_thread.start()
+    return load_thread
+
+def model_unavailable():
+    """503 response for prediction routes while the model is loading or after it failed"""
+    if load_status['state'] == 'loading':
+        response = jsonify({
+            'success': False,
+            'error': 'Model is loading, retry shortly.'
+        })
+        response.headers['Retry-After'] = RETRY_AFTER_SECONDS
+        return response, 503
+    return jsonify({
+        'success': False,
+        'error': load_status['error'] or 'Model not loaded. Please train the model first.'
+    }), 503
+
 @app.route('/')
 def index():
     """Render the input form page"""
-    if not model_loaded:
+    # While loading, serve the form; /predict answers 503 + Retry-After until ready
+    if not model_loaded and load_status['state'] != 'loading':
         return """
         <html>
         <head><title>Model Not Found</title></head>
@@ -69,55 +201,298 @@ def index():
         """
     return render_template('index.html')
 
+def build_user_input(data):
+    """Convert a request record into the model's user input dict and BMI"""
+    # Calculate BMI from weight and height
+    weight = float(data['weight'])  # in kg
+    height = float(data['height'])  # in meters
+    bmi = calculate_bmi(weight, height)
+    
+    # Prepare user input
+    user_input = {
+        "Age": int(data['age']),
+        "BMI": round(bmi, 2),
+        "Stress Level": int(data['stress_level']),
+        "Sleep Hours": float(data['sleep_hours']),
+        "Cycle Length": int(data['cycle_length']),
+        "Period Length": int(data['period_length']),
+        "Exercise Frequency": data['exercise_frequency'],
+        "Diet": data['diet'],
+        "Symptoms": data['symptoms'],
+    }
+    return user_input, bmi
+
+def user_authorized(user_id, data=None):
+    """A user's history needs their token or the admin token
+
+    The token, user_token(MCP_HISTORY_SECRET, user_id), comes in the X-User-Token
+    header or as a "user_token" field (so a calendar feed URL can carry it).
+    Without MCP_HISTORY_SECRET only the admin token is accepted.
+    """
+    if admin_authorized():
+        return True
+    secret = os.environ.get("MCP_HISTORY_SECRET")
+    sent = request.headers.get('X-User-Token') or (data or {}).get('user_token') or ''
+    return bool(secret) and hmac.compare_digest(str(sent), user_token(secret, user_id))
+
+def apply_history(data):
+    """Fill cycle fields a request leaves out from the history of its user_id
+
+    Returns (data, features); features is None without a user_id or recorded history.
+    Raises PermissionError when the request is not authorized for that user_id.
+    """
+    user_id = normalize_user_id(data.get('user_id'))
+    if not user_id:
+        return data, None
+    if not user_authorized(user_id, data):
+        raise PermissionError("Not authorized for this user_id")
+    features = history.features(user_id)
+    if features is None:
+        return data, None
+    
+    filled = dict(data)
+    # Round half up; round() would send a 28.5-day mean to 28
+    mean_length = features['Cycle Length']
+    derived = {
+        'cycle_length': int(np.floor(mean_length + 0.5)) if mean_length is not None else None,
+        'period_length': features['Period Length'],
+        'cycle_start_date': features['last_cycle_start_date'],
+    }
+    for field, value in derived.items():
+        if filled.get(field) in (None, '') and value is not None:
+            filled[field] = value
+    
+    # Say which field the history could not supply instead of failing on a missing key
+    if filled.get('cycle_length') in (None, ''):
+        raise ValueError("Need at least two recorded cycle starts or a cycle_length")
+    if filled.get('period_length') in (None, ''):
+        raise ValueError("No recorded period_length for this user_id; send period_length")
+    return filled, features
+
+def history_summary(features):
+    """The part of a user's history features returned with a prediction"""
+    mean, std = features['Cycle Length'], features['cycle_length_std']
+    return {
+        'cycles': features['cycles'],
+        'cycle_length_mean': round(mean, 1) if mean is not None else None,
+        'cycle_length_std': round(std, 1) if std is not None else None,
+        'last_period_length': features['Period Length'],
+        'last_cycle_start_date': features['last_cycle_start_date'],
+    }
+
+def build_result(data, bmi, pred_days, model, low=None, high=None):
+    """Build the prediction result payload for one request record"""
+    # Calculate predicted date
+    cycle_start = datetime.strptime(data['cycle_start_date'], "%Y-%m-%d")
+    predicted_date = cycle_start + timedelta(days=pred_days)
+    
+    result = {
+        'bmi': round(bmi, 2),
+        'predicted_days_until_next_period': round(pred_days, 1),
+        'predicted_next_cycle_start_date': predicted_date.strftime("%Y-%m-%d"),
+        'accuracy': f"{model.model_accuracy:.1f}%"
+    }
+    # Ensemble models add an earliest/latest likely range (P10-P90)
+    if low is not None:
+        result['likely_days_range'] = [round(low, 1), round(high, 1)]
+        result['earliest_likely_date'] = (cycle_start + timedelta(days=low)).strftime("%Y-%m-%d")
+        result['latest_likely_date'] = (cycle_start + timedelta(days=high)).strftime("%Y-%m-%d")
+    return result
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """Handle prediction request"""
     if not model_loaded:
+        return model_unavailable()
+    # One model for the whole request, even if a reload swaps the global meanwhile
+    model = mcp_model
+    
+    stopwatch = metrics.stopwatch()
+    try:
+        data = request.json
+        stopwatch.lap("parse")
+        # Optional user_id: missing cycle fields come from the recorded history
+        data, features = apply_history(data)
+        stopwatch.lap("history")
+        user_input, bmi = build_user_input(data)
+        stopwatch.lap("validate")
+    except PermissionError as e:
+        stopwatch.finish()
+        metrics.ERRORS.inc('/predict', 'validation')
+        return jsonify({'success': False, 'error': str(e)}), 403
+    except Exception as e:
+        stopwatch.finish()
+        metrics.ERRORS.inc('/predict', 'validation')
         return jsonify({
             'success': False,
-            'error': 'Model not loaded. Please train the model first.'
+            'error': str(e)
         }), 400
     
     try:
-        data = request.json
+        # Make prediction (timed per stage inside the model)
+        pred_days, low, high = model.predict_interval(user_input)
+        stopwatch.reset()
+        result = build_result(data, bmi, pred_days, model, low, high)
+        if features is not None:
+            result['history'] = history_summary(features)
+        stopwatch.lap("result")
         
-        # Calculate BMI from weight and height
-        weight = float(data['weight'])  # in kg
-        height = float(data['height'])  # in meters
-        bmi = calculate_bmi(weight, height)
-        
-        # Prepare user input
-        user_input = {
-            "Age": int(data['age']),
-            "BMI": round(bmi, 2),
-            "Stress Level": int(data['stress_level']),
-            "Sleep Hours": float(data['sleep_hours']),
-            "Cycle Length": int(data['cycle_length']),
-            "Period Length": int(data['period_length']),
-            "Exercise Frequency": data['exercise_frequency'],
-            "Diet": data['diet'],
-            "Symptoms": data['symptoms'],
-        }
+        # Return results
+        response = jsonify({
+            'success': True,
+            'result': result
+        })
+        stopwatch.lap("serialize")
+        stopwatch.finish()
+        metrics.PREDICTIONS.inc('/predict')
+        return response
         
-        # Make prediction
-        pred_days = mcp_model.predict(user_input)
+    except Exception as e:
+        metrics.ERRORS.inc('/predict', 'internal')
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Handle a batch of prediction requests (JSON array or NDJSON)"""
+    if not model_loaded:
+        return model_unavailable()
+    model = mcp_model
+    
+    stopwatch = metrics.stopwatch()
+    try:
+        records = parse_batch_body(request.get_data(), request.mimetype)
+    except ValueError as e:
+        metrics.ERRORS.inc('/predict/batch', 'validation')
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # Validate every record first, invalid ones are reported in place
+    results = [None] * len(records)
+    valid = []
+    for i, data in enumerate(records):
+        try:
+            data, features = apply_history(data)
+            user_input, bmi = build_user_input(data)
+            datetime.strptime(data['cycle_start_date'], "%Y-%m-%d")
+            valid.append((i, data, user_input, bmi, features))
+        except Exception as e:
+            results[i] = {'success': False, 'error': str(e)}
+            metrics.ERRORS.inc('/predict/batch', 'validation')
+    stopwatch.lap("batch_parse")
+    
+    try:
+        # One vectorized pass over all valid records
+        pred_days, low, high = model.predict_batch([v[2] for v in valid], interval=True)
+        stopwatch.reset()
+        for j, (i, data, _, bmi, features) in enumerate(valid):
+            bounds = (float(low[j]), float(high[j])) if low is not None else (None, None)
+            result = build_result(data, bmi, float(pred_days[j]), model, *bounds)
+            if features is not None:
+                result['history'] = history_summary(features)
+            results[i] = {'success': True, 'result': result}
+        stopwatch.lap("batch_result")
+        stopwatch.finish()
+        metrics.PREDICTIONS.inc('/predict/batch', amount=len(valid))
+    except Exception as e:
+        metrics.ERRORS.inc('/predict/batch', 'internal')
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'count': len(results),
+        'results': results
+    })
+
+@app.route('/forecast', methods=['GET', 'POST'])
+def forecast():
+    """Forecast the next cycles as JSON, or as an iCalendar feed with format=ics
+
+    POST takes the /predict body plus "horizon" (default 6, at most 12). GET takes
+    the same fields as query parameters, so calendar apps can subscribe to the feed.
+    """
+    if not model_loaded:
+        return model_unavailable()
+    model = mcp_model
+    
+    stopwatch = metrics.stopwatch()
+    try:
+        data = request.get_json(silent=True) if request.method == 'POST' else request.args.to_dict()
+        if not data:
+            raise ValueError("Missing forecast parameters")
+        stopwatch.lap("parse")
+        data, features = apply_history(data)
+        stopwatch.lap("history")
+        user_input, bmi = build_user_input(data)
+        horizon = int(data.get('horizon', DEFAULT_HORIZON))
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}")
+        cycle_start = np.datetime64(datetime.strptime(data['cycle_start_date'], "%Y-%m-%d").date(), 'D')
+        stopwatch.lap("validate")
+    except PermissionError as e:
+        stopwatch.finish()
+        metrics.ERRORS.inc('/forecast', 'validation')
+        return jsonify({'success': False, 'error': str(e)}), 403
+    except Exception as e:
+        stopwatch.finish()
+        metrics.ERRORS.inc('/forecast', 'validation')
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        # All cycles in one batched forward pass, dates as one datetime64 vector
+        result = model.forecast(user_input, horizon=horizon, cycle_start=cycle_start)
+        stopwatch.reset()
+        dates = np.datetime_as_string(result['dates'])
+        earliest = latest = None
+        if result['low'] is not None:
+            earliest = np.datetime_as_string(cycle_start + np.floor(result['low']).astype('timedelta64[D]'))
+            latest = np.datetime_as_string(cycle_start + np.floor(result['high']).astype('timedelta64[D]'))
+        metrics.PREDICTIONS.inc('/forecast', amount=horizon)
         
-        # Calculate predicted date
-        cycle_start = datetime.strptime(data['cycle_start_date'], "%Y-%m-%d")
-        predicted_date = cycle_start + timedelta(days=pred_days)
+        if (request.args.get('format') or data.get('format')) == 'ics':
+            # Stable event UIDs per user (or per profile) so subscribed calendars update in place
+            key = normalize_user_id(data.get('user_id')) or sorted(user_input.items())
+            stopwatch.lap("result")
+            stopwatch.finish()
+            return Response(ics_lines(result['dates'], key, earliest, latest), mimetype='text/calendar',
+                            headers={'Content-Disposition': 'inline; filename="cycle_forecast.ics"'})
         
-        # Return results
-        return jsonify({
-            'success': True,
-            'result': {
-                'bmi': round(bmi, 2),
-                'predicted_days_until_next_period': round(pred_days, 1),
-                'predicted_next_cycle_start_date': predicted_date.strftime("%Y-%m-%d"),
-                'accuracy': f"{mcp_model.model_accuracy:.1f}%"
+        cycles = []
+        for i in range(horizon):
+            cycle = {
+                'cycle': i + 1,
+                'predicted_start_date': str(dates[i]),
+                'days_after_previous': round(float(result['days'][i]), 1),
+                'days_from_cycle_start': round(float(result['offsets'][i]), 1),
             }
-        })
+            if earliest is not None:
+                cycle['earliest_likely_date'] = str(earliest[i])
+                cycle['latest_likely_date'] = str(latest[i])
+            cycles.append(cycle)
+        response = {
+            'bmi': round(bmi, 2),
+            'horizon': horizon,
+            'accuracy': f"{model.model_accuracy:.1f}%",
+            'cycles': cycles
+        }
+        if features is not None:
+            response['history'] = history_summary(features)
+        stopwatch.lap("result")
+        response = jsonify({'success': True, 'result': response})
+        stopwatch.lap("serialize")
+        stopwatch.finish()
+        return response
         
     except Exception as e:
+        metrics.ERRORS.inc('/forecast', 'internal')
         import traceback
         traceback.print_exc()
         return jsonify({
@@ -125,6 +500,43 @@ def predict():
             'error': str(e)
         }), 400
 
+@app.route('/history', methods=['POST'])
+def record_cycle():
+    """Record a cycle start: {"user_id", "cycle_start_date", "period_length" (optional)}"""
+    try:
+        data = request.json
+        user_id = normalize_user_id(data['user_id'])
+        if not user_id:
+            raise ValueError("user_id must not be empty")
+        if not user_authorized(user_id, data):
+            return jsonify({'success': False, 'error': 'Not authorized for this user_id'}), 403
+        period_length = data.get('period_length')
+        features = history.add_cycle(user_id, data['cycle_start_date'],
+                                     int(period_length) if period_length not in (None, '') else None)
+    except Exception as e:
+        metrics.ERRORS.inc('/history', 'validation')
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({'success': True, 'user_id': user_id, 'history': history_summary(features)})
+
+@app.route('/history/<user_id>')
+def user_history(user_id):
+    """A user's derived cycle features and most recent starts"""
+    user_id = normalize_user_id(user_id)
+    if not user_authorized(user_id, request.args):
+        return jsonify({'success': False, 'error': 'Not authorized for this user_id'}), 403
+    features = history.features(user_id)
+    if features is None:
+        return jsonify({'success': False, 'error': 'No history for this user'}), 404
+    return jsonify({
+        'success': True,
+        'user_id': user_id,
+        'history': history_summary(features),
+        'recent_starts': [
+            {'cycle_start_date': day, 'period_length': period}
+            for day, period in history.history(user_id, limit=12)
+        ]
+    })
+
 @app.route('/results')
 def results():
     """Render the results page"""
@@ -133,35 +545,102 @@ def results():
 @app.route('/health')
 def health():
     """Health check endpoint"""
+    model = mcp_model
     return jsonify({
         'status': 'healthy',
         'model_loaded': model_loaded,
-        'accuracy': f"{mcp_model.model_accuracy:.2f}%" if model_loaded else "N/A"
+        'model_state': load_status['state'],
+        'model_version': model.manifest.get('version') if model.manifest else None,
+        'load_seconds': round(load_status['seconds'], 3) if load_status['seconds'] is not None else None,
+        'load_error': load_status['error'],
+        'accuracy': f"{model.model_accuracy:.2f}%" if model_loaded else "N/A",
+        'cache': model.cache.stats(),
+        'batching': model.batcher.stats() if model.batcher else None,
+        'reload': reloader.status
     })
 
+@app.route('/health/live')
+def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/health/ready')
+def readiness():
+    """Readiness probe: a model is loaded and /predict can be served"""
+    load_seconds = round(load_status['seconds'], 3) if load_status['seconds'] is not None else None
+    if not model_loaded:
+        response = jsonify({
+            'status': load_status['state'],
+            'model_loaded': False,
+            'load_seconds': load_seconds,
+            'error': load_status['error']
+        })
+        if load_status['state'] == 'loading':
+            response.headers['Retry-After'] = RETRY_AFTER_SECONDS
+        return response, 503
+    return jsonify({
+        'status': 'ready',
+        'model_loaded': True,
+        'load_seconds': load_seconds,
+        'model_version': mcp_model.manifest.get('version') if mcp_model.manifest else None
+    })
+
+def admin_authorized():
+    """Admin routes need MCP_ADMIN_TOKEN set and sent back in the X-Admin-Token header"""
+    token = os.environ.get("MCP_ADMIN_TOKEN")
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token)
+
+@app.route('/admin/reload', methods=['GET', 'POST'])
+def admin_reload():
+    """Hot-reload the model (POST) or report the last reload (GET)"""
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Not found'}), 404
+    if request.method == 'GET':
+        return jsonify(reloader.status)
+    
+    # Optional {"artifact": <root or version dir>}; defaults to MCP_ARTIFACT
+    artifact_path = (request.get_json(silent=True) or {}).get('artifact')
+    
+    # ?wait=1 blocks until the new model is serving (or rejected)
+    if request.args.get('wait') == '1':
+        status = reloader.reload(artifact_path)
+        return jsonify(status), 200 if status['state'] == 'succeeded' else 409
+    reloader.reload_async(artifact_path)
+    return jsonify({'success': True, 'status': 'reload started'}), 202
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text-format metrics (disabled with MCP_METRICS=0)"""
+    if not metrics.ENABLED:
+        return jsonify({'error': 'Metrics are disabled (MCP_METRICS=0)'}), 404
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     print("="*60)
     print("🚀 MCP - Menstrual Cycle Prediction Application")
     print("="*60)
     print()
     
-    # Load pre-trained model
-    if load_model():
-        print()
-        print("="*60)
-        print("✨ Application ready!")
-        print("="*60)
-        print()
-        print("🌐 Open your browser and visit:")
-        print("   👉 http://localhost:5000")
-        print()
-        print("Press Ctrl+C to stop the server")
-        print("="*60)
-        print()
-        
-        app.run(debug=True, host='0.0.0.0', port=5000)
-    else:
-        print()
-        print("="*60)
-        print("Please train the model first!")
-        print("="*60)
+    # Live once the app is importable; ready once the model is loaded
+    print(f"💓 Live after {time.perf_counter() - STARTED_AT:.2f}s (imports)")
+    
+    # Load the model in the background: the server accepts connections right away,
+    # /predict answers 503 + Retry-After until /health/ready reports ready
+    start_background_load()
+    
+    # Optional hot reload when a new version is published: MCP_WATCH_INTERVAL=<seconds>
+    watch_interval = float(os.environ.get("MCP_WATCH_INTERVAL", "0"))
+    if watch_interval > 0:
+        reloader.start_watcher(watch_interval)
+        print(f"👀 Watching '{ARTIFACT_PATH}' for new versions every {watch_interval:g}s")
+    
+    print()
+    print("="*60)
+    print("🌐 Open your browser and visit:")
+    print("   👉 http://localhost:5000")
+    print()
+    print("Press Ctrl+C to stop the server")
+    print("="*60)
+    print()
+    
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,177 @@
+"""
+Versioned model artifact format
+
+One directory holds everything a prediction needs: the weight matrices, the
+scaler statistics, the one-hot vocabularies and the evaluation metrics.
+
+    model_artifact/
+        CURRENT             name of the active version, swapped atomically
+        v0001/
+            manifest.json   format version, columns, vocabularies, metrics, array index
+            W0.npy b0.npy   ...one .npy per array, loadable with np.load(mmap_mode="r")
+            model.onnx      optional extra files, e.g. the ONNX export of the pipeline
+
+Arrays are plain .npy files so every worker maps the same physical pages, and
+the manifest records a SHA-256 per array so a load can never mix files from
+different trainings.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+import numpy as np
+
+FORMAT_NAME = "mcp-model"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+
+class ArtifactError(ValueError):
+    """Raised when an artifact is missing, corrupt or of an unsupported format"""
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _list_versions(root):
+    if not os.path.isdir(root):
+        return []
+    return sorted(d for d in os.listdir(root) if d.startswith("v") and d[1:].isdigit())
+
+def resolve_artifact(path):
+    """Return the version directory for an artifact root or a version directory"""
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return path
+
+    current = os.path.join(path, CURRENT_FILE)
+    if not os.path.exists(current):
+        raise ArtifactError(f"No model artifact found at '{path}'")
+    with open(current) as f:
+        version = f.read().strip()
+    version_dir = os.path.join(path, version)
+    if not os.path.exists(os.path.join(version_dir, MANIFEST_FILE)):
+        raise ArtifactError(f"'{path}' points at missing version '{version}'")
+    return version_dir
+
+def artifact_exists(path):
+    try:
+        resolve_artifact(path)
+        return True
+    except ArtifactError:
+        return False
+
+def save_artifact(root, arrays, meta, files=None):
+    """Write a new version under `root` and make it current, returns the version directory
+
+    `files` maps extra file names to bytes (e.g. an ONNX export) stored next to the arrays.
+    """
+    os.makedirs(root, exist_ok=True)
+    versions = _list_versions(root)
+    version = f"v{int(versions[-1][1:]) + 1 if versions else 1:04d}"
+
+    # Build the version in a temp directory, then rename it into place
+    tmp_dir = os.path.join(root, f".{version}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    index = {}
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        file_name = f"{name}.npy"
+        np.save(os.path.join(tmp_dir, file_name), arr, allow_pickle=False)
+        index[name] = {
+            "file": file_name,
+            "dtype": arr.dtype.str,
+            "shape": list(arr.shape),
+            "sha256": _sha256(os.path.join(tmp_dir, file_name)),
+        }
+
+    extra = {}
+    for file_name, data in (files or {}).items():
+        with open(os.path.join(tmp_dir, file_name), "wb") as f:
+            f.write(data)
+        extra[file_name] = {"sha256": _sha256(os.path.join(tmp_dir, file_name))}
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "arrays": index,
+        **({"files": extra} if extra else {}),
+        **meta,
+    }
+    # Identifies this exact set of arrays and metadata (used e.g. to invalidate caches)
+    manifest["artifact_id"] = hashlib.sha256(
+        json.dumps(manifest, sort_keys=True).encode()
+    ).hexdigest()[:16]
+
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    version_dir = os.path.join(root, version)
+    os.rename(tmp_dir, version_dir)
+    set_current(root, version)
+    return version_dir
+
+def current_version(root):
+    """Version named by root/CURRENT, or None when root is not an artifact root"""
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def set_current(root, version):
+    """Atomically repoint root/CURRENT at an existing version"""
+    if not os.path.exists(os.path.join(root, version, MANIFEST_FILE)):
+        raise ArtifactError(f"'{root}' has no version '{version}'")
+    tmp_current = os.path.join(root, f".{CURRENT_FILE}.tmp-{os.getpid()}")
+    with open(tmp_current, "w") as f:
+        f.write(version)
+    os.replace(tmp_current, os.path.join(root, CURRENT_FILE))
+
+def load_artifact(path, mmap_mode="r", verify=True):
+    """Load (arrays, manifest) from an artifact root or version directory
+
+    With mmap_mode="r" the arrays are read-only memory maps shared by every process
+    that loads the same files.
+    """
+    version_dir = resolve_artifact(path)
+    with open(os.path.join(version_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != FORMAT_NAME:
+        raise ArtifactError(f"'{version_dir}' is not an MCP model artifact")
+    if manifest.get("format_version", 0) > FORMAT_VERSION:
+        raise ArtifactError(
+            f"Artifact format version {manifest['format_version']} is newer than supported ({FORMAT_VERSION})"
+        )
+
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        file_path = os.path.join(version_dir, entry["file"])
+        if verify and _sha256(file_path) != entry["sha256"]:
+            raise ArtifactError(f"Checksum mismatch for '{file_path}'")
+        arr = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+        if list(arr.shape) != entry["shape"]:
+            raise ArtifactError(f"Shape mismatch for '{file_path}'")
+        arrays[name] = arr
+    for file_name, entry in manifest.get("files", {}).items():
+        file_path = os.path.join(version_dir, file_name)
+        if verify and _sha256(file_path) != entry["sha256"]:
+            raise ArtifactError(f"Checksum mismatch for '{file_path}'")
+    return arrays, manifest
+
+def artifact_file(path, file_name):
+    """Path of an extra file stored with the artifact version (see save_artifact(files=...))"""
+    version_dir = resolve_artifact(path)
+    file_path = os.path.join(version_dir, file_name)
+    if not os.path.exists(file_path):
+        raise ArtifactError(f"'{version_dir}' has no file '{file_name}'")
+    return file_path
@@ -0,0 +1,102 @@
+"""
+Inference backends selectable at load time
+
+Every backend is built from the same exported (kernels, biases, activations),
+plus per-layer scales for int8 kernels (quantize.py), and exposes predict(X)
+over an encoded (n, n_features) matrix, returning an (n,) array, like NumpyMLP:
+
+  - numpy        NumpyMLP, no extra dependencies (the default)
+  - onnxruntime  the network as an ONNX graph run by an onnxruntime CPU session
+  - sklearn      an MLPRegressor carrying the same weights
+
+The Keras backend rebuilds a full tf.keras model and is handled by
+MenstrualCyclePredictionModel.load itself. onnx/onnxruntime and scikit-learn
+are imported only when their backend is created.
+"""
+
+import os
+import numpy as np
+from numpy_engine import NumpyMLP
+
+BACKENDS = ("numpy", "onnxruntime", "sklearn", "keras")
+
+# Keras activation names -> sklearn's
+SKLEARN_ACTIVATIONS = {"linear": "identity", "sigmoid": "logistic"}
+
+class OnnxEngine:
+    """onnxruntime session over the network graph from onnx_export.build_mlp_graph"""
+
+    def __init__(self, kernels, biases, activations, scales=None, threads=None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("The onnxruntime backend needs onnx and onnxruntime: uv sync --extra onnx") from None
+        from onnx_export import build_mlp_graph
+
+        self.kernels = list(kernels)
+        self.biases = list(biases)
+        self.activations = [str(a) for a in activations]
+        self.scales = list(scales) if scales is not None else [None] * len(self.kernels)
+        # float32 throughout: what Keras trains in and what ORT's CPU kernels are fastest at
+        self.dtype = np.float32
+        self.n_features = self.kernels[0].shape[0]
+
+        options = ort.SessionOptions()
+        threads = threads or int(os.environ.get("MCP_ORT_THREADS", 1))
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        graph = build_mlp_graph(self.kernels, self.biases, self.activations, dtype=self.dtype, scales=self.scales)
+        self.session = ort.InferenceSession(graph.SerializeToString(), options,
+                                            providers=["CPUExecutionProvider"])
+        self._run = self.session.run
+
+    def predict(self, X):
+        """Forward pass over an (n, n_features) matrix, returns an (n,) array"""
+        X = np.asarray(X, dtype=self.dtype).reshape(-1, self.n_features)
+        return self._run(["days"], {"X": X})[0].reshape(-1)
+
+class SklearnEngine:
+    """MLPRegressor with the exported weights set directly (no fitting)"""
+
+    def __init__(self, kernels, biases, activations, scales=None):
+        from sklearn.neural_network import MLPRegressor
+        from quantize import dequantize
+
+        names = [SKLEARN_ACTIVATIONS.get(a, a) for a in activations]
+        hidden = set(names[:-1])
+        if len(hidden) > 1 or names[-1] != "identity":
+            raise ValueError(f"MLPRegressor needs one hidden activation and a linear output, got {activations}")
+
+        self.kernels = list(kernels)
+        self.biases = list(biases)
+        self.activations = [str(a) for a in activations]
+        self.scales = list(scales) if scales is not None else [None] * len(self.kernels)
+        self.n_features = self.kernels[0].shape[0]
+        # MLPRegressor only computes in float, so quantized kernels are expanded once here
+        float_kernels = self.kernels if scales is None else dequantize(self.kernels, self.scales)
+
+        regressor = MLPRegressor(hidden_layer_sizes=tuple(w.shape[1] for w in self.kernels[:-1]),
+                                 activation=hidden.pop() if hidden else "identity")
+        regressor.coefs_ = [np.array(w) for w in float_kernels]
+        regressor.intercepts_ = [np.array(b) for b in self.biases]
+        regressor.n_layers_ = len(self.kernels) + 1
+        regressor.n_outputs_ = self.kernels[-1].shape[1]
+        regressor.out_activation_ = "identity"
+        regressor.n_features_in_ = self.n_features
+        self.regressor = regressor
+
+    def predict(self, X):
+        """Forward pass over an (n, n_features) matrix, returns an (n,) array"""
+        X = np.asarray(X).reshape(-1, self.n_features)
+        return np.asarray(self.regressor.predict(X)).reshape(-1)
+
+def create_engine(backend, kernels, biases, activations, scales=None):
+    """Inference engine for a backend name; "keras" is built by the model itself"""
+    if backend == "numpy":
+        return NumpyMLP(kernels, biases, activations, scales)
+    if backend == "onnxruntime":
+        return OnnxEngine(kernels, biases, activations, scales)
+    if backend == "sklearn":
+        return SklearnEngine(kernels, biases, activations, scales)
+    raise ValueError(f"Unknown backend: {backend} (choose from {', '.join(BACKENDS)})")
@@ -0,0 +1,153 @@
+"""
+Micro-batching scheduler for single-row predictions
+
+Concurrent callers submit encoded rows; a background thread collects them for up to
+max_wait_ms or max_batch rows, runs one inference call on the stacked matrix and
+resolves each caller's future. Works with threaded servers (gunicorn --threads,
+Flask's threaded dev server); the worker thread starts lazily so it is created in
+each forked worker rather than in a preloading master. close() stops the thread
+once the batcher's model has been replaced.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+
+# Queued by close() to wake the worker thread out of its blocking get()
+_STOP = object()
+
+class MicroBatcher:
+    """Collects single rows into batches for one vectorized inference call"""
+
+    def __init__(self, infer, max_batch=64, max_wait_ms=2.0, sample_size=10000):
+        self.infer = infer
+        self.max_batch = int(max_batch)
+        self.max_wait = float(max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+        # Metrics
+        self.batches = 0
+        self.rows = 0
+        self.errors = 0
+        self.batch_size_counts = {}  # power-of-two upper bound -> batches
+        self._queue_times = deque(maxlen=sample_size)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if not self._closed and (self._thread is None or self._pid != os.getpid()):
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, row):
+        """Queue one encoded row, returns a Future resolving to its prediction"""
+        future = Future()
+        # Copy: callers may pass a reused buffer
+        row = np.array(row, dtype=np.float64).reshape(-1)
+        if not self._closed:
+            self._ensure_started()
+            # Under the lock so no row is queued behind close()'s stop marker
+            with self._lock:
+                if not self._closed:
+                    self._queue.put((row, time.perf_counter(), future))
+                    return future
+
+        # Requests still running on a replaced model: answer inline
+        try:
+            future.set_result(float(self.infer(row[None])[0]))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def predict(self, row, timeout=None):
+        """Blocking helper: submit a row and wait for its prediction"""
+        return self.submit(row).result(timeout)
+
+    def close(self, timeout=5.0):
+        """Stop the worker thread after it answers the rows already queued"""
+        with self._lock:
+            self._closed = True
+            thread = self._thread if self._pid == os.getpid() else None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _collect(self):
+        """Block for the first item, then gather more until the batch is full or the wait expires
+
+        Returns None once close() has queued the stop marker and nothing is left before it.
+        """
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        items = [first]
+        deadline = first[1] + self.max_wait
+        while len(items) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Answer this batch first; the next _collect() sees the marker
+                self._queue.put(_STOP)
+                break
+            items.append(item)
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            if items is None:
+                return
+            started = time.perf_counter()
+            try:
+                preds = self.infer(np.stack([row for row, _, _ in items]))
+            except Exception as e:
+                self.errors += 1
+                for _, _, future in items:
+                    future.set_exception(e)
+                continue
+
+            for (_, _, future), pred in zip(items, preds):
+                future.set_result(float(pred))
+            self._record(items, started)
+
+    def _record(self, items, started):
+        size = len(items)
+        bucket = 1 << (size - 1).bit_length()
+        with self._lock:
+            self.batches += 1
+            self.rows += size
+            self.batch_size_counts[bucket] = self.batch_size_counts.get(bucket, 0) + 1
+            self._queue_times.extend(started - submitted for _, submitted, _ in items)
+
+    def stats(self):
+        """Batch-size distribution and queue-time summary"""
+        with self._lock:
+            queue_ms = np.array(self._queue_times) * 1000.0
+            return {
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": self.batches,
+                "rows": self.rows,
+                "errors": self.errors,
+                "mean_batch_size": round(self.rows / self.batches, 2) if self.batches else 0.0,
+                "batch_size_distribution": {f"<={k}": v for k, v in sorted(self.batch_size_counts.items())},
+                "queue_time_ms": {
+                    "p50": round(float(np.percentile(queue_ms, 50)), 3) if len(queue_ms) else 0.0,
+                    "p99": round(float(np.percentile(queue_ms, 99)), 3) if len(queue_ms) else 0.0,
+                    "max": round(float(queue_ms.max()), 3) if len(queue_ms) else 0.0,
+                },
+            }
@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the MCP models and Flask apps
+Run from the project root, e.g. python -m benchmarks.bench_batch
+"""
@@ -0,0 +1,7 @@
+"""
+Entry point for the full benchmark suite: python -m benchmarks
+"""
+
+from benchmarks.suite import main
+
+main()
@@ -0,0 +1,146 @@
+"""
+Inference backend parity and speed: numpy / onnxruntime / sklearn / keras
+
+Loads one artifact with every backend and asserts they predict the same days
+(within float32 tolerance) on the same encoded rows. Also checks the full-pipeline
+ONNX exports against their source: the model.py artifact (raw features in, scaler
+and one-hot folded into the graph) and a main.py-style sklearn Pipeline. Then
+reports per-call latency for one row and rows/s for batches. Exits 1 on any
+parity failure.
+
+    python -m benchmarks.bench_backends --artifact model_artifact
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from benchmarks.common import make_frame, make_records
+from benchmarks.suite import latency, percentiles
+
+# Days; float32 forward passes differ from float64 ones around 1e-5
+ATOL = 1e-3
+
+def check(name, expected, actual, atol=ATOL):
+    max_diff = float(np.max(np.abs(np.asarray(expected, dtype=np.float64) - np.asarray(actual, dtype=np.float64))))
+    ok = max_diff <= atol
+    print(f"{'✅' if ok else '❌'} {name}: max diff {max_diff:.2e} days (atol {atol:g})")
+    return ok
+
+def encode(encoder, records):
+    """Encoded (n, n_features) matrix, one transform_one row per record"""
+    X = np.empty((len(records), encoder.n_features))
+    for i, record in enumerate(records):
+        encoder.transform_one(record, out=X[i:i + 1])
+    return X
+
+def load_backends(artifact, names):
+    from model import MenstrualCyclePredictionModel
+    models = {}
+    for name in names:
+        try:
+            models[name] = MenstrualCyclePredictionModel(cache_size=0).load(artifact, backend=name)
+        except ImportError as e:
+            print(f"⚠️  Skipping {name}: {e}")
+    return models
+
+def pipeline_parity(rows, seed):
+    """main.py's Pipeline recipe fitted on synthetic data, exported, compared with pipeline.predict"""
+    import onnxruntime as ort
+    from sklearn.compose import ColumnTransformer
+    from sklearn.neural_network import MLPRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+    from fast_encoder import FastEncoder
+    from model import NUM_COLS, CAT_COLS, TARGET_COL
+    from onnx_export import export_pipeline, pipeline_inputs
+
+    df = make_frame(2000, seed=seed)
+    pipeline = Pipeline([
+        ("preprocessor", ColumnTransformer([
+            ("num", StandardScaler(), NUM_COLS),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), CAT_COLS),
+        ])),
+        ("regressor", MLPRegressor(hidden_layer_sizes=(32, 16), max_iter=500, early_stopping=True, random_state=42)),
+    ])
+    pipeline.fit(df[NUM_COLS + CAT_COLS], df[TARGET_COL])
+
+    X = make_frame(rows, seed=seed + 1)[NUM_COLS + CAT_COLS]
+    # One unseen category per column: the one-hot block is all zeros, as with handle_unknown="ignore"
+    X.loc[X.index[:3], CAT_COLS] = "unseen"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = export_pipeline(pipeline, os.path.join(tmp_dir, "main_model.onnx"))
+        session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+    encoder = FastEncoder.from_preprocessor(pipeline.named_steps["preprocessor"])
+    actual = session.run(None, pipeline_inputs(X.to_dict(orient="records"), encoder))[0].reshape(-1)
+    return check("main.py Pipeline -> ONNX vs pipeline.predict", pipeline.predict(X), actual)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", help="model artifact to load (trains a small model if omitted)")
+    parser.add_argument("--backends", default="numpy,onnxruntime,sklearn,keras")
+    parser.add_argument("--rows", type=int, default=5000, help="rows for the parity check and batch throughput")
+    parser.add_argument("--calls", type=int, default=5000, help="single-row calls per backend")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    import onnxruntime as ort
+    from model import MenstrualCyclePredictionModel, normalize_record
+    from onnx_export import build_pipeline_graph, pipeline_inputs
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        artifact = args.artifact
+        if not artifact:
+            trained = MenstrualCyclePredictionModel(cache_size=0)
+            trained.train(make_frame(2000, seed=42), verbose=0)
+            artifact = os.path.join(tmp_dir, "model_artifact")
+            trained.save(artifact)
+        models = load_backends(artifact, args.backends.split(","))
+
+    reference = models.get("numpy") or next(iter(models.values()))
+    records = [normalize_record(r) for r in make_records(args.rows, seed=7)]
+    X = encode(reference.encoder, records)
+    expected = reference.infer(X)
+
+    print("=" * 70)
+    ok = True
+    for name, model in models.items():
+        ok &= check(f"{name} vs numpy (encoded rows)", expected, model.infer(X))
+        ok &= check(f"{name} vs numpy (predict)", [reference.predict(r) for r in records[:50]],
+                    [model.predict(r) for r in records[:50]])
+
+    # Full pipeline graph: raw features in, days out
+    graph = build_pipeline_graph(reference.encoder, *reference.weights())
+    session = ort.InferenceSession(graph.SerializeToString(), providers=["CPUExecutionProvider"])
+    unseen = [dict(r, **{"Diet": "unseen"}) for r in records[:3]]
+    feed = pipeline_inputs(unseen + records, reference.encoder)
+    X_unseen = encode(reference.encoder, unseen + records)
+    ok &= check("artifact -> ONNX pipeline vs encoder + numpy", reference.infer(X_unseen),
+                session.run(None, feed)[0].reshape(-1))
+    ok &= pipeline_parity(args.rows, seed=11)
+
+    print("-" * 70)
+    print(f"{'backend':<12} {'1 row p50':>10} {'1 row p99':>10} {f'batch {args.batch_size}':>14} {'rows/s':>12}")
+    rows = [X[i:i + 1] for i in range(min(args.calls, len(X)))]
+    for name, model in models.items():
+        # keras.predict costs milliseconds per call; a few hundred calls give stable percentiles
+        single = percentiles(latency(model.infer, rows[:200] if name == "keras" else rows), 1e6)
+        batch = X[:args.batch_size]
+        model.infer(batch)
+        start, n = time.perf_counter(), 0
+        while time.perf_counter() - start < 1.0:
+            model.infer(batch)
+            n += 1
+        per_batch = (time.perf_counter() - start) / n
+        print(f"{name:<12} {single['p50']:>7.1f} us {single['p99']:>7.1f} us "
+              f"{per_batch * 1000:>11.2f} ms {len(batch) / per_batch:>12,.0f}")
+    print("=" * 70)
+
+    if not ok:
+        sys.exit(1)
+    print("✅ All backends agree")
+
+if __name__ == "__main__":
+    main()
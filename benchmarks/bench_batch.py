@@ -0,0 +1,51 @@
+"""
+Batch prediction throughput: predict_batch() versus looping over predict()
+
+    python -m benchmarks.bench_batch --target model --rows 5000
+    python -m benchmarks.bench_batch --target main --rows 5000
+"""
+
+import argparse
+import numpy as np
+from benchmarks.common import make_frame, make_records, timed
+
+def load_target(target):
+    """Return (single predict fn, batch predict fn) for the requested app"""
+    if target == "main":
+        import main
+        return main.predict_cycle, main.predict_cycle_batch
+
+    from model import MenstrualCyclePredictionModel
+    mcp_model = MenstrualCyclePredictionModel()
+    mcp_model.train(make_frame(2000, seed=42))
+    return mcp_model.predict, mcp_model.predict_batch
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["model", "main"], default="model")
+    parser.add_argument("--rows", type=int, default=5000, help="rows scored by predict_batch")
+    parser.add_argument("--loop-rows", type=int, default=200, help="rows scored one at a time by predict")
+    args = parser.parse_args()
+
+    predict_one, predict_batch = load_target(args.target)
+    records = make_records(args.rows, seed=1)
+    loop_records = records[:args.loop_rows]
+
+    loop_time, loop_preds = timed(lambda: [predict_one(r) for r in loop_records])
+    batch_time, batch_preds = timed(predict_batch, records, repeat=3)
+
+    # Same rows, same answers
+    max_diff = float(np.max(np.abs(np.asarray(loop_preds) - batch_preds[:len(loop_preds)])))
+
+    loop_rate = len(loop_records) / loop_time
+    batch_rate = len(records) / batch_time
+    print("=" * 60)
+    print(f"Target: {args.target}")
+    print(f"predict() loop:  {loop_rate:12,.0f} rows/sec ({len(loop_records)} rows)")
+    print(f"predict_batch(): {batch_rate:12,.0f} rows/sec ({len(records)} rows)")
+    print(f"Speedup:         {batch_rate / loop_rate:12,.1f}x")
+    print(f"Max |loop - batch| difference: {max_diff:.2e} days")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+FastEncoder regression check and single-row latency benchmark
+
+Checks that FastEncoder.transform_one / transform reproduce preprocessor.transform
+bit for bit (both the passthrough preprocessor from model.py and the StandardScaler
+one from main.py), then times one-row encoding through each path.
+
+    python -m benchmarks.bench_encoder
+"""
+
+import argparse
+import time
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from benchmarks.common import make_frame
+from fast_encoder import FastEncoder
+from model import NUM_COLS, CAT_COLS
+
+def build_preprocessors(train):
+    """The two fitted preprocessors used by model.py and main.py"""
+    preprocessors = {
+        "passthrough": ColumnTransformer([
+            ("num", "passthrough", NUM_COLS),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), CAT_COLS),
+        ]),
+        "standard_scaler": ColumnTransformer([
+            ("num", StandardScaler(), NUM_COLS),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), CAT_COLS),
+        ]),
+    }
+    for pre in preprocessors.values():
+        pre.fit(train[NUM_COLS + CAT_COLS])
+    return preprocessors
+
+def dense(X):
+    return X.toarray() if hasattr(X, "toarray") else np.asarray(X)
+
+def check_parity(pre, encoder, X):
+    """Assert the encoder output equals preprocessor.transform exactly"""
+    expected = dense(pre.transform(X))
+
+    batch = encoder.transform(X)
+    if not np.array_equal(batch, expected):
+        raise AssertionError("FastEncoder.transform differs from preprocessor.transform")
+
+    for i, record in enumerate(X.to_dict(orient="records")):
+        row = encoder.transform_one(record)
+        if not np.array_equal(row[0], expected[i]):
+            raise AssertionError(f"FastEncoder.transform_one differs on row {i}: {record}")
+
+def latency_us(fn, n):
+    """Median per-call latency in microseconds"""
+    samples = np.empty(n)
+    for i in range(n):
+        start = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - start
+    return np.median(samples) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="rows checked for parity")
+    parser.add_argument("--calls", type=int, default=2000, help="calls timed per path")
+    args = parser.parse_args()
+
+    train = make_frame(1000, seed=42)
+    X = make_frame(args.rows, seed=7)[NUM_COLS + CAT_COLS]
+    # Unseen categories must encode to an all-zero block
+    X.loc[X.index[::50], "Diet"] = "paleo"
+
+    print("=" * 60)
+    for name, pre in build_preprocessors(train).items():
+        encoder = FastEncoder.from_preprocessor(pre)
+        check_parity(pre, encoder, X)
+
+        X_one = X.iloc[[0]]
+        record = X_one.to_dict(orient="records")[0]
+        sk = latency_us(lambda: dense(pre.transform(X_one)), args.calls)
+        fast = latency_us(lambda: encoder.transform_one(record), args.calls)
+
+        print(f"{name}: parity OK on {len(X)} rows")
+        print(f"   preprocessor.transform (1 row): {sk:10.1f} us")
+        print(f"   FastEncoder.transform_one:      {fast:10.1f} us ({sk / fast:.0f}x faster)")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
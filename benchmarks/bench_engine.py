@@ -0,0 +1,102 @@
+"""
+NumPy engine parity and latency versus the original Keras / sklearn models
+
+Trains the Keras model (model.py) and the sklearn Pipeline (main.py recipe) on
+synthetic data, round-trips their weights through .npz, asserts the NumPy forward
+pass matches within float tolerance, then compares cold start and per-call latency.
+
+    python -m benchmarks.bench_engine
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from benchmarks.common import make_frame
+from numpy_engine import NumpyMLP, export_weights
+
+def median_us(fn, n):
+    samples = np.empty(n)
+    for i in range(n):
+        start = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - start
+    return np.median(samples) * 1e6
+
+def report(name, original_fn, engine, X, atol, calls):
+    """Check parity on X and print one-row latency for both paths"""
+    expected = original_fn(X)
+    actual = engine.predict(X)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    if not np.allclose(expected, actual, atol=atol, rtol=0):
+        raise AssertionError(f"{name}: NumPy engine differs by {max_diff:.2e} (atol {atol:g})")
+
+    row = X[:1]
+    original = median_us(lambda: original_fn(row), calls)
+    fast = median_us(lambda: engine.predict(row), calls)
+    print(f"{name}: parity OK on {len(X)} rows (max diff {max_diff:.2e})")
+    print(f"   original predict (1 row): {original:10.1f} us")
+    print(f"   NumpyMLP.predict (1 row): {fast:10.1f} us ({original / fast:.0f}x faster)")
+
+def roundtrip(model, tmp_dir, name):
+    """Export to .npz and time loading it back"""
+    path = export_weights(model, os.path.join(tmp_dir, f"{name}.npz"))
+    start = time.perf_counter()
+    engine = NumpyMLP.load(path)
+    print(f"{name}: .npz size {os.path.getsize(path) / 1024:.1f} KiB, "
+          f"load {(time.perf_counter() - start) * 1000:.2f} ms")
+    return engine
+
+def bench_sklearn(tmp_dir, X_frame, calls):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.neural_network import MLPRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+    from model import NUM_COLS, CAT_COLS
+
+    train = make_frame(1000, seed=42)
+    pipeline = Pipeline([
+        ("preprocessor", ColumnTransformer([
+            ("num", StandardScaler(), NUM_COLS),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), CAT_COLS),
+        ])),
+        ("regressor", MLPRegressor(hidden_layer_sizes=(32, 16), max_iter=500, random_state=42,
+                                   early_stopping=True, validation_fraction=0.2)),
+    ])
+    pipeline.fit(train[NUM_COLS + CAT_COLS], train["days_until_next_period"])
+
+    X = pipeline.named_steps["preprocessor"].transform(X_frame)
+    engine = roundtrip(pipeline, tmp_dir, "sklearn")
+    report("sklearn", pipeline.named_steps["regressor"].predict, engine, X, 1e-9, calls)
+
+def bench_keras(tmp_dir, X_frame, calls):
+    from model import MenstrualCyclePredictionModel
+
+    mcp_model = MenstrualCyclePredictionModel()
+    mcp_model.train(make_frame(2000, seed=42))
+
+    X = mcp_model.encoder.transform(X_frame)
+    engine = roundtrip(mcp_model.model, tmp_dir, "keras")
+    keras_predict = lambda X: mcp_model.model.predict(X, verbose=0).flatten()
+    report("keras", keras_predict, engine, X, 1e-4, calls)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="rows checked for parity")
+    parser.add_argument("--calls", type=int, default=200, help="calls timed per path")
+    parser.add_argument("--skip-keras", action="store_true", help="only check the sklearn model")
+    args = parser.parse_args()
+
+    from model import NUM_COLS, CAT_COLS
+    X_frame = make_frame(args.rows, seed=7)[NUM_COLS + CAT_COLS]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print("=" * 60)
+        bench_sklearn(tmp_dir, X_frame, args.calls)
+        if not args.skip_keras:
+            bench_keras(tmp_dir, X_frame, args.calls)
+        print("=" * 60)
+
+if __name__ == "__main__":
+    main()
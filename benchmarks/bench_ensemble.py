@@ -0,0 +1,86 @@
+"""
+Ensemble prediction intervals: stacked single-pass forward versus a single model
+
+Trains K bootstrap members in parallel (or loads an ensemble artifact), then:
+  - asserts the stacked (K, in, out) forward pass equals each member run on its own
+  - reports held-out MAE and how often the P10-P90 likely range covers the target
+  - compares latency of one model, the stacked ensemble, and K separate passes
+
+    python -m benchmarks.bench_ensemble --members 8 --rows 20000
+    python -m benchmarks.bench_ensemble --artifact model_artifact
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+from benchmarks.suite import latency, percentiles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", help="ensemble artifact to load (trains one if omitted)")
+    parser.add_argument("--members", type=int, default=8)
+    parser.add_argument("--workers", type=int, help="training processes (default: one per core)")
+    parser.add_argument("--rows", type=int, default=20000, help="synthetic training rows")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    from model import MenstrualCyclePredictionModel, normalize_record
+    from numpy_engine import NumpyMLP
+    from ensemble import INTERVAL_Z
+    from benchmarks.common import make_records
+
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": args.epochs}, cache_size=0)
+    if args.artifact:
+        mcp_model.load(args.artifact)
+        if not mcp_model.has_intervals:
+            sys.exit(f"❌ {args.artifact} is not an ensemble artifact")
+    else:
+        from synthetic_data import generate_frame
+        start = time.perf_counter()
+        mcp_model.train_ensemble(generate_frame(args.rows), n_members=args.members, workers=args.workers)
+        print(f"⏱️  Trained {args.members} members in {time.perf_counter() - start:.1f}s")
+
+    engine = mcp_model.engine
+    members = [
+        NumpyMLP([w[k] for w in engine.kernels], [b[k] for b in engine.biases], engine.activations, engine.scales)
+        for k in range(engine.n_members)
+    ]
+    records = [normalize_record(r) for r in make_records(args.calls, seed=3)]
+    X = np.empty((len(records), engine.n_features))
+    for i, record in enumerate(records):
+        mcp_model.encoder.transform_one(record, out=X[i:i + 1])
+
+    stacked = engine.predict_members(X)
+    separate = np.stack([m.predict(X) for m in members])
+    max_diff = float(np.max(np.abs(stacked - separate)))
+
+    rows = [X[i:i + 1] for i in range(len(X))]
+    single = percentiles(latency(members[0].predict, rows), 1e6)
+    ensemble = percentiles(latency(engine.interval, rows), 1e6)
+    
+    def separate_interval(x):
+        preds = np.stack([m.predict(x) for m in members])
+        mean = preds.mean(axis=0)
+        half = INTERVAL_Z * np.sqrt(preds.var(axis=0, ddof=1) + engine.noise_std ** 2)
+        return mean, mean - half, mean + half
+    loop = percentiles(latency(separate_interval, rows), 1e6)
+
+    print("=" * 64)
+    print(f"Members: {engine.n_members}   stacked vs separate max diff: {max_diff:.2e} days")
+    if "interval_coverage" in mcp_model.metrics:
+        print(f"Held-out MAE {mcp_model.metrics['mae']:.4f} days, residual noise std {engine.noise_std:.3f}, "
+              f"P10-P90 coverage {mcp_model.metrics['interval_coverage']:.1%}")
+    print(f"{'1 row':<34} {'p50':>10} {'p99':>10}")
+    print(f"{'single model':<34} {single['p50']:>7.1f} us {single['p99']:>7.1f} us")
+    print(f"{'stacked ensemble + P10/P90':<34} {ensemble['p50']:>7.1f} us {ensemble['p99']:>7.1f} us")
+    print(f"{f'{engine.n_members} separate passes + P10/P90':<34} {loop['p50']:>7.1f} us {loop['p99']:>7.1f} us")
+    print("=" * 64)
+    if max_diff > 1e-4:
+        print("❌ Stacked forward pass differs from the members")
+        sys.exit(1)
+    print("✅ Stacked forward pass matches every member")
+
+if __name__ == "__main__":
+    main()
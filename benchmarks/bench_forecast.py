@@ -0,0 +1,73 @@
+"""
+Multi-cycle forecast: one batched call versus predict() in a loop
+
+For each record, model.forecast(horizon=k) is compared with the loop it
+replaces. The loop calls predict() once per cycle, with Age advanced the same
+way, and chains the dates with timedelta as app.py does for one cycle. The
+script checks that both give the same dates and then times them. Exits 1 on a
+mismatch.
+
+    python -m benchmarks.bench_forecast --artifact model_artifact --horizon 12
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+from benchmarks.suite import latency, percentiles
+
+def loop_forecast(mcp_model, user_input, horizon, cycle_start):
+    """The per-cycle predict() + timedelta loop that forecast() replaces"""
+    from model import DAYS_PER_YEAR
+    start = datetime.combine(cycle_start, datetime.min.time())
+    dates = []
+    for i in range(horizon):
+        record = dict(user_input, Age=user_input["Age"] + i * user_input["Cycle Length"] / DAYS_PER_YEAR)
+        start = start + timedelta(days=mcp_model.predict(record))
+        dates.append(start.date())
+    return dates
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", help="model artifact to load (trains a small model if omitted)")
+    parser.add_argument("--horizon", type=int, default=12)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    from model import MenstrualCyclePredictionModel
+    from benchmarks.common import make_records
+
+    # No cache: the loop would otherwise hit it for every cycle after a repeat
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": 5}, cache_size=0)
+    if args.artifact:
+        mcp_model.load(args.artifact)
+    else:
+        from synthetic_data import generate_frame
+        mcp_model.train(generate_frame(5000), verbose=0)
+
+    records = make_records(args.calls, seed=11)
+    cycle_start = datetime(2026, 1, 15).date()
+
+    mismatches = 0
+    for record in records[:500]:
+        fast = mcp_model.forecast(record, args.horizon, cycle_start)["dates"].astype(object)
+        slow = loop_forecast(mcp_model, record, args.horizon, cycle_start)
+        mismatches += int(list(fast) != slow)
+
+    batched = percentiles(latency(lambda r: mcp_model.forecast(r, args.horizon, cycle_start), records), 1e6)
+    looped = percentiles(latency(lambda r: loop_forecast(mcp_model, r, args.horizon, cycle_start), records), 1e6)
+    single = percentiles(latency(mcp_model.predict, records), 1e6)
+
+    print("=" * 60)
+    print(f"Horizon {args.horizon}: {mismatches} of 500 forecasts differ from the predict() loop")
+    print(f"{'':<30} {'p50':>9} {'p99':>10}")
+    print(f"{'predict() (1 cycle)':<30} {single['p50']:>6.1f} us {single['p99']:>7.1f} us")
+    print(f"{f'forecast(horizon={args.horizon})':<30} {batched['p50']:>6.1f} us {batched['p99']:>7.1f} us")
+    print(f"{f'{args.horizon} x predict() + timedelta':<30} {looped['p50']:>6.1f} us {looped['p99']:>7.1f} us")
+    print("=" * 60)
+    if mismatches:
+        print("❌ forecast() dates differ from the per-cycle loop")
+        sys.exit(1)
+    print("✅ forecast() matches the per-cycle loop")
+
+if __name__ == "__main__":
+    main()
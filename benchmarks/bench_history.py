@@ -0,0 +1,108 @@
+"""
+Per-user cycle history store (history_store.py) at millions of users
+
+Loads --users synthetic users with --cycles recorded starts each. Starts arrive
+round by round, in date order, as they would in production. The script then
+reports:
+  - bulk insert throughput and the database size
+  - single add_cycle() latency (one write transaction each)
+  - features() latency, the single indexed lookup /predict makes, against
+    recomputing the same features by scanning the user's history
+  - that the incremental mean/std equal NumPy's over a sample of users
+Exits 1 on a mismatch.
+
+    python -m benchmarks.bench_history --users 1000000 --cycles 6
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+import numpy as np
+from benchmarks.suite import latency, percentiles
+
+def synthetic_histories(n_users, n_cycles, seed):
+    """(first start day, (users, cycles - 1) cycle lengths, (users, cycles) period lengths)"""
+    rng = np.random.default_rng(seed)
+    first = date(2020, 1, 1).toordinal() + rng.integers(0, 365, n_users)
+    usual = rng.choice([24, 26, 28, 30, 32], n_users)
+    lengths = np.clip(np.rint(usual[:, None] + rng.normal(0, 2, (n_users, n_cycles - 1))), 15, 60).astype(int)
+    periods = rng.integers(3, 8, (n_users, n_cycles))
+    return first, lengths, periods
+
+def rescan_features(store, user_id):
+    """The same features computed from the full history, what a store without aggregates would do"""
+    days = np.array([date.fromisoformat(d).toordinal() for d, _ in reversed(store.history(user_id))])
+    lengths = np.diff(days)
+    return {"Cycle Length": lengths.mean(), "cycle_length_std": lengths.std(ddof=1)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--cycles", type=int, default=6, help="recorded starts per user")
+    parser.add_argument("--db", help="database file (default: a temporary file)")
+    parser.add_argument("--calls", type=int, default=20000, help="timed lookups")
+    parser.add_argument("--chunk", type=int, default=200_000, help="rows per bulk transaction")
+    args = parser.parse_args()
+
+    from history_store import CycleHistoryStore, from_day
+
+    first, lengths, periods = synthetic_histories(args.users, args.cycles, seed=5)
+    starts = first[:, None] + np.concatenate([np.zeros((args.users, 1), dtype=int), np.cumsum(lengths, axis=1)], axis=1)
+    user_ids = [f"user-{i:08d}" for i in range(args.users)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.db or os.path.join(tmp_dir, "cycle_history.sqlite3")
+        store = CycleHistoryStore(path)
+
+        # Round by round: every user's k-th start, then every user's (k+1)-th
+        start = time.perf_counter()
+        rows = ((user_ids[u], date.fromordinal(int(starts[u, k])), int(periods[u, k]))
+                for k in range(args.cycles) for u in range(args.users))
+        total = args.users * args.cycles
+        loaded = 0
+        while loaded < total:
+            chunk = [next(rows) for _ in range(min(args.chunk, total - loaded))]
+            store.add_cycles(chunk)
+            loaded += len(chunk)
+        load_seconds = time.perf_counter() - start
+        size_mb = sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p)) / 2**20
+
+        rng = np.random.default_rng(1)
+        sample = rng.integers(0, args.users, args.calls)
+        lookup = percentiles(latency(store.features, [user_ids[u] for u in sample]), 1e6)
+        rescan = percentiles(latency(lambda u: rescan_features(store, u), [user_ids[u] for u in sample[:5000]]), 1e6)
+
+        # One more start for some users, each in its own transaction
+        next_start = [(user_ids[u], from_day(int(starts[u, -1]) + 28)) for u in np.unique(sample[:2000])]
+        insert = percentiles(latency(lambda r: store.add_cycle(r[0], r[1], 5), next_start, warmup=0), 1e6)
+
+        # Incremental statistics against NumPy over the generated lengths
+        max_diff = 0.0
+        appended = {user_ids[u] for u in np.unique(sample[:2000])}
+        for u in sample[:1000]:
+            user_lengths = list(lengths[u]) + ([28] if user_ids[u] in appended else [])
+            features = store.features(user_ids[u])
+            max_diff = max(max_diff, abs(features["Cycle Length"] - np.mean(user_lengths)),
+                           abs(features["cycle_length_std"] - np.std(user_lengths, ddof=1)))
+        n_users = store.count_users()
+        store.close()
+
+    print("=" * 66)
+    print(f"{n_users:,} users x {args.cycles} starts = {total:,} rows in {load_seconds:.1f}s "
+          f"({total / load_seconds:,.0f} rows/s), {size_mb:.0f} MiB on disk")
+    print(f"{'':<34} {'p50':>9} {'p99':>10}")
+    print(f"{'features() (one indexed lookup)':<34} {lookup['p50']:>6.1f} us {lookup['p99']:>7.1f} us")
+    print(f"{'rescan history + recompute':<34} {rescan['p50']:>6.1f} us {rescan['p99']:>7.1f} us")
+    print(f"{'add_cycle() (own transaction)':<34} {insert['p50']:>6.1f} us {insert['p99']:>7.1f} us")
+    print(f"Incremental mean/std vs NumPy over 1000 users: max diff {max_diff:.2e} days")
+    print("=" * 66)
+    if max_diff > 1e-9:
+        print("❌ Incremental statistics differ from a full recomputation")
+        sys.exit(1)
+    print("✅ Incremental statistics match a full recomputation")
+
+if __name__ == "__main__":
+    main()
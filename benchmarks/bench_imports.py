@@ -0,0 +1,68 @@
+"""
+Import-time budget for the serving path, measured with python -X importtime
+
+Fails (exit 1) when importing the module takes longer than the budget or pulls in
+any of the heavy training-only packages.
+
+    python -m benchmarks.bench_imports --module app --budget-ms 1000
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+# Only needed to train or to serve the Keras backend
+FORBIDDEN = ("tensorflow", "keras", "sklearn", "pandas", "scipy")
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def import_times(module):
+    """[(module, self us, cumulative us, depth)] from a fresh interpreter, in import order"""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{out.stderr[-2000:]}")
+    rows = []
+    for line in out.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--runs", type=int, default=3, help="best of N fresh interpreters")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    rows = min(runs, key=lambda r: sum(self_us for _, self_us, _, _ in r))
+    total_ms = sum(self_us for _, self_us, _, _ in rows) / 1000
+    loaded = {name for name, *_ in rows}
+    heavy = sorted(pkg for pkg in FORBIDDEN if pkg in loaded)
+
+    print("=" * 60)
+    print(f"import {args.module}: {total_ms:.0f} ms, {len(rows)} modules (budget {args.budget_ms:.0f} ms)")
+    print("Slowest top-level imports (cumulative):")
+    top_level = sorted((r for r in rows if r[3] <= 1), key=lambda r: -r[2])[:args.top]
+    for name, _, cumulative_us, _ in top_level:
+        print(f"   {cumulative_us / 1000:8.1f} ms  {name}")
+    print("=" * 60)
+
+    failed = False
+    if heavy:
+        print(f"❌ Heavy packages imported: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ Over budget by {total_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Within budget, no training-only packages imported")
+
+if __name__ == "__main__":
+    main()
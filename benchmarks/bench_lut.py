@@ -0,0 +1,64 @@
+"""
+LUT mode: build time, size, max error versus the live model, and p50/p99 predict latency
+
+    python -m benchmarks.bench_lut --artifact model_artifact --bmi-step 2.5
+"""
+
+import argparse
+import time
+import numpy as np
+from benchmarks.common import make_frame, make_records
+from lut import PredictionLUT
+
+def load_model(artifact):
+    from model import MenstrualCyclePredictionModel
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0)
+    if artifact:
+        return mcp_model.load(artifact)
+    mcp_model.train(make_frame(2000, seed=42))
+    return mcp_model
+
+def percentiles_us(fn, records):
+    samples = np.empty(len(records))
+    for i, record in enumerate(records):
+        start = time.perf_counter()
+        fn(record)
+        samples[i] = time.perf_counter() - start
+    p50, p99 = np.percentile(samples, [50, 99]) * 1e6
+    return p50, p99
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", help="model artifact to load (trains a small model if omitted)")
+    parser.add_argument("--bmi-step", type=float, default=2.5)
+    parser.add_argument("--age-step", type=float, default=10)
+    parser.add_argument("--sleep-step", type=float, default=4)
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    mcp_model = load_model(args.artifact)
+
+    start = time.perf_counter()
+    lut = PredictionLUT.build(mcp_model, bmi_step=args.bmi_step, age_step=args.age_step,
+                              sleep_step=args.sleep_step, dtype=np.dtype(args.dtype))
+    build_time = time.perf_counter() - start
+    report = lut.error_report(mcp_model)
+
+    # Form-range inputs; BMI within the table's range so every call is a lookup
+    records = [r for r in make_records(args.calls * 2, seed=3) if 15 <= r["BMI"] <= 40][:args.calls]
+    live_p50, live_p99 = percentiles_us(mcp_model.predict, records)
+    mcp_model.enable_lut(lut)
+    lut_p50, lut_p99 = percentiles_us(mcp_model.predict, records)
+
+    print("=" * 60)
+    print(f"LUT shape {lut.values.shape}: {lut.values.size:,} cells, {lut.nbytes / 2**20:.1f} MiB {args.dtype}")
+    print(f"Build time: {build_time:.1f}s")
+    print(f"Error vs live model over {report['n_samples']} samples: max {report['max_abs_error']:.4f}, "
+          f"mean {report['mean_abs_error']:.4f}, p99 {report['p99_abs_error']:.4f} days")
+    print(f"predict() live: p50 {live_p50:8.1f} us  p99 {live_p99:8.1f} us")
+    print(f"predict() LUT:  p50 {lut_p50:8.1f} us  p99 {lut_p99:8.1f} us")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Instrumentation overhead: predict() latency with metrics on versus off (MCP_METRICS=0)
+
+    python -m benchmarks.bench_metrics --calls 20000
+"""
+
+import argparse
+import numpy as np
+import metrics
+from benchmarks.common import make_frame, make_records
+from benchmarks.suite import latency
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", help="model artifact to load (trains a small model if omitted)")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5, help="alternating on/off rounds")
+    args = parser.parse_args()
+
+    from model import MenstrualCyclePredictionModel
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0)
+    if args.artifact:
+        mcp_model.load(args.artifact)
+    else:
+        mcp_model.train(make_frame(2000, seed=42), verbose=0)
+    records = make_records(args.calls, seed=5)
+
+    # Alternate so drift (thermal, other load) hits both settings equally
+    on, off = [], []
+    for _ in range(args.rounds):
+        for enabled, samples in ((True, on), (False, off)):
+            metrics.ENABLED = enabled
+            samples.append(latency(mcp_model.predict, records))
+    metrics.ENABLED = True
+    on, off = np.concatenate(on) * 1e6, np.concatenate(off) * 1e6
+
+    print("=" * 60)
+    for name, samples in (("metrics on ", on), ("metrics off", off)):
+        p50, p99 = np.percentile(samples, [50, 99])
+        print(f"predict() {name}: p50 {p50:7.2f} us  p99 {p99:7.2f} us")
+    overhead = np.median(on) - np.median(off)
+    print(f"Overhead: {overhead:.2f} us per prediction ({overhead / np.median(off):.1%})")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
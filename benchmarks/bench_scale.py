@@ -0,0 +1,55 @@
+"""
+Scale test on synthetic data: generation rate, train(), predict_batch() and the prediction cache
+
+    python -m benchmarks.bench_scale --rows 1000000 --train-rows 200000 --epochs 3
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from benchmarks.common import timed
+from synthetic_data import generate, generate_frame, TARGET_COL
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows generated and scored by predict_batch")
+    parser.add_argument("--train-rows", type=int, default=100_000)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--cache-calls", type=int, default=20000, help="predict() calls for the cache test")
+    parser.add_argument("--distinct", type=int, default=500, help="distinct profiles among those calls")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Chunked output must not depend on the chunk size
+    check_rows = min(args.rows, 100_000)
+    chunked = pd.concat(generate(check_rows, args.seed, chunk_size=9_999), ignore_index=True)
+    pd.testing.assert_frame_equal(chunked, generate_frame(check_rows, args.seed))
+
+    gen_time, total = timed(lambda: sum(len(c) for c in generate(args.rows, args.seed)))
+
+    from model import MenstrualCyclePredictionModel
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": args.epochs}, cache_size=args.distinct * 2)
+    train_df = generate_frame(args.train_rows, args.seed + 1)
+    train_time, _ = timed(mcp_model.train, train_df, verbose=0)
+
+    score_df = generate_frame(args.rows, args.seed + 2).drop(columns=[TARGET_COL])
+    records = score_df.to_dict(orient="records")
+    batch_time, preds = timed(mcp_model.predict_batch, records)
+    assert len(preds) == len(records) and np.isfinite(preds).all()
+
+    # Repeated profiles: the cache should absorb everything after the first call per profile
+    rng = np.random.default_rng(args.seed)
+    calls = [records[i] for i in rng.integers(0, args.distinct, args.cache_calls)]
+    cache_time, _ = timed(lambda: [mcp_model.predict(r) for r in calls])
+    stats = mcp_model.cache.stats()
+
+    print("=" * 60)
+    print(f"Generate:        {total / gen_time:12,.0f} rows/sec ({total:,} rows)")
+    print(f"train():         {train_time:12.1f} s ({args.train_rows:,} rows, {args.epochs} epochs max)")
+    print(f"predict_batch(): {len(records) / batch_time:12,.0f} rows/sec ({len(records):,} rows)")
+    print(f"Cached predict():{args.cache_calls / cache_time:12,.0f} calls/sec "
+          f"(hit rate {stats['hit_rate']:.1%}, {args.distinct} distinct profiles)")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
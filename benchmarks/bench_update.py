@@ -0,0 +1,103 @@
+"""
+Incremental update versus full retraining
+
+Trains a model on synthetic data and saves it. It then brings in a new batch in
+which a diet the model has never seen ("pescatarian") shifts the cycle by
+REGIME_SHIFT days. The model is fine-tuned with model.update() on part of that
+batch and saved as a new artifact version. The script reports:
+  - update time against the full train() time
+  - MAE on the unseen rest of the new batch, before and after the update
+  - MAE on the original test split, to show how much the update forgot
+  - that the new version reloads and predicts exactly like the updated model
+Exits 1 when the update does not help on the new rows, forgets too much, or
+does not round-trip.
+
+    python -m benchmarks.bench_update --rows 20000 --new-rows 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+NEW_DIET = "pescatarian"
+REGIME_SHIFT = 3.0
+# Allowed MAE increase on the original test split
+MAX_FORGETTING = 0.10
+
+def new_batch(n_rows, seed):
+    """Rows like the training data plus NEW_DIET, whose cycles run REGIME_SHIFT days longer"""
+    from synthetic_data import DEFAULT_SPEC, generate_frame, make_spec, TARGET_COL
+    diet = DEFAULT_SPEC["Diet"]
+    spec = make_spec(Diet={"dist": "category", "values": diet["values"] + [NEW_DIET],
+                           "p": [p * 0.6 for p in diet["p"]] + [0.4]})
+    df = generate_frame(n_rows, seed=seed, spec=spec)
+    df["Diet"] = df["Diet"].astype(str)
+    df[TARGET_COL] = df[TARGET_COL] + REGIME_SHIFT * (df["Diet"] == NEW_DIET)
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="original training rows")
+    parser.add_argument("--new-rows", type=int, default=2000, help="new labelled rows to update on")
+    parser.add_argument("--epochs", type=int, default=30, help="epochs of the full training run")
+    args = parser.parse_args()
+
+    from model import MenstrualCyclePredictionModel, normalize_records, TARGET_COL
+    from synthetic_data import generate_frame
+
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": args.epochs}, cache_size=0)
+    start = time.perf_counter()
+    mcp_model.train(generate_frame(args.rows), verbose=0)
+    full_seconds = time.perf_counter() - start
+
+    batch = new_batch(args.new_rows * 3 // 2, seed=7)
+    fresh, unseen = batch.iloc[:args.new_rows], batch.iloc[args.new_rows:]
+    unseen_batches = lambda: [(mcp_model.encoder.transform(normalize_records(unseen)),
+                               unseen[TARGET_COL].to_numpy(dtype=np.float64))]
+
+    holdout_before = mcp_model.evaluate()["mae"]
+    unseen_before = mcp_model.evaluate(unseen_batches())["mae"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = os.path.join(tmp_dir, "model_artifact")
+        mcp_model.save(root)
+        stats = mcp_model.update(fresh)
+        version_dir = mcp_model.save(root)
+
+        holdout_after = mcp_model.evaluate()["mae"]
+        unseen_after = mcp_model.evaluate(unseen_batches())["mae"]
+
+        records = normalize_records(unseen).to_dict(orient="records")
+        reloaded = MenstrualCyclePredictionModel(cache_size=0).load(root)
+        max_diff = float(np.max(np.abs(reloaded.predict_batch(records) - mcp_model.predict_batch(records))))
+        versions = sorted(v for v in os.listdir(root) if v.startswith("v"))
+
+    forgetting = holdout_after / holdout_before - 1
+    print("=" * 64)
+    print(f"Full train() on {args.rows} rows:       {full_seconds:>7.1f}s")
+    print(f"update() on {stats['rows']} new rows:       {stats['seconds']:>7.1f}s "
+          f"({full_seconds / stats['seconds']:.0f}x faster)")
+    print(f"New categories: {stats['new_categories']}")
+    print(f"MAE on unseen new rows:     {unseen_before:.4f} -> {unseen_after:.4f} days")
+    print(f"MAE on original test split: {holdout_before:.4f} -> {holdout_after:.4f} days ({forgetting:+.1%})")
+    print(f"Artifact versions: {versions}, reloaded {os.path.basename(version_dir)} max diff {max_diff:.2e} days")
+    print("=" * 64)
+
+    failures = []
+    if unseen_after >= unseen_before:
+        failures.append("the update did not improve MAE on the new rows")
+    if forgetting > MAX_FORGETTING:
+        failures.append(f"MAE on the original test split grew by more than {MAX_FORGETTING:.0%}")
+    if max_diff > 1e-5:
+        failures.append("the saved version does not predict like the updated model")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Update learned the new rows and round-trips as a new artifact version")
+
+if __name__ == "__main__":
+    main()
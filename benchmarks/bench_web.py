@@ -0,0 +1,123 @@
+"""
+Parity of the browser model (static/js/mcp_model.js + web_export.py JSON) with the server
+
+Exports the server-side model to the web JSON format and runs mcp_model.js under Node
+on the same records. Checks that it predicts the same days as the server:
+main.py's sklearn Pipeline by default, or a model.py artifact with --artifact. Also
+reports the asset size and Node's time to first prediction. Exits 1 on a mismatch,
+or when node is not installed.
+
+    python -m benchmarks.bench_web
+    python -m benchmarks.bench_web --artifact model_artifact
+    python -m benchmarks.bench_web --asset static/model/mcp_model.json   # check the shipped asset
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import numpy as np
+from benchmarks.common import make_records
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ATOL = 1e-3
+
+NODE_SCRIPT = """
+const fs = require('fs');
+const start = process.hrtime.bigint();
+const MCPModel = require(process.argv[1]);
+const model = new MCPModel(JSON.parse(fs.readFileSync(process.argv[2], 'utf8')));
+const records = JSON.parse(fs.readFileSync(process.argv[3], 'utf8'));
+const first = model.predict(records[0]);
+const firstMs = Number(process.hrtime.bigint() - start) / 1e6;
+const t = process.hrtime.bigint();
+const predictions = records.map(r => model.predict(r));
+const perCallUs = Number(process.hrtime.bigint() - t) / 1e3 / records.length;
+console.log(JSON.stringify({first, firstMs, perCallUs, predictions}));
+"""
+
+def server_predictions(records, artifact):
+    """(predictions, web payload) from the server-side model"""
+    import web_export
+    if artifact:
+        from model import MenstrualCyclePredictionModel
+        mcp_model = MenstrualCyclePredictionModel(cache_size=0).load(artifact)
+        payload = web_export.web_payload(mcp_model.encoder, *mcp_model.weights(), accuracy=mcp_model.model_accuracy)
+        return mcp_model.predict_batch(records), payload
+
+    import pandas as pd
+    import main as main_app
+    from numpy_engine import extract_weights
+    payload = web_export.web_payload(main_app.encoder, *extract_weights(main_app.model),
+                                     accuracy=main_app.model_accuracy,
+                                     source=f"main.py pipeline {main_app.model_fingerprint()}")
+    X = pd.DataFrame.from_records(records, columns=main_app.model.feature_names_in_)
+    for col in payload["cat_cols"]:
+        X[col] = X[col].astype(str).str.lower().str.strip()
+    return np.maximum(1, main_app.model.predict(X)), payload
+
+def run_node(node, asset, records, tmp_dir):
+    """Predict records with mcp_model.js and the JSON asset under Node, returns its result dict"""
+    records_path = os.path.join(tmp_dir, "records.json")
+    with open(records_path, "w") as f:
+        json.dump(records, f)
+    out = subprocess.run([node, "-e", NODE_SCRIPT, os.path.join(ROOT, "static", "js", "mcp_model.js"),
+                          asset, records_path], capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"node failed:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", help="compare against this model.py artifact instead of main.py")
+    parser.add_argument("--asset", help="check this existing JSON asset instead of a fresh export")
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    node = shutil.which("node")
+    if not node:
+        print("❌ node is not installed; the browser model cannot be checked")
+        sys.exit(1)
+
+    records = make_records(args.rows, seed=21)
+    # Mixed case and unseen categories, handled like the server
+    records[0] = dict(records[0], Diet="Balanced", Symptoms="unknown")
+    expected, payload = server_predictions(records, args.artifact)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asset = args.asset
+        if asset:
+            with open(asset) as f:
+                shipped = json.load(f)
+            if payload.get("source") and shipped.get("source") != payload["source"]:
+                print(f"⚠️  {asset} was exported from {shipped.get('source')}, the server runs {payload['source']}")
+        else:
+            asset = os.path.join(tmp_dir, "mcp_model.json")
+            with open(asset, "w") as f:
+                json.dump(payload, f, separators=(",", ":"))
+        try:
+            result = run_node(node, asset, records, tmp_dir)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        with open(asset, "rb") as f:
+            raw = f.read()
+
+    actual = np.array(result["predictions"])
+    max_diff = float(np.max(np.abs(actual - expected)))
+    print("=" * 60)
+    print(f"Asset: {len(raw) / 1024:.1f} KiB ({len(gzip.compress(raw)) / 1024:.1f} KiB gzipped)")
+    print(f"Node: parse + first prediction {result['firstMs']:.1f} ms, then {result['perCallUs']:.1f} us per prediction")
+    print(f"Max difference vs server over {len(records)} records: {max_diff:.2e} days (atol {ATOL:g})")
+    print("=" * 60)
+    if max_diff > ATOL:
+        print("❌ Browser and server predictions differ")
+        sys.exit(1)
+    print("✅ Browser model matches the server")
+
+if __name__ == "__main__":
+    main()
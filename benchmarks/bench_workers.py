@@ -0,0 +1,155 @@
+"""
+Per-worker memory under gunicorn: shared memory-mapped artifact versus a private Keras model per worker
+
+Starts app.py under gunicorn_app.conf.py once per backend, waits for every worker to
+be ready, sends some predictions, then reads /proc/<pid>/smaps_rollup for each worker.
+RSS counts shared pages in full; PSS divides them among the processes sharing them;
+USS is memory private to one worker. Linux only.
+
+    python -m benchmarks.bench_workers --artifact model_artifact --workers 4
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+PAYLOAD = {
+    "age": 25, "weight": 60, "height": 1.65, "stress_level": 5, "sleep_hours": 7,
+    "cycle_length": 28, "period_length": 5, "exercise_frequency": "daily", "diet": "balanced",
+    "symptoms": "none", "cycle_start_date": "2024-01-01",
+}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def children(pid):
+    kids = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # The command name may contain spaces; ppid follows the closing parenthesis
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        kids.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    return sorted(kids)
+
+def memory_kb(pid, path_fragment=None):
+    """{Rss, Pss, Uss} in KiB for a process, or for its mappings of files containing path_fragment"""
+    totals = {"Rss": 0, "Pss": 0, "Uss": 0}
+    source = f"/proc/{pid}/smaps" if path_fragment else f"/proc/{pid}/smaps_rollup"
+    include = path_fragment is None
+    with open(source) as f:
+        for line in f:
+            fields = line.split()
+            if path_fragment and len(fields) >= 6 and "-" in fields[0]:
+                include = path_fragment in line
+                continue
+            if include and fields and fields[0].rstrip(":") in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                key = fields[0].rstrip(":")
+                value = int(fields[1])
+                if key.startswith("Private"):
+                    totals["Uss"] += value
+                else:
+                    totals[key] += value
+    return totals
+
+def request(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+def measure(backend, artifact, workers, requests, timeout):
+    port = free_port()
+    env = dict(os.environ, MCP_ARTIFACT=os.path.abspath(artifact), MCP_BACKEND=backend,
+               PORT=str(port), WEB_CONCURRENCY=str(workers), GUNICORN_THREADS="1")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    master = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn_app.conf.py"],
+                              cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        deadline = time.time() + timeout
+        # Requests land on arbitrary workers: require a run of ready answers
+        ready_streak = 0
+        while ready_streak < workers * 4:
+            if time.time() > deadline or master.poll() is not None:
+                raise RuntimeError(f"{backend}: workers not ready after {timeout}s")
+            ready_streak = ready_streak + 1 if request(f"{base}/health/ready") == 200 else 0
+            if not ready_streak:
+                time.sleep(0.2)
+        for _ in range(requests):
+            request(f"{base}/predict", PAYLOAD)
+
+        artifact_dir = os.path.abspath(artifact)
+        pids = children(master.pid)
+        return {
+            "backend": backend,
+            "workers": [
+                {"pid": pid, **memory_kb(pid), "artifact": memory_kb(pid, artifact_dir)} for pid in pids
+            ],
+            "master": memory_kb(master.pid),
+        }
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+def summarize(result):
+    workers = result["workers"]
+    n = len(workers)
+    return {
+        "backend": result["backend"],
+        "workers": n,
+        "rss_mb_per_worker": round(sum(w["Rss"] for w in workers) / n / 1024, 1),
+        "pss_mb_per_worker": round(sum(w["Pss"] for w in workers) / n / 1024, 1),
+        "uss_mb_per_worker": round(sum(w["Uss"] for w in workers) / n / 1024, 1),
+        "pss_mb_total": round((sum(w["Pss"] for w in workers) + result["master"]["Pss"]) / 1024, 1),
+        "artifact_rss_kb_per_worker": round(sum(w["artifact"]["Rss"] for w in workers) / n, 1),
+        "artifact_pss_kb_per_worker": round(sum(w["artifact"]["Pss"] for w in workers) / n, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", default="model_artifact")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backends", default="numpy,keras", help="comma-separated MCP_BACKEND values")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=180)
+    parser.add_argument("--out", help="write the summary as JSON")
+    args = parser.parse_args()
+
+    summaries = [summarize(measure(b, args.artifact, args.workers, args.requests, args.timeout))
+                 for b in args.backends.split(",")]
+
+    print("=" * 78)
+    print(f"{'backend':<8} {'RSS/worker':>11} {'PSS/worker':>11} {'USS/worker':>11} {'PSS total':>10} "
+          f"{'artifact RSS/PSS per worker':>28}")
+    for s in summaries:
+        print(f"{s['backend']:<8} {s['rss_mb_per_worker']:>8.1f} MB {s['pss_mb_per_worker']:>8.1f} MB "
+              f"{s['uss_mb_per_worker']:>8.1f} MB {s['pss_mb_total']:>7.1f} MB "
+              f"{s['artifact_rss_kb_per_worker']:>12.0f} / {s['artifact_pss_kb_per_worker']:.0f} KB")
+    if len(summaries) > 1:
+        base, other = summaries[0], summaries[-1]
+        print(f"PSS saved per worker, {base['backend']} vs {other['backend']}: "
+              f"{other['pss_mb_per_worker'] - base['pss_mb_per_worker']:.1f} MB")
+    print("=" * 78)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+if __name__ == "__main__":
+    main()
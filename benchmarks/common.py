@@ -0,0 +1,47 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import time
+import numpy as np
+import pandas as pd
+
+CYCLE_LENGTHS = [21, 24, 26, 28, 30, 32, 35]
+PERIOD_LENGTHS = [3, 4, 5, 6, 7]
+EXERCISE = ["none", "occasionally", "weekly", "daily"]
+DIETS = ["balanced", "vegan", "keto", "irregular"]
+SYMPTOMS = ["none", "cramps", "headache", "bloating", "fatigue"]
+
+def make_frame(n, seed=0):
+    """Random feature rows in the ranges the web form allows, with a target column"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Age": rng.integers(10, 61, n),
+        "BMI": np.round(rng.uniform(15, 40, n), 2),
+        "Stress Level": rng.integers(1, 11, n),
+        "Sleep Hours": rng.integers(0, 49, n) / 2,
+        "Cycle Length": rng.choice(CYCLE_LENGTHS, n),
+        "Period Length": rng.choice(PERIOD_LENGTHS, n),
+        "Exercise Frequency": rng.choice(EXERCISE, n),
+        "Diet": rng.choice(DIETS, n),
+        "Symptoms": rng.choice(SYMPTOMS, n),
+    })
+    noise = rng.normal(0, 1, n)
+    df["days_until_next_period"] = np.maximum(
+        1, df["Cycle Length"] - df["Period Length"] + (df["Stress Level"] - 5) * 0.5 + noise
+    ).astype(int)
+    return df
+
+def make_records(n, seed=0):
+    """Random user input dicts, as accepted by MenstrualCyclePredictionModel.predict"""
+    df = make_frame(n, seed).drop(columns=["days_until_next_period"])
+    return df.to_dict(orient="records")
+
+def timed(fn, *args, repeat=1, **kwargs):
+    """Return (best wall time in seconds, last result) over `repeat` runs"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,238 @@
+"""
+Benchmark suite: training, cold start, per-request latency, throughput and memory
+
+Trains a model on synthetic data, saves it to a temporary artifact, then measures
+load cold start (fresh interpreter), single predict() latency, predict_batch()
+throughput, Flask /predict end-to-end latency through the test client, and peak
+RSS. Results are written as JSON; pass --baseline to compare with an earlier run
+and exit non-zero when a metric regresses by more than --tolerance.
+
+    python -m benchmarks --out bench.json
+    python -m benchmarks --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Run in a fresh interpreter: imports plus load() is what a new server process pays
+COLD_START_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from model import MenstrualCyclePredictionModel
+imported = time.perf_counter()
+MenstrualCyclePredictionModel().load({path!r})
+loaded = time.perf_counter()
+print(json.dumps({{"import_s": imported - start, "load_s": loaded - imported}}))
+"""
+
+# Metrics where a larger value is better; everything else is lower-is-better
+HIGHER_IS_BETTER = ("_per_sec",)
+
+# Sizes and counts describe the run rather than measure it
+NOT_COMPARED = (".rows", ".runs", ".requests", ".epochs", ".mae")
+
+def percentiles(samples, scale):
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * scale
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+def latency(fn, items, warmup=20):
+    for item in items[:warmup]:
+        fn(item)
+    samples = np.empty(len(items))
+    for i, item in enumerate(items):
+        start = time.perf_counter()
+        fn(item)
+        samples[i] = time.perf_counter() - start
+    return samples
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return round(rss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+def bench_train(train_rows, epochs, seed):
+    from model import MenstrualCyclePredictionModel
+    from synthetic_data import generate_frame
+
+    df = generate_frame(train_rows, seed)
+    # patience == epochs so early stopping does not cut the run short
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": epochs, "patience": epochs}, cache_size=0)
+    start = time.perf_counter()
+    history, mae, rmse = mcp_model.train(df, verbose=0)
+    elapsed = time.perf_counter() - start
+    epochs_run = len(history.history["loss"])
+    return mcp_model, {
+        "rows": train_rows,
+        "epochs": epochs_run,
+        "seconds": round(elapsed, 3),
+        "seconds_per_epoch": round(elapsed / epochs_run, 4),
+        "mae": round(float(mae), 4),
+    }
+
+def bench_cold_start(path, runs):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", COLD_START_SCRIPT.format(path=path)],
+                             env=env, capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "runs": runs,
+        "import_s": round(float(np.median([r["import_s"] for r in results])), 4),
+        "load_s": round(float(np.median([r["load_s"] for r in results])), 4),
+    }
+
+def bench_predict(path, single_records, batch_records):
+    from model import MenstrualCyclePredictionModel
+
+    start = time.perf_counter()
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0).load(path)
+    load_time = time.perf_counter() - start
+
+    single = latency(mcp_model.predict, single_records)
+    batch_time = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        mcp_model.predict_batch(batch_records)
+        batch_time = min(batch_time, time.perf_counter() - start)
+    return {
+        "warm_load_s": round(load_time, 4),
+        "single_us": percentiles(single, 1e6),
+        "batch": {"rows": len(batch_records), "rows_per_sec": round(len(batch_records) / batch_time)},
+    }
+
+def bench_flask(path, records):
+    os.environ["MCP_ARTIFACT"] = path
+    os.environ["MCP_CACHE_SIZE"] = "0"
+    import app as flask_app
+    if not flask_app.load_model():
+        raise RuntimeError(f"app.py could not load '{path}'")
+
+    client = flask_app.app.test_client()
+    height = 1.65
+    payloads = [{
+        "age": r["Age"], "weight": r["BMI"] * height ** 2, "height": height,
+        "stress_level": r["Stress Level"], "sleep_hours": r["Sleep Hours"],
+        "cycle_length": r["Cycle Length"], "period_length": r["Period Length"],
+        "exercise_frequency": r["Exercise Frequency"], "diet": r["Diet"], "symptoms": r["Symptoms"],
+        "cycle_start_date": "2024-01-01",
+    } for r in records]
+
+    def post(payload):
+        response = client.post("/predict", json=payload)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    return {"requests": len(payloads), "predict_ms": percentiles(latency(post, payloads), 1e3)}
+
+def run_suite(train_rows=20000, epochs=5, predict_calls=2000, batch_rows=50000,
+              flask_calls=1000, cold_runs=3, seed=42):
+    """Run every benchmark and return the results as a JSON-serializable dict"""
+    from synthetic_data import generate_frame, TARGET_COL
+
+    records = generate_frame(max(predict_calls, batch_rows, flask_calls), seed + 1) \
+        .drop(columns=[TARGET_COL]).to_dict(orient="records")
+    results = {"environment": environment()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model_artifact")
+        mcp_model, results["train"] = bench_train(train_rows, epochs, seed)
+        mcp_model.save(path)
+        del mcp_model
+
+        results["cold_start"] = bench_cold_start(path, cold_runs)
+        results["predict"] = bench_predict(path, records[:predict_calls], records[:batch_rows])
+        results["flask"] = bench_flask(path, records[:flask_calls])
+
+    results["memory"] = {
+        "peak_rss_mb": peak_rss_mb(),
+        "cold_start_peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+    return results
+
+def environment():
+    info = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    try:
+        info["commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                        capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info["commit"] = None
+    return info
+
+def flatten(results, prefix=""):
+    """Nested results -> {"predict.single_us.p99": value} for numeric leaves"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def compare(results, baseline, tolerance):
+    """Metrics that got worse than the baseline by more than tolerance (a fraction)"""
+    current = flatten({k: v for k, v in results.items() if k != "environment"})
+    previous = flatten(baseline)
+    regressions = []
+    for name, value in current.items():
+        old = previous.get(name)
+        if not old or name.endswith(NOT_COMPARED):
+            continue
+        higher_is_better = name.endswith(HIGHER_IS_BETTER)
+        change = (old - value) / old if higher_is_better else (value - old) / old
+        if change > tolerance:
+            regressions.append((name, old, value, change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train-rows", type=int, default=20000)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--predict-calls", type=int, default=2000)
+    parser.add_argument("--batch-rows", type=int, default=50000)
+    parser.add_argument("--flask-calls", type=int, default=1000)
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--out", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    # Model and app logging goes to stderr so stdout stays valid JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_suite(args.train_rows, args.epochs, args.predict_calls, args.batch_rows,
+                            args.flask_calls, args.cold_runs)
+
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"✅ Results written to '{args.out}'", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, old, new, change in regressions:
+            print(f"❌ {name}: {old} -> {new} ({change:+.0%} worse)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.tolerance:.0%}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+iCalendar (RFC 5545) feed of forecast cycle starts
+
+One all-day VEVENT per predicted cycle start, written line by line so the
+/forecast route can stream it. When the model gives a likely range, it goes
+in the event description. Event UIDs depend only on the feed key and the
+cycle number, so a calendar that subscribes to the feed updates its events
+in place when the forecast moves.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+import numpy as np
+
+PRODID = "-//MCP//Menstrual Cycle Prediction//EN"
+
+def _fold(line):
+    """Split a content line into 75-octet pieces (continuation lines start with a space)"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start = [], 0
+    while start < len(data):
+        end = min(start + (75 if not parts else 74), len(data))
+        # Never split a UTF-8 sequence
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start = end
+    return "\r\n ".join(parts) + "\r\n"
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ical_date(day):
+    """datetime64[D] -> YYYYMMDD"""
+    return str(day).replace("-", "")
+
+def ics_lines(dates, key, earliest=None, latest=None, name="Cycle forecast"):
+    """Yield the folded lines of a VCALENDAR with one event per date in a datetime64[D] array"""
+    uid_base = hashlib.sha256(str(key).encode()).hexdigest()[:16]
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield from map(_fold, [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ])
+    for i, day in enumerate(dates):
+        description = f"Cycle {i + 1} of {len(dates)}, predicted by the MCP model."
+        if earliest is not None:
+            description += f" Likely between {earliest[i]} and {latest[i]}."
+        yield from map(_fold, [
+            "BEGIN:VEVENT",
+            f"UID:{uid_base}-{i + 1}@mcp",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{_ical_date(day)}",
+            f"DTEND;VALUE=DATE:{_ical_date(day + np.timedelta64(1, 'D'))}",
+            "SUMMARY:Predicted period start",
+            f"DESCRIPTION:{_escape(description)}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ])
+    yield _fold("END:VCALENDAR")
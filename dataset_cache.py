@@ -0,0 +1,81 @@
+"""
+Columnar dataset cache for training
+
+The raw CSV is parsed once and stored as a typed columnar file keyed by the
+SHA-256 of the source: string columns become dictionary-encoded pandas
+`category`, numeric columns the narrowest int/float dtype that holds them
+exactly. Later runs load the cached file instead of re-parsing the CSV.
+
+Parquet is used when pyarrow is installed; otherwise the typed DataFrame is
+pickled, which keeps the same dtypes without the extra dependency.
+"""
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+# Bump when optimize_dtypes changes so old cache files are not reused
+CACHE_VERSION = 1
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def optimize_dtypes(df):
+    """Categories for strings, narrowest exact numeric types for numbers"""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object:
+            out[col] = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s):
+            out[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            # Only narrow floats when every value survives the round trip
+            narrow = s.astype(np.float32)
+            exact = np.array_equal(narrow.to_numpy(np.float64), s.to_numpy(), equal_nan=True)
+            out[col] = narrow if exact else s
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+def cache_path(csv_path, cache_dir=".dataset_cache"):
+    """Cache file for a CSV, keyed by its content hash"""
+    ext = "parquet" if has_pyarrow() else "pkl"
+    key = file_sha256(csv_path)[:16]
+    return os.path.join(cache_dir, f"{key}-v{CACHE_VERSION}.{ext}")
+
+def load_dataset(csv_path, cache_dir=".dataset_cache", use_cache=True):
+    """Load a CSV through the columnar cache, building the cache on first use"""
+    if not use_cache:
+        return optimize_dtypes(pd.read_csv(csv_path))
+
+    path = cache_path(csv_path, cache_dir)
+    if os.path.exists(path):
+        print(f"⚡ Using cached dataset: {path}")
+        return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_pickle(path)
+
+    print("🗜️  Building columnar dataset cache (one-time per source file)...")
+    df = optimize_dtypes(pd.read_csv(csv_path))
+
+    # Write to a temp file first so an interrupted run never leaves a partial cache
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    print(f"✅ Cached {len(df):,} rows to {path}")
+    return df
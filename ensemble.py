@@ -0,0 +1,137 @@
+"""
+Bootstrap ensemble of the MLP, evaluated in one batched forward pass
+
+K copies of the network are trained on bootstrap resamples of the training
+split, each in its own process. Their weights are stacked into (K, in, out)
+kernels and (K, out) biases, so every layer is one np.matmul that broadcasts
+the batch over all members:
+
+    (n, in) @ (K, in, out) -> (K, n, out)
+
+The mean over members is the point prediction. The spread across members only
+measures model uncertainty, so the likely range adds the residual noise
+calibrated on the held-out split (noise_std) and reports the P10/P90 of that
+normal predictive distribution as the earliest/latest likely days. Both come
+out of the same forward pass, at a few times the cost of a single model for the
+small batches the API serves.
+
+    mcp_model.train_ensemble(df, n_members=8)
+    days, low, high = mcp_model.engine.interval(X_enc)
+"""
+
+import os
+import numpy as np
+from numpy_engine import ACTIVATIONS
+
+DEFAULT_MEMBERS = 8
+# Predictive percentiles reported as the likely range, and the matching
+# standard normal quantile (P90 = mean + 1.2816 std)
+INTERVAL_PERCENTILES = (10, 90)
+INTERVAL_Z = 1.2815515655446004
+
+class EnsembleMLP:
+    """K stacked MLPs; predict(X) is the member mean, a drop-in for NumpyMLP"""
+
+    def __init__(self, kernels, biases, activations, scales=None, noise_std=0.0):
+        if not (len(kernels) == len(biases) == len(activations)):
+            raise ValueError("kernels, biases and activations must have the same length")
+        if any(np.ndim(w) != 3 for w in kernels):
+            raise ValueError("Ensemble kernels must be stacked (members, in, out) arrays")
+        unknown = set(activations) - set(ACTIVATIONS)
+        if unknown:
+            raise ValueError(f"Unsupported activations: {sorted(unknown)}")
+
+        self.kernels = list(kernels)
+        self.biases = list(biases)
+        self.activations = [str(a) for a in activations]
+        self._fns = [ACTIVATIONS[a] for a in self.activations]
+        # Per-layer scales of int8 kernels (quantize.py), None for float kernels
+        self.scales = list(scales) if scales is not None else [None] * len(self.kernels)
+        # Biases broadcast over the batch axis: (K, 1, out)
+        self._biases = [np.asarray(b)[:, None, :] for b in self.biases]
+        self.dtype = np.result_type(np.float32, *self.kernels)
+        self.n_members = self.kernels[0].shape[0]
+        self.n_features = self.kernels[0].shape[1]
+        # Spread of the targets around the member mean that the members do not explain
+        self.noise_std = float(noise_std)
+
+    @classmethod
+    def stack(cls, members):
+        """Build from [(kernels, biases, activations), ...] of identically shaped members"""
+        activations = members[0][2]
+        if any(list(m[2]) != list(activations) for m in members):
+            raise ValueError("Ensemble members must share activations")
+        kernels = [np.stack([np.asarray(m[0][i]) for m in members]) for i in range(len(activations))]
+        biases = [np.stack([np.asarray(m[1][i]) for m in members]) for i in range(len(activations))]
+        return cls(kernels, biases, activations)
+
+    def predict_members(self, X):
+        """Every member's forward pass over an (n, n_features) matrix, returns (K, n)"""
+        h = np.asarray(X, dtype=self.dtype)
+        for w, b, fn, s in zip(self.kernels, self._biases, self._fns, self.scales):
+            h = np.matmul(h, w)
+            if s is not None:
+                h *= s
+            h += b
+            h = fn(h)
+        return h[..., 0]
+
+    def predict(self, X):
+        """Member mean, returns an (n,) array"""
+        return self.predict_members(X).mean(axis=0)
+
+    def spread(self, X):
+        """(mean, member variance) arrays of shape (n,)"""
+        members = self.predict_members(X)
+        # By hand: np.mean/np.std cost more than the forward pass on a single row
+        mean = members.sum(axis=0) / self.n_members
+        d = members - mean
+        d *= d
+        return mean, d.sum(axis=0) / max(1, self.n_members - 1)
+
+    def interval(self, X, z=INTERVAL_Z):
+        """(mean, low, high) arrays of shape (n,): mean -/+ z predictive standard deviations"""
+        mean, var = self.spread(X)
+        half = z * np.sqrt(var + self.noise_std ** 2)
+        return mean, mean - half, mean + half
+
+def calibrate_noise(engine, X, y):
+    """Residual std on validation data not already explained by the member spread
+
+    X, y must not be the rows the coverage of the resulting range is reported on.
+    """
+    mean, var = engine.spread(X)
+    residual_var = np.mean((np.asarray(y, dtype=np.float64) - mean) ** 2) - np.mean(var)
+    return float(np.sqrt(max(0.0, residual_var)))
+
+def _train_member(member, X_train, y_train, X_val, y_val, hyperparams, seed):
+    """Fit one member on a bootstrap resample, returns (kernels, biases, activations)"""
+    from model import MenstrualCyclePredictionModel, require_tensorflow
+    from numpy_engine import extract_weights
+
+    tf = require_tensorflow()
+    tf.keras.utils.set_random_seed(seed + member)
+    rows = np.random.default_rng([seed, member]).integers(0, len(y_train), len(y_train))
+
+    mcp_model = MenstrualCyclePredictionModel(hyperparams=hyperparams, cache_size=0)
+    mcp_model.build_model(X_train.shape[1])
+    mcp_model.fit_encoded(X_train[rows], y_train[rows], X_val, y_val, verbose=0)
+    return extract_weights(mcp_model.model)
+
+def train_members(X_train, y_train, X_val, y_val, hyperparams, n_members=DEFAULT_MEMBERS,
+                  workers=None, threads=1, seed=42):
+    """Train n_members bootstrap members across a spawn-based process pool, in member order"""
+    from tuning import training_pool
+
+    # Keras trains in float32; halves what is pickled to each worker
+    X_train, X_val = np.asarray(X_train, dtype=np.float32), np.asarray(X_val, dtype=np.float32)
+    y_train, y_val = np.asarray(y_train, dtype=np.float32), np.asarray(y_val, dtype=np.float32)
+    args = [(i, X_train, y_train, X_val, y_val, hyperparams, seed) for i in range(n_members)]
+
+    workers = min(n_members, workers or max(1, (os.cpu_count() or 1) // threads))
+    if workers == 1:
+        return [_train_member(*a) for a in args]
+
+    print(f"🧬 Training {n_members} ensemble members on {workers} workers x {threads} thread(s)")
+    with training_pool(workers, threads) as pool:
+        return list(pool.map(_train_member, *zip(*args)))
@@ -0,0 +1,147 @@
+"""
+DataFrame-free feature encoder for the prediction hot path
+Compiled once from a fitted ColumnTransformer. Each one-hot block is the fitted
+categories followed by `reserved` zero columns (model.py uses reserved_slots=2),
+so the output is preprocessor.transform with those columns inserted after every
+block; with reserved=0 it matches preprocessor.transform exactly.
+"""
+
+import threading
+import numpy as np
+
+class FastEncoder:
+    """Encodes user inputs straight into NumPy rows without pandas or sklearn dispatch
+
+    Layout: the scaled numeric columns, then per categorical column one block of
+    `slots` columns, the known categories first and the unassigned reserved slots
+    (always zero) after them.
+    """
+
+    def __init__(self, num_cols, mean, scale, cat_cols, categories, slots=None):
+        self.num_cols = list(num_cols)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.cat_cols = list(cat_cols)
+        self.categories = [np.asarray(c) for c in categories]
+        # Columns per one-hot block: the known categories, then reserved slots that
+        # stay zero until with_categories() assigns them to newly seen categories
+        self.slots = [len(c) for c in self.categories] if slots is None else [int(n) for n in slots]
+        if any(n < len(c) for n, c in zip(self.slots, self.categories)):
+            raise ValueError("A one-hot block has more categories than slots")
+
+        # Output layout: numeric block first, then one one-hot block per categorical column
+        self.n_num = len(self.num_cols)
+        self.offsets = []
+        offset = self.n_num
+        for n in self.slots:
+            self.offsets.append(offset)
+            offset += n
+        self.n_features = offset
+
+        # category -> absolute output column
+        self.index_maps = [
+            {cat: off + i for i, cat in enumerate(cats.tolist())}
+            for cats, off in zip(self.categories, self.offsets)
+        ]
+        self._local = threading.local()
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor, reserved=0):
+        """Compile an encoder from a fitted ColumnTransformer (passthrough/StandardScaler + OneHotEncoder)
+
+        reserved adds that many empty slots to every one-hot block, see with_categories().
+        """
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        fitted = [t for t in preprocessor.transformers_ if t[0] != "remainder" and t[1] != "drop"]
+        if len(fitted) != 2:
+            raise ValueError("Expected exactly one numeric and one categorical transformer")
+        (_, num_trans, num_cols), (_, cat_trans, cat_cols) = fitted
+
+        # Numeric block
+        n_num = len(num_cols)
+        if num_trans == "passthrough":
+            mean, scale = np.zeros(n_num), np.ones(n_num)
+        elif isinstance(num_trans, StandardScaler):
+            mean = num_trans.mean_ if num_trans.with_mean else np.zeros(n_num)
+            scale = num_trans.scale_ if num_trans.with_std else np.ones(n_num)
+        else:
+            raise ValueError(f"Unsupported numeric transformer: {num_trans!r}")
+
+        # Categorical block
+        if not isinstance(cat_trans, OneHotEncoder):
+            raise ValueError(f"Unsupported categorical transformer: {cat_trans!r}")
+        if cat_trans.drop is not None or cat_trans.handle_unknown != "ignore":
+            raise ValueError("OneHotEncoder must use drop=None and handle_unknown='ignore'")
+
+        categories = cat_trans.categories_
+        return cls(num_cols, mean, scale, cat_cols, categories, [len(c) + reserved for c in categories])
+
+    def free_slots(self):
+        """Unassigned reserved slots per categorical column"""
+        return {col: n - len(cats) for col, cats, n in zip(self.cat_cols, self.categories, self.slots)}
+
+    def with_categories(self, new_categories):
+        """Copy of the encoder with {column: [category, ...]} assigned to free reserved slots
+
+        Known categories are ignored. Raises ValueError when a block runs out of slots.
+        Returns (encoder, [(column, category, feature index), ...]) for the newly assigned ones.
+        """
+        categories = [c.tolist() for c in self.categories]
+        assigned = []
+        for col, cats in new_categories.items():
+            j = self.cat_cols.index(col)
+            for cat in cats:
+                if cat in categories[j]:
+                    continue
+                if len(categories[j]) >= self.slots[j]:
+                    raise ValueError(f"No free slot in the '{col}' block for category {cat!r}")
+                assigned.append((col, cat, self.offsets[j] + len(categories[j])))
+                categories[j].append(cat)
+        encoder = FastEncoder(self.num_cols, self.mean, self.scale, self.cat_cols, categories, self.slots)
+        return encoder, assigned
+
+    def _row(self):
+        """Per-thread preallocated output row"""
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.zeros((1, self.n_features), dtype=np.float64)
+        return row
+
+    def transform_one(self, record, out=None):
+        """Encode one feature mapping into a (1, n_features) row
+
+        Without `out` the row is a per-thread buffer that is overwritten by the next call.
+        """
+        row = self._row() if out is None else out
+        values = row[0]
+        values[self.n_num:] = 0.0
+
+        for j, col in enumerate(self.num_cols):
+            values[j] = record[col]
+        values[:self.n_num] -= self.mean
+        values[:self.n_num] /= self.scale
+
+        # Unknown categories leave their block at zero, like handle_unknown="ignore"
+        for col, index_map in zip(self.cat_cols, self.index_maps):
+            idx = index_map.get(record[col])
+            if idx is not None:
+                values[idx] = 1.0
+        return row
+
+    def transform(self, X):
+        """Encode a DataFrame of features into an (n, n_features) array"""
+        import pandas as pd
+
+        n = len(X)
+        out = np.zeros((n, self.n_features), dtype=np.float64)
+        out[:, :self.n_num] = X[self.num_cols].to_numpy(dtype=np.float64)
+        out[:, :self.n_num] -= self.mean
+        out[:, :self.n_num] /= self.scale
+
+        rows = np.arange(n)
+        for col, cats, off in zip(self.cat_cols, self.categories, self.offsets):
+            codes = pd.Categorical(X[col], categories=cats).codes
+            known = codes >= 0
+            out[rows[known], off + codes[known]] = 1.0
+        return out
@@ -0,0 +1,18 @@
+"""
+Gunicorn configuration for the self-contained app (main.py)
+
+    gunicorn -c gunicorn.conf.py
+
+preload_app imports main.py once in the master, so the persisted model is
+loaded (or trained, if its fingerprint changed) a single time and shared
+copy-on-write by every forked worker.
+"""
+
+import os
+
+wsgi_app = "main:app"
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+preload_app = True
+timeout = 60
@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for the artifact-serving app (app.py)
+
+    gunicorn -c gunicorn_app.conf.py
+
+app.py is imported once in the master (preload_app), which is cheap because
+model.py loads no heavy packages at import. Each worker then memory-maps the
+same versioned artifact read-only in post_fork: the weight and encoder arrays
+are pages of the .npy files in the OS page cache, held once no matter how many
+workers attach to them. Loading happens on a background thread per worker, so
+/health/ready reports readiness per worker.
+
+Set MCP_WATCH_INTERVAL to have every worker follow new versions of the
+artifact; /admin/reload only reaches the one worker that serves the request.
+"""
+
+import os
+
+wsgi_app = "app:app"
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+preload_app = True
+timeout = 60
+
+def post_fork(server, worker):
+    # Threads do not survive fork, so loading and watching start in each worker
+    import app
+    app.start_background_load()
+    watch_interval = float(os.environ.get("MCP_WATCH_INTERVAL", "0"))
+    if watch_interval > 0:
+        app.reloader.start_watcher(watch_interval)
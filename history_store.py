@@ -0,0 +1,203 @@
+"""
+Per-user cycle history in an embedded SQLite database
+
+Every recorded cycle start is kept in `cycles`, keyed by (user_id, start_day).
+Each user's derived features live in one `user_stats` row. That row holds the
+count, mean and M2 of their cycle lengths (Welford's algorithm), the last start
+and the last period length. An insert updates the row in O(1), and
+features(user_id) is a single primary-key lookup. Neither rescans the history.
+
+Both tables are WITHOUT ROWID, so the primary key is the table's own B-tree and
+a lookup reads one index. Writes run in a BEGIN IMMEDIATE transaction, so
+several gunicorn workers can share the file. WAL mode lets reads go on during
+a write.
+
+    store = CycleHistoryStore("cycle_history.sqlite3")
+    store.add_cycle("user-1", "2026-09-03", period_length=5)
+    store.features("user-1")   # {"Cycle Length": 28.5, "Period Length": 5, ...}
+
+The store itself does no access control. app.py only reads or writes a user's
+history for a request that carries that user's token, user_token(secret, user_id).
+"""
+
+import hashlib
+import hmac
+import sqlite3
+import threading
+from datetime import date
+
+DEFAULT_PATH = "cycle_history.sqlite3"
+
+# Gaps outside this range are kept as cycle starts but not counted as a cycle
+# length (usually a month the user did not log)
+CYCLE_LENGTH_RANGE = (15, 60)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    user_id TEXT NOT NULL,
+    start_day INTEGER NOT NULL,
+    period_length INTEGER,
+    PRIMARY KEY (user_id, start_day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id TEXT PRIMARY KEY,
+    n_starts INTEGER NOT NULL,
+    last_start INTEGER NOT NULL,
+    last_period_length INTEGER,
+    n_lengths INTEGER NOT NULL,
+    mean_length REAL NOT NULL,
+    m2_length REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+def to_day(value):
+    """Day number (date.toordinal()) of a date or a YYYY-MM-DD string"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+def from_day(day):
+    return date.fromordinal(day).isoformat()
+
+def normalize_user_id(user_id):
+    """The key a user's history is stored and authorized under: str() without surrounding whitespace"""
+    return "" if user_id is None else str(user_id).strip()
+
+def user_token(secret, user_id):
+    """Per-user access token: hex HMAC-SHA256 of the normalized user_id under the server secret"""
+    return hmac.new(secret.encode(), normalize_user_id(user_id).encode(), hashlib.sha256).hexdigest()
+
+def welford(n, mean, m2, x):
+    """Add x to a running (count, mean, M2)"""
+    n += 1
+    delta = x - mean
+    mean += delta / n
+    m2 += delta * (x - mean)
+    return n, mean, m2
+
+class CycleHistoryStore:
+    """Cycle starts per user with incrementally maintained cycle statistics"""
+
+    def __init__(self, path=DEFAULT_PATH, cycle_length_range=CYCLE_LENGTH_RANGE):
+        self.path = path
+        self.cycle_length_range = cycle_length_range
+        # sqlite3 connections must not be shared across threads
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; writes open their own transactions
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _stats(self, conn, user_id):
+        return conn.execute(
+            "SELECT n_starts, last_start, last_period_length, n_lengths, mean_length, m2_length "
+            "FROM user_stats WHERE user_id = ?", (user_id,)
+        ).fetchone()
+
+    def _insert(self, conn, user_id, day, period_length):
+        """Record one cycle start inside an open transaction, returns whether it was new"""
+        if conn.execute("INSERT OR IGNORE INTO cycles VALUES (?, ?, ?)",
+                        (user_id, day, period_length)).rowcount == 0:
+            return False
+        row = self._stats(conn, user_id)
+        if row is None:
+            stats = (1, day, period_length, 0, 0.0, 0.0)
+        elif day > row[1]:
+            # The usual case: a new latest start extends the running statistics
+            n_starts, last_start, last_period, n, mean, m2 = row
+            length = day - last_start
+            if self.cycle_length_range[0] <= length <= self.cycle_length_range[1]:
+                n, mean, m2 = welford(n, mean, m2, length)
+            stats = (n_starts + 1, day, period_length if period_length is not None else last_period, n, mean, m2)
+        else:
+            # A backfilled earlier start changes a length in the middle: rebuild this user
+            stats = self._rebuild(conn, user_id)
+        conn.execute("INSERT OR REPLACE INTO user_stats VALUES (?, ?, ?, ?, ?, ?, ?)", (user_id, *stats))
+        return True
+
+    def _rebuild(self, conn, user_id):
+        """Statistics of one user from their full history"""
+        n_starts = n = 0
+        mean = m2 = 0.0
+        prev = last_period = None
+        for day, period_length in conn.execute(
+                "SELECT start_day, period_length FROM cycles WHERE user_id = ? ORDER BY start_day", (user_id,)):
+            if prev is not None and self.cycle_length_range[0] <= day - prev <= self.cycle_length_range[1]:
+                n, mean, m2 = welford(n, mean, m2, day - prev)
+            if period_length is not None:
+                last_period = period_length
+            n_starts += 1
+            prev = day
+        return n_starts, prev, last_period, n, mean, m2
+
+    def add_cycle(self, user_id, start_date, period_length=None):
+        """Record a cycle start (date or YYYY-MM-DD), returns the user's updated features"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._insert(conn, normalize_user_id(user_id), to_day(start_date),
+                         None if period_length is None else int(period_length))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.features(user_id)
+
+    def add_cycles(self, rows):
+        """Bulk-record (user_id, start_date, period_length) rows in one transaction, returns how many were new"""
+        conn = self._conn()
+        added = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for user_id, start_date, period_length in rows:
+                added += self._insert(conn, normalize_user_id(user_id), to_day(start_date),
+                                      None if period_length is None else int(period_length))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def features(self, user_id):
+        """Derived features of a user from one indexed lookup, or None for an unknown user
+
+        "Cycle Length" (mean) and "cycle_length_std" are None until two starts
+        have been recorded.
+        """
+        row = self._stats(self._conn(), normalize_user_id(user_id))
+        if row is None:
+            return None
+        n_starts, last_start, last_period, n, mean, m2 = row
+        return {
+            "Cycle Length": mean if n else None,
+            "Period Length": last_period,
+            "cycle_length_std": (m2 / (n - 1)) ** 0.5 if n > 1 else None,
+            "cycles": n,
+            "recorded_starts": n_starts,
+            "last_cycle_start_date": from_day(last_start),
+        }
+
+    def history(self, user_id, limit=None):
+        """A user's recorded starts, newest first: [(YYYY-MM-DD, period_length), ...]"""
+        query = "SELECT start_day, period_length FROM cycles WHERE user_id = ? ORDER BY start_day DESC"
+        params = (normalize_user_id(user_id),)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (int(limit),)
+        return [(from_day(day), period) for day, period in self._conn().execute(query, params)]
+
+    def count_users(self):
+        return self._conn().execute("SELECT COUNT(*) FROM user_stats").fetchone()[0]
@@ -0,0 +1,198 @@
+"""
+Precomputed lookup table (LUT) over the quantized input space
+
+The model is evaluated once, in vectorized batches, over a grid of every discrete
+input value (stress, cycle/period length, exercise, diet, symptoms) crossed with
+Age, Sleep Hours and BMI grids. /predict then becomes an array lookup with
+trilinear interpolation over those three continuous axes. Inputs outside the grid
+return None so callers fall back to the live model.
+
+    python lut.py --artifact model_artifact --bmi-step 2.5 --out model_lut.npz
+"""
+
+import argparse
+import json
+import math
+import time
+import numpy as np
+
+# Values the web form allows for the discrete numeric inputs
+STRESS_LEVELS = list(range(1, 11))
+CYCLE_LENGTHS = [21, 24, 26, 28, 30, 32, 35]
+PERIOD_LENGTHS = [3, 4, 5, 6, 7]
+
+# (low, high) of the interpolated axes
+AGE_RANGE = (10, 60)
+SLEEP_RANGE = (0, 24)
+BMI_RANGE = (15, 45)
+
+def _grid(lo, hi, step):
+    n = max(2, int(np.ceil((hi - lo) / step - 1e-9)) + 1)
+    return lo, float(step), n
+
+class PredictionLUT:
+    """Dense table of predictions indexed by discrete values and interpolated continuous axes"""
+
+    def __init__(self, values, discrete, continuous, artifact_id=None):
+        # discrete: [(column, [values])], continuous: [(column, low, step, n)]
+        self.values = values
+        self.discrete = [(col, list(vals)) for col, vals in discrete]
+        self.continuous = [(col, float(lo), float(step), int(n)) for col, lo, step, n in continuous]
+        self.artifact_id = artifact_id
+        self._index_maps = [
+            {(float(v) if not isinstance(v, str) else v): i for i, v in enumerate(vals)}
+            for _, vals in self.discrete
+        ]
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    @classmethod
+    def build(cls, mcp_model, bmi_step=2.5, age_step=10, sleep_step=4, bmi_range=BMI_RANGE,
+              dtype=np.float16, chunk_rows=1 << 16, max_cells=100_000_000):
+        """Evaluate the model over the whole grid with batched inference"""
+        encoder = mcp_model.encoder
+        categories = dict(zip(encoder.cat_cols, encoder.categories))
+        discrete = [
+            ("Stress Level", STRESS_LEVELS),
+            ("Cycle Length", CYCLE_LENGTHS),
+            ("Period Length", PERIOD_LENGTHS),
+        ] + [(col, categories[col].tolist()) for col in encoder.cat_cols]
+        continuous = [
+            ("Age", *_grid(*AGE_RANGE, age_step)),
+            ("Sleep Hours", *_grid(*SLEEP_RANGE, sleep_step)),
+            ("BMI", *_grid(*bmi_range, bmi_step)),
+        ]
+
+        shape = tuple(len(vals) for _, vals in discrete) + tuple(n for *_, n in continuous)
+        n_cells = int(np.prod(shape))
+        if n_cells > max_cells:
+            raise ValueError(f"LUT would have {n_cells:,} cells (limit {max_cells:,}); use coarser steps")
+
+        # Per-axis value arrays
+        axis_values = [np.asarray(vals) for _, vals in discrete] + [
+            lo + step * np.arange(n) for _, lo, step, n in continuous
+        ]
+        axis_cols = [col for col, _ in discrete] + [col for col, *_ in continuous]
+        num_pos = {col: j for j, col in enumerate(encoder.num_cols)}
+        cat_pos = {col: off for col, off in zip(encoder.cat_cols, encoder.offsets)}
+
+        values = np.empty(n_cells, dtype=dtype)
+        for start in range(0, n_cells, chunk_rows):
+            flat = np.arange(start, min(start + chunk_rows, n_cells))
+            idx = np.unravel_index(flat, shape)
+
+            # Write the encoded rows directly (numeric block scaled, one-hot blocks set)
+            X = np.zeros((len(flat), encoder.n_features), dtype=np.float64)
+            rows = np.arange(len(flat))
+            for axis, col in enumerate(axis_cols):
+                if col in num_pos:
+                    j = num_pos[col]
+                    X[:, j] = (axis_values[axis][idx[axis]] - encoder.mean[j]) / encoder.scale[j]
+                else:
+                    X[rows, cat_pos[col] + idx[axis]] = 1.0
+
+            values[start:start + len(flat)] = mcp_model.infer(X)
+
+        artifact_id = mcp_model.manifest.get("artifact_id") if mcp_model.manifest else None
+        return cls(values.reshape(shape), discrete, continuous, artifact_id)
+
+    def lookup(self, record):
+        """Prediction for one normalized feature dict, or None when it is off the grid"""
+        index = []
+        for (col, _), index_map in zip(self.discrete, self._index_maps):
+            i = index_map.get(record[col])
+            if i is None:
+                return None
+            index.append(i)
+
+        weights = []
+        for col, lo, step, n in self.continuous:
+            p = (record[col] - lo) / step
+            # NaN slips through both range checks and would fail in int()
+            if not math.isfinite(p) or p < 0 or p > n - 1:
+                return None
+            i = min(int(p), n - 2)
+            index.append(slice(i, i + 2))
+            weights.append(p - i)
+
+        # 2x2x2 neighbourhood, collapsed one axis at a time
+        block = self.values[tuple(index)].astype(np.float64)
+        for t in weights:
+            block = block[0] * (1 - t) + block[1] * t
+        return float(block)
+
+    def error_report(self, mcp_model, n_samples=20000, seed=0):
+        """Compare LUT lookups with the live model on random in-grid inputs"""
+        rng = np.random.default_rng(seed)
+        records = []
+        for _ in range(n_samples):
+            record = {col: vals[rng.integers(len(vals))] for col, vals in self.discrete}
+            for col, lo, step, n in self.continuous:
+                record[col] = float(rng.uniform(lo, lo + step * (n - 1)))
+            record["Age"] = float(round(record["Age"]))
+            record["Sleep Hours"] = round(record["Sleep Hours"] * 2) / 2
+            record["BMI"] = round(record["BMI"], 2)
+            for col, vals in self.discrete:
+                if not isinstance(vals[0], str):
+                    record[col] = float(record[col])
+            records.append(record)
+
+        live = np.maximum(1.0, mcp_model.predict_batch(records))
+        table = np.maximum(1.0, np.array([self.lookup(r) for r in records]))
+        err = np.abs(table - live)
+        return {
+            "n_samples": n_samples,
+            "max_abs_error": float(err.max()),
+            "mean_abs_error": float(err.mean()),
+            "p99_abs_error": float(np.percentile(err, 99)),
+        }
+
+    def save(self, path):
+        """Write the table and its index scheme to an .npz"""
+        meta = {
+            "discrete": self.discrete,
+            "continuous": self.continuous,
+            "artifact_id": self.artifact_id,
+        }
+        np.savez(path, values=self.values, meta=np.array(json.dumps(meta)))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            values = data["values"]
+        return cls(values, meta["discrete"], meta["continuous"], meta["artifact_id"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", default="model_artifact")
+    parser.add_argument("--out", default="model_lut.npz")
+    parser.add_argument("--bmi-step", type=float, default=2.5, help="BMI bucket resolution")
+    parser.add_argument("--age-step", type=float, default=10)
+    parser.add_argument("--sleep-step", type=float, default=4)
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    args = parser.parse_args()
+
+    from model import MenstrualCyclePredictionModel
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0).load(args.artifact)
+
+    start = time.perf_counter()
+    lut = PredictionLUT.build(mcp_model, bmi_step=args.bmi_step, age_step=args.age_step,
+                              sleep_step=args.sleep_step, dtype=np.dtype(args.dtype))
+    build_time = time.perf_counter() - start
+    report = lut.error_report(mcp_model)
+    lut.save(args.out)
+
+    print("=" * 60)
+    print(f"✅ LUT saved to '{args.out}'")
+    print(f"   Shape: {lut.values.shape} ({lut.values.size:,} cells, {lut.nbytes / 2**20:.1f} MiB {args.dtype})")
+    print(f"   Build time: {build_time:.1f}s")
+    print(f"   Max error vs live model: {report['max_abs_error']:.4f} days "
+          f"(mean {report['mean_abs_error']:.4f}, p99 {report['p99_abs_error']:.4f})")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
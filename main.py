@@ -6,7 +6,8 @@ SINGLE FILE APPLICATION - Just run: python main.py
 This is a simplified version that:
 1. Uses scikit-learn (faster than TensorFlow)
 2. Includes embedded sample data (no Kaggle needed)
-3. Trains automatically on startup
+3. Loads its fitted pipeline from MCP_MODEL_DIR on startup, training (and saving) it
+   only when no pipeline for the current data/split/hyperparameter fingerprint exists
 4. Runs the web UI
 """
 
@@ -19,6 +20,18 @@ from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from datetime import datetime, timedelta
+from contextlib import contextmanager
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import platform
+import sklearn
+from payload import parse_batch_body
+from fast_encoder import FastEncoder
+from numpy_engine import NumpyMLP
+from prediction_cache import PredictionCache
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -29,15 +42,39 @@ app = Flask(__name__)
 
 # Global model
 model = None
+encoder = None
+engine = None
 model_accuracy = 0
 
+# ============================================================
+# MODEL CONFIGURATION (everything that changes the trained model)
+# ============================================================
+DATA_PARAMS = {'n_samples': 500, 'seed': 42}
+SPLIT_PARAMS = {'test_size': 0.2, 'random_state': 42}
+HYPERPARAMS = {
+    'hidden_layer_sizes': (32, 16),
+    'activation': 'relu',
+    'max_iter': 500,
+    'random_state': 42,
+    'early_stopping': True,
+    'validation_fraction': 0.2
+}
+
+# Where fitted pipelines are persisted, one file per fingerprint
+MODEL_DIR = os.environ.get('MCP_MODEL_DIR', 'artifacts')
+
+# Predictions for repeated profiles, cleared whenever a model is activated
+prediction_cache = PredictionCache(
+    maxsize=int(os.environ.get('MCP_CACHE_SIZE', 4096)),
+    ttl=float(os.environ.get('MCP_CACHE_TTL', 3600))
+)
+
 # ============================================================
 # SAMPLE DATA (Embedded - no download needed!)
 # ============================================================
-def get_sample_data():
+def get_sample_data(n_samples=500, seed=42):
     """Generate sample menstrual cycle data for training"""
-    np.random.seed(42)
-    n_samples = 500
+    np.random.seed(seed)
     
     data = {
         'Age': np.random.randint(18, 45, n_samples),
@@ -69,11 +106,9 @@ def get_sample_data():
 # MODEL TRAINING
 # ============================================================
 def train_model():
-    """Train the MLP model"""
-    global model, model_accuracy
-    
+    """Train the MLP model and make it the active one"""
     print("📊 Loading data...")
-    df = get_sample_data()
+    df = get_sample_data(**DATA_PARAMS)
     print(f"   Data shape: {df.shape}")
     
     # Features and target
@@ -84,7 +119,7 @@ def train_model():
     y = df['days_until_next_period']
     
     # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, **SPLIT_PARAMS)
     
     print("🧠 Training MLP model...")
     
@@ -97,30 +132,120 @@ def train_model():
     )
     
     # Create model pipeline
-    model = Pipeline([
+    pipeline = Pipeline([
         ('preprocessor', preprocessor),
-        ('regressor', MLPRegressor(
-            hidden_layer_sizes=(32, 16),
-            activation='relu',
-            max_iter=500,
-            random_state=42,
-            early_stopping=True,
-            validation_fraction=0.2
-        ))
+        ('regressor', MLPRegressor(**HYPERPARAMS))
     ])
     
     # Train
-    model.fit(X_train, y_train)
+    pipeline.fit(X_train, y_train)
     
     # Evaluate
-    y_pred = model.predict(X_test)
+    y_pred = pipeline.predict(X_test)
     mae = np.mean(np.abs(y_test - y_pred))
-    model_accuracy = max(0, 100 - (mae / np.mean(y_test) * 100))
+    activate_model(pipeline, max(0, 100 - (mae / np.mean(y_test) * 100)))
     
     print(f"✅ Model trained!")
     print(f"   MAE: {mae:.2f} days")
     print(f"   Accuracy: {model_accuracy:.1f}%")
     
+    return pipeline
+
+def activate_model(pipeline, accuracy):
+    """Make a fitted pipeline the one used for predictions"""
+    global model, encoder, engine, model_accuracy
+    
+    model = pipeline
+    model_accuracy = accuracy
+    encoder = FastEncoder.from_preprocessor(pipeline.named_steps['preprocessor'])
+    engine = NumpyMLP.from_model(pipeline)
+    prediction_cache.clear()
+
+# ============================================================
+# MODEL PERSISTENCE (fingerprint-keyed artifact cache)
+# ============================================================
+def model_fingerprint():
+    """Hash of everything that determines the trained model"""
+    payload = {
+        'data': DATA_PARAMS,
+        'generator': inspect.getsource(get_sample_data),
+        'split': SPLIT_PARAMS,
+        'hyperparams': HYPERPARAMS,
+        'versions': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__
+        }
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+def artifact_path(fingerprint):
+    return os.path.join(MODEL_DIR, f'main_model-{fingerprint}.pkl')
+
+def save_model(path, fingerprint):
+    """Persist the fitted pipeline atomically (write to a temp file, then rename)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({
+            'fingerprint': fingerprint,
+            'pipeline': model,
+            'accuracy': model_accuracy,
+            'created': datetime.now().isoformat(timespec='seconds')
+        }, f)
+    os.replace(tmp_path, path)
+
+def load_model(path, fingerprint):
+    """Load a persisted pipeline, returns False if it is missing or stale"""
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path, 'rb') as f:
+            artifact = pickle.load(f)
+    except Exception as e:
+        print(f"⚠️  Could not read {path}: {e}")
+        return False
+    if artifact.get('fingerprint') != fingerprint:
+        return False
+    activate_model(artifact['pipeline'], artifact['accuracy'])
+    return True
+
+@contextmanager
+def artifact_lock(path):
+    """Exclusive file lock around training (no-op where fcntl is unavailable)"""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f'{path}.lock', 'w') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+def load_or_train_model(force_retrain=False):
+    """Load the persisted model for the current fingerprint, training only when it changed"""
+    fingerprint = model_fingerprint()
+    path = artifact_path(fingerprint)
+    
+    if not force_retrain and load_model(path, fingerprint):
+        print(f"📦 Loaded model {fingerprint} from {path}")
+        print(f"   Accuracy: {model_accuracy:.1f}%")
+        return model
+    
+    # Workers started without preload_app wait here while one of them trains
+    with artifact_lock(path):
+        if not force_retrain and load_model(path, fingerprint):
+            print(f"📦 Loaded model {fingerprint} from {path}")
+            return model
+        train_model()
+        save_model(path, fingerprint)
+        print(f"💾 Saved model {fingerprint} to {path}")
     return model
 
 # ============================================================
@@ -128,27 +253,48 @@ def train_model():
 # ============================================================
 def predict_cycle(user_input):
     """Make prediction for user input"""
-    global model
-    
-    # Create input dataframe
-    X = pd.DataFrame([{
-        'Age': user_input['Age'],
-        'BMI': user_input['BMI'],
-        'Stress Level': user_input['Stress Level'],
-        'Sleep Hours': user_input['Sleep Hours'],
-        'Cycle Length': user_input['Cycle Length'],
-        'Period Length': user_input['Period Length'],
-        'Exercise Frequency': user_input['Exercise Frequency'].lower(),
-        'Diet': user_input['Diet'].lower(),
-        'Symptoms': user_input['Symptoms'].lower()
-    }])
+    record = {
+        'Age': float(user_input['Age']),
+        'BMI': float(user_input['BMI']),
+        'Stress Level': float(user_input['Stress Level']),
+        'Sleep Hours': float(user_input['Sleep Hours']),
+        'Cycle Length': float(user_input['Cycle Length']),
+        'Period Length': float(user_input['Period Length']),
+        'Exercise Frequency': str(user_input['Exercise Frequency']).lower().strip(),
+        'Diet': str(user_input['Diet']).lower().strip(),
+        'Symptoms': str(user_input['Symptoms']).lower().strip()
+    }
+    # The normalized feature tuple is the cache key
+    key = tuple(record.values())
+    return prediction_cache.get_or_compute(key, lambda: _predict_record(record))
+
+def _predict_record(record):
+    """Uncached prediction for one normalized feature dict"""
+    # Encode straight into a NumPy row, skipping the DataFrame + ColumnTransformer
+    X = encoder.transform_one(record)
     
     # Predict
-    pred_days = float(model.predict(X)[0])
+    pred_days = float(engine.predict(X)[0])
     pred_days = max(1, pred_days)
     
     return pred_days
 
+def predict_cycle_batch(records):
+    """Make predictions for many user inputs in one vectorized pass"""
+    num_cols = ['Age', 'BMI', 'Stress Level', 'Sleep Hours', 'Cycle Length', 'Period Length']
+    cat_cols = ['Exercise Frequency', 'Diet', 'Symptoms']
+    
+    # Create input dataframe for the whole batch
+    X = pd.DataFrame.from_records(list(records), columns=num_cols + cat_cols)
+    if len(X) == 0:
+        return np.empty(0)
+    # Same normalization as predict_cycle: str(), lower-case and trim, so a batch row predicts like a single one
+    for col in cat_cols:
+        X[col] = X[col].astype(str).str.lower().str.strip()
+    
+    # Predict
+    return np.maximum(1, engine.predict(encoder.transform(X)))
+
 # ============================================================
 # FLASK ROUTES
 # ============================================================
@@ -561,56 +707,104 @@ def results():
 </html>
 '''
 
+def build_user_input(data):
+    """Convert a request record into the model input dict and BMI"""
+    # Calculate BMI
+    weight = float(data['weight'])
+    height = float(data['height'])
+    bmi = round(weight / (height ** 2), 2)
+    
+    # Prepare input
+    user_input = {
+        'Age': int(data['age']),
+        'BMI': bmi,
+        'Stress Level': int(data['stress_level']),
+        'Sleep Hours': float(data['sleep_hours']),
+        'Cycle Length': int(data['cycle_length']),
+        'Period Length': int(data['period_length']),
+        'Exercise Frequency': data['exercise'],
+        'Diet': data['diet'],
+        'Symptoms': data['symptoms']
+    }
+    return user_input, bmi
+
+def build_result(data, bmi, pred_days):
+    """Build the result payload for one request record"""
+    # Calculate date
+    start = datetime.strptime(data['start_date'], '%Y-%m-%d')
+    next_date = start + timedelta(days=int(pred_days))
+    
+    return {
+        'bmi': bmi,
+        'days': round(pred_days, 1),
+        'next_cycle_date': next_date.strftime('%B %d, %Y'),
+        'accuracy': f'{model_accuracy:.1f}%'
+    }
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """Handle prediction request"""
     try:
         data = request.json
-        
-        # Calculate BMI
-        weight = float(data['weight'])
-        height = float(data['height'])
-        bmi = round(weight / (height ** 2), 2)
-        
-        # Prepare input
-        user_input = {
-            'Age': int(data['age']),
-            'BMI': bmi,
-            'Stress Level': int(data['stress_level']),
-            'Sleep Hours': float(data['sleep_hours']),
-            'Cycle Length': int(data['cycle_length']),
-            'Period Length': int(data['period_length']),
-            'Exercise Frequency': data['exercise'],
-            'Diet': data['diet'],
-            'Symptoms': data['symptoms']
-        }
+        user_input, bmi = build_user_input(data)
         
         # Predict
         pred_days = predict_cycle(user_input)
         
-        # Calculate date
-        start = datetime.strptime(data['start_date'], '%Y-%m-%d')
-        next_date = start + timedelta(days=int(pred_days))
-        
         return jsonify({
             'success': True,
-            'result': {
-                'bmi': bmi,
-                'days': round(pred_days, 1),
-                'next_cycle_date': next_date.strftime('%B %d, %Y'),
-                'accuracy': f'{model_accuracy:.1f}%'
-            }
+            'result': build_result(data, bmi, pred_days)
         })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Handle a batch of prediction requests (JSON array or NDJSON)"""
+    try:
+        records = parse_batch_body(request.get_data(), request.mimetype)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # Invalid records are reported in place, the rest are predicted together
+    results = [None] * len(records)
+    valid = []
+    for i, data in enumerate(records):
+        try:
+            user_input, bmi = build_user_input(data)
+            datetime.strptime(data['start_date'], '%Y-%m-%d')
+            valid.append((i, data, user_input, bmi))
+        except Exception as e:
+            results[i] = {'success': False, 'error': str(e)}
+    
+    try:
+        pred_days = predict_cycle_batch([v[2] for v in valid])
+        for (i, data, _, bmi), days in zip(valid, pred_days):
+            results[i] = {'success': True, 'result': build_result(data, bmi, float(days))}
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({'success': True, 'count': len(results), 'results': results})
+
+@app.route('/health')
+def health():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'healthy',
+        'model_loaded': model is not None,
+        'accuracy': f'{model_accuracy:.2f}%',
+        'cache': prediction_cache.stats()
+    })
+
 # ============================================================
-# TRAIN MODEL ON IMPORT (for gunicorn/production)
+# LOAD (OR TRAIN ONCE) ON IMPORT (for gunicorn/production)
+# With preload_app (see gunicorn.conf.py) this runs once in the master
+# and every worker shares the loaded model.
 # ============================================================
 print("🚀 MCP - Menstrual Cycle Prediction")
 print("=" * 60)
-train_model()
+load_or_train_model(force_retrain=os.environ.get('MCP_RETRAIN') == '1')
 print("✨ Model ready!")
 print("=" * 60)
 
@@ -618,7 +812,6 @@ print("=" * 60)
 # MAIN - Entry Point (for local development)
 # ============================================================
 if __name__ == '__main__':
-    import os
     port = int(os.environ.get('PORT', 5001))
     print()
     print(f"🌐 Open your browser and visit: http://localhost:{port}")
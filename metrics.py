@@ -0,0 +1,216 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition
+
+Histograms, counters and gauges kept in plain Python structures (no client
+library). Per-stage latencies are recorded with a Stopwatch: each lap() records
+the time since the previous lap under a stage label. Set MCP_METRICS=0 to switch
+everything off; stopwatch() then returns a no-op object and nothing is recorded.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+ENABLED = os.environ.get("MCP_METRICS", "1") != "0"
+
+# Seconds; spans cache hits (microseconds) to cold model loads (seconds)
+DEFAULT_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+def _format_labels(labelnames, values, extra=""):
+    pairs = [f'{k}="{v}"' for k, v in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in sorted(self._values.items())]
+
+class Gauge(Counter):
+    """Last value set per label combination"""
+
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = value
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._by_label = {}  # label -> the same lists, for observe_many
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        if not ENABLED:
+            return
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def observe_many(self, pairs):
+        """Record [(value, label)] for a single-label histogram under one lock acquisition"""
+        if not ENABLED:
+            return
+        buckets, by_label = self.buckets, self._by_label
+        with self._lock:
+            for value, label in pairs:
+                series = by_label.get(label)
+                if series is None:
+                    series = self._series.setdefault((label,), [0] * (len(buckets) + 2))
+                    by_label[label] = series
+                series[bisect_left(buckets, value)] += 1
+                series[-1] += value
+
+    def samples(self):
+        out = []
+        with self._lock:
+            series = sorted((labels, list(s)) for labels, s in self._series.items())
+        for labels, s in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), s[:-1]):
+                cumulative += count
+                out.append((f"{self.name}_bucket", labels, cumulative, f'le="{_format_value(bound)}"'))
+            out.append((f"{self.name}_sum", labels, s[-1]))
+            out.append((f"{self.name}_count", labels, cumulative))
+        return out
+
+class Registry:
+    """Named metrics plus collectors that report externally held values at scrape time"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()):
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn):
+        """fn() returns [(name, kind, help, [(labels dict, value)])], e.g. from cache.stats()"""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value, *extra in metric.samples():
+                lines.append(f"{name}{_format_labels(metric.labelnames, labels, *extra)} {_format_value(value)}")
+        for fn in self._collectors:
+            for name, kind, help, samples in fn():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+STAGE_SECONDS = registry.histogram(
+    "mcp_stage_seconds", "Time spent in each prediction stage", ["stage"])
+REQUEST_SECONDS = registry.histogram(
+    "mcp_request_seconds", "End-to-end request handling time", ["route", "status"])
+ERRORS = registry.counter(
+    "mcp_errors_total", "Failed requests and records by route and kind (validation or internal)", ["route", "kind"])
+PREDICTIONS = registry.counter(
+    "mcp_predictions_total", "Rows predicted by route", ["route"])
+MODEL_LOAD_SECONDS = registry.gauge(
+    "mcp_model_load_seconds", "Duration of the last model load", ["backend"])
+MODEL_LOADS = registry.counter(
+    "mcp_model_loads_total", "Model loads by backend", ["backend"])
+MODEL_RELOADS = registry.counter(
+    "mcp_model_reloads_total", "Hot reloads by result (succeeded, failed, rolled_back)", ["result"])
+
+class Stopwatch:
+    """lap(stage) notes the time since the previous lap (or creation) for that stage
+
+    Laps are buffered and recorded together by finish(), so the hot path only
+    reads the clock and appends to a list.
+    """
+
+    __slots__ = ("last", "laps")
+
+    def __init__(self):
+        self.laps = []
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.laps.append((now - self.last, stage))
+        self.last = now
+
+    def reset(self):
+        """Start the next lap now, skipping time already recorded elsewhere"""
+        self.last = time.perf_counter()
+
+    def finish(self):
+        """Record the buffered laps in STAGE_SECONDS"""
+        STAGE_SECONDS.observe_many(self.laps)
+        self.laps.clear()
+
+class _NullStopwatch:
+    __slots__ = ()
+
+    def lap(self, stage):
+        pass
+
+    def reset(self):
+        pass
+
+    def finish(self):
+        pass
+
+NULL_STOPWATCH = _NullStopwatch()
+
+def stopwatch():
+    """A Stopwatch, or a shared no-op when metrics are switched off"""
+    return Stopwatch() if ENABLED else NULL_STOPWATCH
@@ -3,29 +3,114 @@ MLP Model for Menstrual Cycle Prediction
 Extracted from CW1_w1956126_DevhanDodampahala.ipynb
 """
 
-import pandas as pd
+import time
 import numpy as np
-import tensorflow as tf
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.model_selection import train_test_split
-import pickle
-import os
+from artifact import save_artifact, load_artifact
+from fast_encoder import FastEncoder
+from numpy_engine import NumpyMLP, extract_weights
+from backends import create_engine
+from ensemble import EnsembleMLP, train_members, calibrate_noise, DEFAULT_MEMBERS, INTERVAL_PERCENTILES, INTERVAL_Z
+from quantize import quantize, dequantize
+from prediction_cache import PredictionCache
+from batching import MicroBatcher
+from metrics import stopwatch as start_stopwatch, NULL_STOPWATCH, MODEL_LOAD_SECONDS, MODEL_LOADS
+
+# Heavy dependencies are imported on first use so that serving from the NumPy
+# artifact (app.py) never loads them: TensorFlow to train or serve the Keras
+# model, scikit-learn to train, pandas for training and batch prediction.
+tf = None
 
 # Feature columns
 NUM_COLS = ["Age", "BMI", "Stress Level", "Sleep Hours", "Cycle Length", "Period Length"]
 CAT_COLS = ["Exercise Frequency", "Diet", "Symptoms"]
+TARGET_COL = "days_until_next_period"
+
+# Architecture and training settings (tuning.py searches over these)
+DEFAULT_HYPERPARAMS = {
+    "hidden_units": (32, 16),
+    "learning_rate": 0.001,
+    "batch_size": 64,
+    "patience": 10,
+    "epochs": 100,
+    # Empty one-hot columns per categorical feature for categories first seen by update()
+    "reserved_slots": 2,
+}
+
+# update(): a few passes over the new batch, plus this many pseudo-rehearsal rows
+# per new row to keep the existing predictions in place
+UPDATE_EPOCHS = 5
+UPDATE_REHEARSAL = 2.0
+
+# forecast(): number of upcoming cycles
+DEFAULT_HORIZON = 6
+MAX_HORIZON = 12
+DAYS_PER_YEAR = 365.25
+
+def require_tensorflow():
+    """Import TensorFlow on first use, with a helpful error when it is not installed"""
+    global tf
+    if tf is None:
+        try:
+            import tensorflow
+        except ImportError:
+            raise ImportError("TensorFlow is required for this operation. Install the dev extras: uv sync --extra dev") from None
+        tf = tensorflow
+    return tf
+
+
+def split_mask(row_index, test_size=0.2, seed=42):
+    """Deterministic test-set membership from row numbers (hash based, chunk independent)"""
+    h = (np.asarray(row_index, dtype=np.uint64) + np.uint64(seed)) * np.uint64(0x9E3779B97F4A7C15)
+    h ^= h >> np.uint64(29)
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53) < test_size
+
+def normalize_record(user_input):
+    """Return the feature dict for one user input with numbers as floats and categories normalized"""
+    record = {col: float(user_input[col]) for col in NUM_COLS}
+    for col in CAT_COLS:
+        record[col] = str(user_input[col]).lower().strip()
+    return record
+
+def normalize_records(records):
+    """Build a feature DataFrame from a list of user dicts or a DataFrame"""
+    import pandas as pd
+    if isinstance(records, pd.DataFrame):
+        X = records.loc[:, NUM_COLS + CAT_COLS].copy()
+    else:
+        X = pd.DataFrame.from_records(list(records), columns=NUM_COLS + CAT_COLS)
+    
+    # Same categorical normalization as the single-row path
+    for col in CAT_COLS:
+        X[col] = X[col].astype(str).str.lower().str.strip()
+    
+    return X
 
 class MenstrualCyclePredictionModel:
     """MLP Model for predicting next menstrual cycle"""
     
-    def __init__(self):
+    def __init__(self, hyperparams=None, cache_size=4096, cache_ttl=3600):
+        self.hyperparams = {**DEFAULT_HYPERPARAMS, **(hyperparams or {})}
         self.model = None
         self.preprocessor = None
+        self.encoder = None
+        self.engine = None
         self.model_accuracy = None
+        self.metrics = {}
+        self.manifest = None
+        # Callable yielding (X_encoded, y) batches of the last training run's test split
+        self._holdout = None
+        # Predictions for repeated profiles, cleared whenever the model changes
+        self.cache = PredictionCache(maxsize=cache_size, ttl=cache_ttl)
+        # Optional precomputed lookup table (see lut.py)
+        self.lut = None
+        # Optional micro-batching of concurrent single predictions (see batching.py)
+        self.batcher = None
         
     def create_preprocessor(self):
         """Create the preprocessing pipeline"""
+        from sklearn.compose import ColumnTransformer
+        from sklearn.preprocessing import OneHotEncoder
+        
         self.preprocessor = ColumnTransformer(
             transformers=[
                 ("num", "passthrough", NUM_COLS),
@@ -36,25 +121,25 @@ class MenstrualCyclePredictionModel:
     
     def build_model(self, input_shape):
         """Build the MLP neural network"""
+        require_tensorflow()
         tf.random.set_seed(42)
         
-        self.model = tf.keras.Sequential([
-            tf.keras.layers.Input(shape=(input_shape,)),
-            tf.keras.layers.Dense(32, activation="relu"),
-            tf.keras.layers.Dense(16, activation="relu"),
-            tf.keras.layers.Dense(1)  # regression output
-        ])
+        self.model = tf.keras.Sequential(
+            [tf.keras.layers.Input(shape=(input_shape,))]
+            + [tf.keras.layers.Dense(units, activation="relu") for units in self.hyperparams["hidden_units"]]
+            + [tf.keras.layers.Dense(1)]  # regression output
+        )
         
         self.model.compile(
-            optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+            optimizer=tf.keras.optimizers.Adam(learning_rate=self.hyperparams["learning_rate"]),
             loss="mse",
             metrics=[tf.keras.metrics.MeanAbsoluteError(name="mae")]
         )
         
         return self.model
     
-    def train(self, df):
-        """Train the model on the dataset"""
+    def _prepare_split(self, df):
+        """Filter, split 80/20 and encode a training DataFrame, fitting the preprocessor"""
         print("Preparing data...")
         
         # Filter valid data
@@ -65,6 +150,7 @@ class MenstrualCyclePredictionModel:
         y = df["days_until_next_period"]
         
         # Split data
+        from sklearn.model_selection import train_test_split
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
@@ -76,10 +162,34 @@ class MenstrualCyclePredictionModel:
         if self.preprocessor is None:
             self.create_preprocessor()
         
-        X_train_encoded = self.preprocessor.fit_transform(X_train)
-        X_test_encoded = self.preprocessor.transform(X_test)
+        self.preprocessor.fit(X_train)
+        self.encoder = FastEncoder.from_preprocessor(self.preprocessor, reserved=self.hyperparams["reserved_slots"])
+        X_train_encoded = self.encoder.transform(X_train)
+        X_test_encoded = self.encoder.transform(X_test)
         
         print(f"Encoded feature shape: {X_train_encoded.shape}")
+        return X_train_encoded, X_test_encoded, y_train, y_test
+    
+    def fit_encoded(self, X_train, y_train, X_val, y_val, verbose=1):
+        """Fit the Keras model on encoded features with early stopping on the validation split"""
+        early_stop = tf.keras.callbacks.EarlyStopping(
+            monitor="val_mae",
+            patience=self.hyperparams["patience"],
+            restore_best_weights=True
+        )
+        return self.model.fit(
+            X_train, y_train,
+            validation_data=(X_val, y_val),
+            epochs=self.hyperparams["epochs"],
+            batch_size=self.hyperparams["batch_size"],
+            callbacks=[early_stop],
+            verbose=verbose
+        )
+    
+    def train(self, df, verbose=1):
+        """Train the model on the dataset"""
+        require_tensorflow()
+        X_train_encoded, X_test_encoded, y_train, y_test = self._prepare_split(df)
         
         # Build model
         if self.model is None:
@@ -88,22 +198,8 @@ class MenstrualCyclePredictionModel:
         print("\nTraining model...")
         print("=" * 60)
         
-        # Early stopping callback
-        early_stop = tf.keras.callbacks.EarlyStopping(
-            monitor="val_mae",
-            patience=10,
-            restore_best_weights=True
-        )
-        
         # Train the model
-        history = self.model.fit(
-            X_train_encoded, y_train,
-            validation_data=(X_test_encoded, y_test),
-            epochs=100,
-            batch_size=64,
-            callbacks=[early_stop],
-            verbose=1
-        )
+        history = self.fit_encoded(X_train_encoded, y_train, X_test_encoded, y_test, verbose=verbose)
         
         # Evaluate model
         print("\n" + "=" * 60)
@@ -112,83 +208,613 @@ class MenstrualCyclePredictionModel:
         mae = np.mean(np.abs(y_test - y_pred))
         rmse = np.sqrt(np.mean((y_test - y_pred) ** 2))
         
+        y_test_values = y_test.to_numpy(dtype=np.float64)
+        self._holdout = lambda: iter([(X_test_encoded, y_test_values)])
+        self._finish_training(mae, rmse, np.mean(y_test), len(X_train_encoded), len(X_test_encoded))
+        
+        return history, mae, rmse
+    
+    def train_ensemble(self, df, n_members=DEFAULT_MEMBERS, workers=None, threads=1, seed=42):
+        """Train n_members bootstrap copies in parallel processes and serve them as one stacked ensemble
+
+        Predictions become the member mean; predict_interval() adds the P10/P90 of the
+        member spread plus the residual noise. The 20% held out is halved: members
+        early-stop and the noise is calibrated on the validation half, and MAE and
+        coverage are reported on the other half, which neither step has seen.
+        """
+        require_tensorflow()
+        X_train_encoded, X_held_encoded, y_train, y_held = self._prepare_split(df)
+        y_train = y_train.to_numpy(dtype=np.float64)
+        y_held = y_held.to_numpy(dtype=np.float64)
+        from sklearn.model_selection import train_test_split
+        X_val_encoded, X_test_encoded, y_val, y_test = train_test_split(
+            X_held_encoded, y_held, test_size=0.5, random_state=seed
+        )
+        print(f"Validation / evaluation split: {len(y_val)} / {len(y_test)}")
+        
+        print(f"\nTraining ensemble of {n_members} models...")
+        print("=" * 60)
+        members = train_members(X_train_encoded, y_train, X_val_encoded, y_val, self.hyperparams,
+                                n_members=n_members, workers=workers, threads=threads, seed=seed)
+        engine = EnsembleMLP.stack(members)
+        engine.noise_std = calibrate_noise(engine, X_val_encoded, y_val)
+        
+        # Evaluate the member mean, and how often the target falls inside the P10-P90 range
+        print("\n" + "=" * 60)
+        print("Evaluating ensemble...")
+        y_pred, low, high = engine.interval(X_test_encoded)
+        mae = np.mean(np.abs(y_test - y_pred))
+        rmse = np.sqrt(np.mean((y_test - y_pred) ** 2))
+        coverage = float(np.mean((y_test >= low) & (y_test <= high)))
+        
+        self.model = None
+        self._holdout = lambda: iter([(X_test_encoded, y_test)])
+        self._finish_training(mae, rmse, np.mean(y_test), len(y_train), len(y_test), engine=engine)
+        self.metrics["n_validation"] = len(y_val)
+        self.metrics["ensemble_size"] = n_members
+        self.metrics["interval_coverage"] = coverage
+        self.metrics["noise_std"] = engine.noise_std
+        print(f"P{INTERVAL_PERCENTILES[0]}-P{INTERVAL_PERCENTILES[1]} range covers {coverage:.1%} of test targets")
+        
+        return mae, rmse
+    
+    def _finish_training(self, mae, rmse, y_mean, n_train, n_test, engine=None):
+        """Record metrics and switch serving to the newly trained weights"""
         # Calculate accuracy (as percentage)
-        self.model_accuracy = max(0, 100 - (mae / np.mean(y_test) * 100))
+        self.model_accuracy = max(0, 100 - (mae / y_mean * 100))
+        self.metrics = {
+            "accuracy": float(self.model_accuracy),
+            "mae": float(mae),
+            "rmse": float(rmse),
+            "n_train": int(n_train),
+            "n_test": int(n_test),
+        }
         
         print(f"Mean Absolute Error (MAE): {mae:.4f} days")
         print(f"Root Mean Squared Error (RMSE): {rmse:.4f} days")
         print(f"Model Accuracy: {self.model_accuracy:.2f}%")
         print("=" * 60)
         
+        # Serve predictions from the NumPy forward pass
+        self.engine = engine or NumpyMLP.from_model(self.model)
+        self.lut = None
+        self.cache.clear()
+    
+    def train_streaming(self, csv_path, chunksize=100_000, test_size=0.2, seed=42, verbose=1):
+        """Train from a CSV too large for memory, one chunk at a time
+
+        Pass 1 streams the file to learn the one-hot vocabularies and split sizes.
+        Training then feeds Keras from a tf.data pipeline that re-reads the file in
+        chunks each epoch. Rows are filtered on days_until_next_period > 0 and assigned
+        to train/test by a hash of their row number, so the split is identical on every
+        pass and independent of the chunk size.
+        """
+        require_tensorflow()
+        import pandas as pd
+        from sklearn.compose import ColumnTransformer
+        from sklearn.preprocessing import OneHotEncoder
+        
+        batch_size = self.hyperparams["batch_size"]
+        usecols = NUM_COLS + CAT_COLS + [TARGET_COL]
+        
+        def chunks():
+            """Yield (X, y, in_test) for the valid rows of each chunk"""
+            offset = 0
+            for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=chunksize):
+                in_test = split_mask(offset + np.arange(len(chunk)), test_size, seed)
+                offset += len(chunk)
+                valid = (chunk[TARGET_COL] > 0).to_numpy()
+                if valid.any():
+                    chunk = chunk[valid]
+                    yield chunk[NUM_COLS + CAT_COLS], chunk[TARGET_COL].to_numpy(dtype=np.float32), in_test[valid]
+        
+        def split(test):
+            """Yield (X, y) for the train or test rows of each chunk"""
+            for X, y, in_test in chunks():
+                selected = in_test == test
+                if selected.any():
+                    yield X[selected], y[selected]
+        
+        # Pass 1: vocabularies and split sizes
+        print("Scanning dataset...")
+        vocab = {col: set() for col in CAT_COLS}
+        n_train = n_test = 0
+        train_batches = test_batches = 0
+        first = None
+        for X, y, in_test in chunks():
+            for col in CAT_COLS:
+                vocab[col].update(X[col].dropna().unique().tolist())
+            chunk_test = int(in_test.sum())
+            chunk_train = len(y) - chunk_test
+            n_test += chunk_test
+            n_train += chunk_train
+            # Mini-batches never span chunks
+            test_batches += -(-chunk_test // batch_size)
+            train_batches += -(-chunk_train // batch_size)
+            first = X if first is None else first
+        if n_train == 0 or n_test == 0:
+            raise ValueError(f"Not enough valid rows in '{csv_path}' to train and evaluate")
+        
+        print(f"Training set size: {n_train}")
+        print(f"Test set size: {n_test}")
+        
+        # Fixed vocabularies, so fitting on any chunk gives the full encoding
+        self.preprocessor = ColumnTransformer(
+            transformers=[
+                ("num", "passthrough", NUM_COLS),
+                ("cat", OneHotEncoder(categories=[sorted(vocab[c]) for c in CAT_COLS],
+                                      handle_unknown="ignore"), CAT_COLS),
+            ]
+        )
+        self.preprocessor.fit(first)
+        self.encoder = FastEncoder.from_preprocessor(self.preprocessor, reserved=self.hyperparams["reserved_slots"])
+        n_features = self.encoder.n_features
+        print(f"Encoded feature count: {n_features}")
+        
+        def batches(test):
+            """Encoded mini-batches, shuffled within each chunk for the training split"""
+            rng = np.random.default_rng(seed)
+            for X, y in split(test):
+                X_enc = self.encoder.transform(X).astype(np.float32)
+                order = np.arange(len(y)) if test else rng.permutation(len(y))
+                for start in range(0, len(y), batch_size):
+                    idx = order[start:start + batch_size]
+                    yield X_enc[idx], y[idx]
+        
+        signature = (
+            tf.TensorSpec(shape=(None, n_features), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        )
+        train_ds = tf.data.Dataset.from_generator(lambda: batches(False), output_signature=signature)
+        test_ds = tf.data.Dataset.from_generator(lambda: batches(True), output_signature=signature)
+        train_ds = train_ds.apply(tf.data.experimental.assert_cardinality(train_batches))
+        test_ds = test_ds.apply(tf.data.experimental.assert_cardinality(test_batches))
+        
+        # Build model
+        if self.model is None:
+            self.build_model(n_features)
+        
+        print("\nTraining model (streaming)...")
+        print("=" * 60)
+        
+        early_stop = tf.keras.callbacks.EarlyStopping(
+            monitor="val_mae",
+            patience=self.hyperparams["patience"],
+            restore_best_weights=True
+        )
+        history = self.model.fit(
+            train_ds.prefetch(2),
+            validation_data=test_ds.prefetch(2),
+            epochs=self.hyperparams["epochs"],
+            shuffle=False,  # shuffled within each chunk by the generator
+            callbacks=[early_stop],
+            verbose=verbose
+        )
+        
+        # Evaluate model, one chunk at a time
+        print("\n" + "=" * 60)
+        print("Evaluating model...")
+        abs_err = sq_err = y_sum = 0.0
+        for X, y in split(True):
+            y_pred = self.model.predict(self.encoder.transform(X), batch_size=4096, verbose=0).flatten()
+            abs_err += float(np.sum(np.abs(y - y_pred)))
+            sq_err += float(np.sum((y - y_pred) ** 2))
+            y_sum += float(np.sum(y))
+        mae = abs_err / n_test
+        rmse = np.sqrt(sq_err / n_test)
+        
+        self._holdout = lambda: ((self.encoder.transform(X), y) for X, y in split(True))
+        self._finish_training(mae, rmse, y_sum / n_test, n_train, n_test)
+        
         return history, mae, rmse
     
+    def _rehearsal_rows(self, X_enc, ratio, seed):
+        """Pseudo-rehearsal rows that pin the current model's predictions during update()
+
+        The new rows' numeric features with every categorical block set to a random
+        category known to the current model, labelled by the current model. No
+        training data has to be kept with the artifact.
+        """
+        rng = np.random.default_rng(seed)
+        n = int(len(X_enc) * ratio)
+        X_anchor = X_enc[rng.integers(0, len(X_enc), n)]
+        rows = np.arange(n)
+        for cats, offset, slots in zip(self.encoder.categories, self.encoder.offsets, self.encoder.slots):
+            X_anchor[:, offset:offset + slots] = 0.0
+            X_anchor[rows, offset + rng.integers(0, len(cats), n)] = 1.0
+        return X_anchor, self.infer(X_anchor)
+    
+    def update(self, df, epochs=UPDATE_EPOCHS, learning_rate=None, rehearsal=UPDATE_REHEARSAL, seed=42, verbose=0):
+        """Fine-tune the served weights on a new batch of labelled records, without retraining
+
+        The fitted encoder is reused. Categories first seen in the batch take one of
+        the reserved one-hot slots, starting from the zero contribution of an unknown
+        category. The new rows are fitted for a few epochs, mixed with pseudo-rehearsal
+        rows (see _rehearsal_rows()) so the update does not drift the predictions for
+        everyone else. Call save() afterwards to write the result as a new artifact version.
+        Returns the update statistics, also kept under metrics["last_update"].
+        """
+        if not self.is_ready():
+            raise ValueError("Model not trained or loaded. Please train or load a model first.")
+        if self.has_intervals:
+            raise ValueError("Ensembles cannot be updated incrementally, retrain them with train_ensemble()")
+        require_tensorflow()
+        
+        df = df[df[TARGET_COL] > 0]
+        if len(df) == 0:
+            raise ValueError("No labelled rows with days_until_next_period > 0 to update on")
+        X = normalize_records(df)
+        y = df[TARGET_COL].to_numpy(dtype=np.float64)
+        # Error of the model being served, which encodes new categories as unknown
+        before = self.evaluate([(self.encoder.transform(X), y)])
+        
+        # Categories first seen in this batch take free reserved slots
+        free = self.encoder.free_slots()
+        new_categories = {}
+        for col, cats in zip(self.encoder.cat_cols, self.encoder.categories):
+            new = sorted(set(X[col]) - set(cats.tolist()))
+            if len(new) > free[col]:
+                print(f"⚠️  No free slot in '{col}' for {new[free[col]:]}, they stay encoded as unknown")
+            new_categories[col] = new[:free[col]]
+        encoder, assigned = self.encoder.with_categories(new_categories)
+        
+        kernels, biases, activations = self.weights()
+        kernels = [np.array(w, dtype=np.float32) for w in kernels]
+        for col, cat, index in assigned:
+            # Reserved rows were never trained: start from the unknown-category output
+            kernels[0][index] = 0.0
+            print(f"🆕 '{col}' category '{cat}' assigned to reserved feature {index}")
+        
+        print(f"\nUpdating model on {len(y)} new rows...")
+        start = time.perf_counter()
+        X_enc = encoder.transform(X)
+        X_anchor, y_anchor = self._rehearsal_rows(X_enc, rehearsal, seed)
+        lr = learning_rate or self.hyperparams["learning_rate"]
+        self.build_model_from_weights(kernels, biases, activations, learning_rate=lr)
+        self.model.fit(np.vstack([X_enc, X_anchor]), np.concatenate([y, y_anchor]), epochs=epochs,
+                       batch_size=self.hyperparams["batch_size"], verbose=verbose)
+        seconds = time.perf_counter() - start
+        
+        # Serve the updated weights
+        self.encoder = encoder
+        self.engine = NumpyMLP.from_model(self.model)
+        self.lut = None
+        self.cache.clear()
+        
+        after = self.evaluate([(X_enc, y)])
+        stats = {
+            "rows": int(len(y)),
+            "rehearsal_rows": int(len(y_anchor)),
+            "epochs": int(epochs),
+            "learning_rate": float(lr),
+            "seconds": seconds,
+            "new_categories": [[col, cat] for col, cat, _ in assigned],
+            "batch_mae_before": before["mae"],
+            "batch_mae_after": after["mae"],
+            "parent": self.manifest["artifact_id"] if self.manifest else None,
+        }
+        if self._holdout is not None:
+            stats["holdout_mae"] = self.evaluate()["mae"]
+        self.metrics = {**self.metrics, "updates": self.metrics.get("updates", 0) + 1, "last_update": stats}
+        
+        print(f"✅ Updated in {seconds:.1f}s: MAE on the new rows {before['mae']:.4f} -> {after['mae']:.4f} days")
+        if "holdout_mae" in stats:
+            print(f"   MAE on the original test split: {stats['holdout_mae']:.4f} days")
+        return stats
+    
+    def holdout_batches(self):
+        """(X_encoded, y) batches of the test split from the last train() or train_streaming()"""
+        if self._holdout is None:
+            raise ValueError("No held-out split: train the model first")
+        return self._holdout()
+    
+    def evaluate(self, batches=None):
+        """MAE and RMSE of the serving path on the held-out split (or on given (X_encoded, y) batches)"""
+        abs_err = sq_err = 0.0
+        n = 0
+        for X_enc, y in (self.holdout_batches() if batches is None else batches):
+            error = np.asarray(y, dtype=np.float64) - self.infer(X_enc)
+            abs_err += float(np.sum(np.abs(error)))
+            sq_err += float(np.sum(error ** 2))
+            n += len(error)
+        return {"mae": abs_err / n, "rmse": float(np.sqrt(sq_err / n))}
+    
+    def is_ready(self):
+        """Whether the model can serve predictions"""
+        return (self.engine is not None or self.model is not None) and self.encoder is not None
+    
+    def infer(self, X_enc, batch_size=1024):
+        """Run the network on an encoded feature matrix, returns an (n,) array"""
+        if self.engine is not None:
+            return self.engine.predict(X_enc)
+        return self.model.predict(X_enc, batch_size=batch_size, verbose=0).flatten()
+    
     def predict(self, user_input):
         """Make prediction for a single user input"""
-        if self.model is None or self.preprocessor is None:
+        if not self.is_ready():
             raise ValueError("Model not trained or loaded. Please train or load a model first.")
         
-        # Normalize categorical inputs
-        ex = str(user_input["Exercise Frequency"]).lower().strip()
-        diet = str(user_input["Diet"]).lower().strip()
-        sym = str(user_input["Symptoms"]).lower().strip()
-        
-        # Create input dataframe
-        X_one = pd.DataFrame([{
-            "Age": user_input["Age"],
-            "BMI": user_input["BMI"],
-            "Stress Level": user_input["Stress Level"],
-            "Sleep Hours": user_input["Sleep Hours"],
-            "Cycle Length": user_input["Cycle Length"],
-            "Period Length": user_input["Period Length"],
-            "Exercise Frequency": ex,
-            "Diet": diet,
-            "Symptoms": sym,
-        }])
-        
-        # Transform input
-        X_one_enc = self.preprocessor.transform(X_one)
-        X_one_enc = X_one_enc.toarray() if hasattr(X_one_enc, "toarray") else np.array(X_one_enc)
+        stopwatch = start_stopwatch()
+        
+        # Normalize inputs; the normalized feature tuple is the cache key
+        record = normalize_record(user_input)
+        key = tuple(record[col] for col in NUM_COLS + CAT_COLS)
+        stopwatch.lap("normalize")
+        
+        pred_days = self.cache.get_or_compute(key, lambda: self._predict_record(record, stopwatch))
+        # Cache lookup/store, or the whole hit
+        stopwatch.lap("cache")
+        stopwatch.finish()
+        return pred_days
+    
+    @property
+    def has_intervals(self):
+        """Whether the served model is an ensemble that can give a likely range"""
+        return isinstance(self.engine, EnsembleMLP)
+    
+    def predict_interval(self, user_input):
+        """(days, low, high) for a single user input; low/high are None unless serving an ensemble"""
+        if not self.has_intervals:
+            return self.predict(user_input), None, None
+        
+        stopwatch = start_stopwatch()
+        record = normalize_record(user_input)
+        key = ("interval",) + tuple(record[col] for col in NUM_COLS + CAT_COLS)
+        stopwatch.lap("normalize")
+        
+        def compute():
+            X_one_enc = self.encoder.transform_one(record)
+            stopwatch.lap("encode")
+            days, low, high = self.engine.interval(X_one_enc)
+            stopwatch.lap("infer")
+            return tuple(max(1.0, float(v[0])) for v in (days, low, high))
+        
+        result = self.cache.get_or_compute(key, compute)
+        stopwatch.lap("cache")
+        stopwatch.finish()
+        return result
+    
+    def enable_lut(self, lut):
+        """Serve in-grid predictions from a lookup table built for this exact model"""
+        artifact_id = self.manifest.get("artifact_id") if self.manifest else None
+        if lut.artifact_id != artifact_id:
+            raise ValueError(f"LUT was built for model {lut.artifact_id}, loaded model is {artifact_id}")
+        self.lut = lut
+        self.cache.clear()
+    
+    def enable_batching(self, max_batch=64, max_wait_ms=2.0):
+        """Batch concurrent single predictions into one inference call"""
+        self.batcher = MicroBatcher(self.infer, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        return self.batcher
+    
+    def _predict_record(self, record, stopwatch=NULL_STOPWATCH):
+        """Uncached prediction for one normalized feature dict"""
+        if self.lut is not None:
+            pred_days = self.lut.lookup(record)
+            stopwatch.lap("lut")
+            if pred_days is not None:
+                return max(1.0, pred_days)
+        
+        # Encode straight into a NumPy row (no DataFrame / ColumnTransformer)
+        X_one_enc = self.encoder.transform_one(record)
+        stopwatch.lap("encode")
         
         # Make prediction
-        pred_days = float(self.model.predict(X_one_enc, verbose=0).flatten()[0])
+        if self.batcher is not None:
+            pred_days = self.batcher.predict(X_one_enc)
+            stopwatch.lap("batch_wait")
+        else:
+            pred_days = float(self.infer(X_one_enc)[0])
+            stopwatch.lap("infer")
         pred_days = max(1.0, pred_days)
         
         return pred_days
     
-    def save(self, model_path="saved_model", preprocessor_path="preprocessor.pkl"):
-        """Save the model and preprocessor"""
-        if self.model is None or self.preprocessor is None:
+    def predict_batch(self, records, batch_size=1024, interval=False):
+        """Make predictions for many user inputs in one vectorized pass
+
+        interval=True returns (days, low, high) arrays, see predict_interval().
+        """
+        if not self.is_ready():
+            raise ValueError("Model not trained or loaded. Please train or load a model first.")
+        
+        stopwatch = start_stopwatch()
+        X = normalize_records(records)
+        if len(X) == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return (empty, None, None) if interval else empty
+        stopwatch.lap("batch_normalize")
+        
+        # Encode the whole batch at once
+        X_enc = self.encoder.transform(X)
+        stopwatch.lap("batch_encode")
+        
+        # Single inference call, results keep the input order
+        if interval and self.has_intervals:
+            days, low, high = (np.maximum(1.0, v.astype(np.float64)) for v in self.engine.interval(X_enc))
+            stopwatch.lap("batch_infer")
+            stopwatch.finish()
+            return days, low, high
+        pred_days = self.infer(X_enc, batch_size=batch_size)
+        stopwatch.lap("batch_infer")
+        stopwatch.finish()
+        pred_days = np.maximum(1.0, pred_days.astype(np.float64))
+        return (pred_days, None, None) if interval else pred_days
+    
+    def forecast(self, user_input, horizon=DEFAULT_HORIZON, cycle_start=None):
+        """The next `horizon` cycle starts for one user input, from one batched forward pass
+
+        Cycle i starts where cycle i-1 is predicted to end. Only Age changes between
+        the cycles: it advances by the input Cycle Length per cycle, so all rows are
+        built and inferred together. Returns a dict of (horizon,) arrays:
+        "days" from each start to the next (the predict() value for cycle 1),
+        "offsets" in days from cycle_start, and "dates" as datetime64[D] when
+        cycle_start (a date or YYYY-MM-DD) is given. Ensembles add "low"/"high"
+        offsets, whose spread accumulates over the cycles.
+        """
+        if not self.is_ready():
+            raise ValueError("Model not trained or loaded. Please train or load a model first.")
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}")
+        
+        stopwatch = start_stopwatch()
+        record = normalize_record(user_input)
+        stopwatch.lap("forecast_normalize")
+        
+        # One encoded row per cycle, Age advanced by the elapsed cycles
+        X_enc = np.repeat(self.encoder.transform_one(record), horizon, axis=0)
+        j = self.encoder.num_cols.index("Age")
+        ages = record["Age"] + np.arange(horizon) * record["Cycle Length"] / DAYS_PER_YEAR
+        X_enc[:, j] = (ages - self.encoder.mean[j]) / self.encoder.scale[j]
+        stopwatch.lap("forecast_encode")
+        
+        low = high = None
+        if self.has_intervals:
+            days, var = self.engine.spread(X_enc)
+            days = np.maximum(1.0, days.astype(np.float64))
+            offsets = np.cumsum(days)
+            # Independent cycles: variances add up along the horizon
+            half = INTERVAL_Z * np.sqrt(np.cumsum(var + self.engine.noise_std ** 2))
+            low, high = np.maximum(1.0, offsets - half), offsets + half
+        else:
+            days = np.maximum(1.0, self.infer(X_enc).astype(np.float64))
+            offsets = np.cumsum(days)
+        stopwatch.lap("forecast_infer")
+        
+        dates = None
+        if cycle_start is not None:
+            # Whole days, like the single-cycle date in app.py
+            dates = np.datetime64(cycle_start, "D") + np.floor(offsets).astype("timedelta64[D]")
+        stopwatch.finish()
+        return {"days": days, "offsets": offsets, "dates": dates, "low": low, "high": high}
+    
+    def weights(self):
+        """Return (kernels, biases, activations) of the current network, as floats"""
+        if self.engine is not None:
+            kernels, scales = self.engine.kernels, getattr(self.engine, "scales", None)
+            if any(s is not None for s in scales or ()) or any(w.dtype == np.float16 for w in kernels):
+                kernels = dequantize(kernels, scales)
+            return kernels, self.engine.biases, self.engine.activations
+        return extract_weights(self.model)
+    
+    def save(self, artifact_path="model_artifact", onnx=False, precision="float32"):
+        """Save weights, encoder tables and metrics as a new artifact version
+
+        onnx=True also writes model.onnx, the full pipeline (scaler and one-hot
+        folded into the first layer) as one ONNX graph, see onnx_export.py.
+        precision="float16" or "int8" stores quantized Dense weights, see quantize.py.
+        """
+        if not self.is_ready():
             raise ValueError("No model or preprocessor to save")
         
-        print(f"\nSaving model to '{model_path}'...")
-        self.model.save(model_path)
+        kernels, biases, activations = self.weights()
+        kernels, scales = quantize(kernels, precision)
+        arrays = {
+            "scaler_mean": self.encoder.mean,
+            "scaler_scale": self.encoder.scale,
+        }
+        for i, (w, b, scale) in enumerate(zip(kernels, biases, scales)):
+            arrays[f"W{i}"] = w
+            arrays[f"b{i}"] = b
+            if scale is not None:
+                arrays[f"W{i}_scale"] = np.array([scale], dtype=np.float32)
         
-        print(f"Saving preprocessor to '{preprocessor_path}'...")
-        with open(preprocessor_path, 'wb') as f:
-            pickle.dump(self.preprocessor, f)
+        meta = {
+            "num_cols": self.encoder.num_cols,
+            "cat_cols": self.encoder.cat_cols,
+            "categories": [cats.tolist() for cats in self.encoder.categories],
+            "category_slots": self.encoder.slots,
+            "activations": list(activations),
+            "precision": precision,
+            **({"ensemble_size": self.engine.n_members} if self.has_intervals else {}),
+            "hyperparams": {**self.hyperparams, "hidden_units": list(self.hyperparams["hidden_units"])},
+            "metrics": self.metrics,
+        }
         
-        # Save accuracy
-        with open("model_accuracy.txt", 'w') as f:
-            f.write(f"{self.model_accuracy:.2f}")
+        files = {}
+        if onnx and self.has_intervals:
+            raise ValueError("ONNX export of ensembles is not supported")
+        if onnx:
+            from onnx_export import build_pipeline_graph
+            files["model.onnx"] = build_pipeline_graph(
+                self.encoder, kernels, biases, activations, scales=scales
+            ).SerializeToString()
         
-        print("✅ Model and preprocessor saved successfully!")
+        print(f"\nSaving model artifact to '{artifact_path}'...")
+        version_dir = save_artifact(artifact_path, arrays, meta, files=files)
+        print(f"✅ Model saved successfully! ({version_dir})")
+        return version_dir
     
-    def load(self, model_path="saved_model", preprocessor_path="preprocessor.pkl"):
-        """Load the saved model and preprocessor"""
-        print(f"Loading model from '{model_path}'...")
-        self.model = tf.keras.models.load_model(model_path)
+    def load(self, artifact_path="model_artifact", backend="numpy", mmap=True):
+        """Load a model artifact (the current version of a root, or a specific version)
+
+        backend="numpy" serves from the memory-mapped weights without TensorFlow,
+        "onnxruntime" and "sklearn" run the same weights in those runtimes (backends.py),
+        backend="keras" rebuilds the Keras model from the same weights.
+        """
+        print(f"Loading model artifact from '{artifact_path}'...")
+        start = time.perf_counter()
+        arrays, manifest = load_artifact(artifact_path, mmap_mode="r" if mmap else None)
+        
+        encoder = FastEncoder(
+            manifest["num_cols"], arrays["scaler_mean"], arrays["scaler_scale"],
+            manifest["cat_cols"], manifest["categories"], manifest.get("category_slots")
+        )
+        activations = manifest["activations"]
+        kernels = [arrays[f"W{i}"] for i in range(len(activations))]
+        biases = [arrays[f"b{i}"] for i in range(len(activations))]
+        # Quantized artifacts: int8 kernels carry a per-layer scale, float16 ones none
+        scales = None
+        if manifest.get("precision", "float32") != "float32":
+            scales = [float(arrays[f"W{i}_scale"][0]) if f"W{i}_scale" in arrays else None
+                      for i in range(len(activations))]
+        self.hyperparams = {**DEFAULT_HYPERPARAMS, **manifest.get("hyperparams", {})}
+        self.hyperparams["hidden_units"] = tuple(self.hyperparams["hidden_units"])
         
-        print(f"Loading preprocessor from '{preprocessor_path}'...")
-        with open(preprocessor_path, 'rb') as f:
-            self.preprocessor = pickle.load(f)
+        if manifest.get("ensemble_size") and backend != "numpy":
+            raise ValueError(f"Ensemble artifacts are served by the numpy backend only, not {backend}")
+        if manifest.get("ensemble_size"):
+            noise_std = manifest.get("metrics", {}).get("noise_std", 0.0)
+            self.engine = EnsembleMLP(kernels, biases, activations, scales, noise_std=noise_std)
+            self.model = None
+        elif backend == "keras":
+            if scales is not None:
+                kernels = dequantize(kernels, scales)
+            self.model = self.build_model_from_weights(kernels, biases, activations)
+            self.engine = None
+        else:
+            self.engine = create_engine(backend, kernels, biases, activations, scales)
+            self.model = None
         
-        # Load accuracy
-        if os.path.exists("model_accuracy.txt"):
-            with open("model_accuracy.txt", 'r') as f:
-                self.model_accuracy = float(f.read().strip())
+        self.encoder = encoder
+        self.preprocessor = None
+        self.manifest = manifest
+        self.metrics = manifest.get("metrics", {})
+        self.model_accuracy = self.metrics.get("accuracy")
+        self.lut = None
+        self._holdout = None
+        self.cache.clear()
         
-        print("✅ Model and preprocessor loaded successfully!")
+        MODEL_LOAD_SECONDS.set(time.perf_counter() - start, backend)
+        MODEL_LOADS.inc(backend)
+        print(f"✅ Model {manifest['version']} loaded successfully!")
         return self
+    
+    def build_model_from_weights(self, kernels, biases, activations, learning_rate=None):
+        """Rebuild a compiled Keras model from exported weights"""
+        require_tensorflow()
+        
+        self.model = tf.keras.Sequential(
+            [tf.keras.layers.Input(shape=(kernels[0].shape[0],))]
+            + [tf.keras.layers.Dense(w.shape[1], activation=a) for w, a in zip(kernels, activations)]
+        )
+        self.model.set_weights([np.array(arr) for pair in zip(kernels, biases) for arr in pair])
+        self.model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate or self.hyperparams["learning_rate"]),
+            loss="mse",
+            metrics=[tf.keras.metrics.MeanAbsoluteError(name="mae")]
+        )
+        return self.model
 
 def calculate_bmi(weight_kg, height_m):
     """Calculate BMI from weight and height"""
@@ -0,0 +1,134 @@
+"""
+Pure-NumPy inference engine for the 32-16-1 MLP
+Weights are exported from the trained Keras model or sklearn MLPRegressor to a compact .npz,
+so serving needs neither TensorFlow nor the sklearn estimator.
+
+    python numpy_engine.py saved_model model_weights.npz
+"""
+
+import sys
+import numpy as np
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+def _identity(x):
+    return x
+
+def _tanh(x):
+    return np.tanh(x, out=x)
+
+def _logistic(x):
+    return np.divide(1.0, 1.0 + np.exp(-x), out=x)
+
+# Keras and sklearn names for the same activations
+ACTIVATIONS = {
+    "relu": _relu,
+    "linear": _identity,
+    "identity": _identity,
+    "tanh": _tanh,
+    "sigmoid": _logistic,
+    "logistic": _logistic,
+}
+
+def extract_weights(model):
+    """Return (kernels, biases, activations) from a Keras model, an MLPRegressor or a Pipeline ending in one"""
+    if hasattr(model, "steps"):
+        model = model.steps[-1][1]
+
+    # sklearn MLPRegressor
+    if hasattr(model, "coefs_"):
+        n_hidden = len(model.coefs_) - 1
+        activations = [model.activation] * n_hidden + [model.out_activation_]
+        return list(model.coefs_), list(model.intercepts_), activations
+
+    # Keras Sequential of Dense layers
+    kernels, biases, activations = [], [], []
+    for layer in model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        if len(weights) != 2:
+            raise ValueError(f"Unsupported layer for export: {layer.name}")
+        kernels.append(weights[0])
+        biases.append(weights[1])
+        activations.append(layer.get_config().get("activation", "linear"))
+    return kernels, biases, activations
+
+def export_weights(model, path="model_weights.npz"):
+    """Dump a trained model's weights and biases to a compact .npz"""
+    kernels, biases, activations = extract_weights(model)
+    arrays = {"activations": np.array(activations)}
+    for i, (w, b) in enumerate(zip(kernels, biases)):
+        arrays[f"W{i}"] = np.asarray(w)
+        arrays[f"b{i}"] = np.asarray(b)
+    np.savez(path, **arrays)
+    return path
+
+class NumpyMLP:
+    """Dense forward pass over exported weights, a drop-in for model.predict"""
+
+    def __init__(self, kernels, biases, activations, scales=None):
+        if not (len(kernels) == len(biases) == len(activations)):
+            raise ValueError("kernels, biases and activations must have the same length")
+        unknown = set(activations) - set(ACTIVATIONS)
+        if unknown:
+            raise ValueError(f"Unsupported activations: {sorted(unknown)}")
+
+        self.kernels = list(kernels)
+        self.biases = list(biases)
+        self.activations = [str(a) for a in activations]
+        self._fns = [ACTIVATIONS[a] for a in self.activations]
+        # Per-layer scales of int8 kernels (quantize.py), None for float kernels
+        self.scales = list(scales) if scales is not None else [None] * len(self.kernels)
+        # Keras weights are float32, sklearn's float64; compute in the trained precision
+        # (float32 for float16/int8 kernels)
+        self.dtype = np.result_type(np.float32, *self.kernels)
+        self.n_features = self.kernels[0].shape[0]
+
+    @classmethod
+    def from_model(cls, model):
+        """Build the engine directly from a trained Keras model, MLPRegressor or Pipeline"""
+        return cls(*extract_weights(model))
+
+    @classmethod
+    def load(cls, path="model_weights.npz"):
+        """Load an engine from an exported .npz"""
+        with np.load(path, allow_pickle=False) as data:
+            n_layers = sum(1 for k in data.files if k.startswith("W"))
+            kernels = [data[f"W{i}"] for i in range(n_layers)]
+            biases = [data[f"b{i}"] for i in range(n_layers)]
+            activations = data["activations"].tolist()
+            scales = [float(data[f"s{i}"]) if f"s{i}" in data.files else None for i in range(n_layers)]
+        return cls(kernels, biases, activations, scales)
+
+    def save(self, path="model_weights.npz"):
+        """Write the engine's weights (and the scales of int8 kernels) back to .npz"""
+        arrays = {"activations": np.array(self.activations)}
+        for i, (w, b, s) in enumerate(zip(self.kernels, self.biases, self.scales)):
+            arrays[f"W{i}"] = w
+            arrays[f"b{i}"] = b
+            if s is not None:
+                arrays[f"s{i}"] = np.float64(s)
+        np.savez(path, **arrays)
+        return path
+
+    def predict(self, X):
+        """Forward pass over an (n, n_features) matrix, returns an (n,) array"""
+        h = np.asarray(X, dtype=self.dtype)
+        for w, b, fn, s in zip(self.kernels, self.biases, self._fns, self.scales):
+            h = h @ w
+            if s is not None:
+                h *= s
+            h += b
+            h = fn(h)
+        return h.reshape(-1)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python numpy_engine.py <keras model path> <output .npz>")
+        sys.exit(1)
+
+    import tensorflow as tf
+    keras_model = tf.keras.models.load_model(sys.argv[1])
+    print(f"✅ Weights exported to '{export_weights(keras_model, sys.argv[2])}'")
@@ -0,0 +1,216 @@
+"""
+ONNX export of the full prediction pipeline
+
+The exported graph takes the raw features: a float `num` matrix (n, 6) and a
+string `cat` matrix (n, 3) with categories already lower-cased and stripped
+(normalize_record). It returns `days` (n, 1). The preprocessing is folded into
+the first layer:
+
+  - the scaler becomes part of the numeric block of W0 and b0
+    (x - mean) / scale @ W = x @ (W / scale) - (mean / scale) @ W
+  - each one-hot block becomes a LabelEncoder (category -> row) and a Gather
+    from that block's rows of W0, with an extra zero row for unknown categories
+    (the same as OneHotEncoder(handle_unknown="ignore"))
+
+so the graph is a handful of MatMul/Add/Relu nodes and runs in onnxruntime
+with no sklearn or TensorFlow. build_mlp_graph builds just the network over an
+already-encoded matrix, which the onnxruntime backend uses.
+
+    python onnx_export.py --artifact model_artifact --out model.onnx
+    python onnx_export.py --pipeline artifacts/main_model-<fingerprint>.pkl --out main_model.onnx
+"""
+
+import argparse
+import sys
+import numpy as np
+
+OPSET = 17
+ML_OPSET = 2
+
+# ONNX activation op per Keras/sklearn activation name (None = no op)
+ONNX_ACTIVATIONS = {
+    "relu": "Relu",
+    "linear": None,
+    "identity": None,
+    "tanh": "Tanh",
+    "sigmoid": "Sigmoid",
+    "logistic": "Sigmoid",
+}
+
+def _require_onnx():
+    try:
+        import onnx
+    except ImportError:
+        raise ImportError("ONNX export needs the onnx package: uv sync --extra onnx") from None
+    return onnx
+
+def _weight(helper, nodes, initializers, name, w, scale, dtype):
+    """Add a weight initializer, returns the name of its float tensor
+
+    int8 kernels (with a scale) are stored as int8 behind DequantizeLinear and
+    float16 kernels behind a Cast, see quantize.py.
+    """
+    from onnx import numpy_helper
+    w = np.asarray(w)
+    if scale is not None:
+        initializers += [
+            numpy_helper.from_array(w.astype(np.int8), f"{name}_q"),
+            numpy_helper.from_array(np.array(scale, dtype=np.float32), f"{name}_scale"),
+        ]
+        nodes.append(helper.make_node("DequantizeLinear", [f"{name}_q", f"{name}_scale"], [name]))
+    elif w.dtype == np.float16 and np.dtype(dtype) != np.float16:
+        initializers.append(numpy_helper.from_array(w, f"{name}_f16"))
+        nodes.append(helper.make_node("Cast", [f"{name}_f16"], [name],
+                                      to=helper.np_dtype_to_tensor_dtype(np.dtype(dtype))))
+    else:
+        initializers.append(numpy_helper.from_array(w.astype(dtype), name))
+    return name
+
+def _layers(helper, nodes, initializers, h, kernels, biases, activations, dtype, scales=None, start=0):
+    """Append MatMul + Add (+ activation) nodes for each layer, returns the output name"""
+    from onnx import numpy_helper
+    scales = scales if scales is not None else [None] * len(kernels)
+    for i, (w, b, act, scale) in enumerate(zip(kernels, biases, activations, scales), start=start):
+        if w is not None:
+            weight = _weight(helper, nodes, initializers, f"W{i}", w, scale, dtype)
+            nodes.append(helper.make_node("MatMul", [h, weight], [f"mm{i}"]))
+            h = f"mm{i}"
+        initializers.append(numpy_helper.from_array(np.asarray(b, dtype=dtype), f"b{i}"))
+        nodes.append(helper.make_node("Add", [h, f"b{i}"], [f"z{i}"]))
+        h = f"z{i}"
+        op = ONNX_ACTIVATIONS[act]
+        if op:
+            nodes.append(helper.make_node(op, [h], [f"a{i}"]))
+            h = f"a{i}"
+    return h
+
+def _model(helper, graph):
+    onnx = _require_onnx()
+    model = helper.make_model(graph, opset_imports=[
+        helper.make_opsetid("", OPSET), helper.make_opsetid("ai.onnx.ml", ML_OPSET)
+    ])
+    # Loadable by onnxruntime builds that predate the latest IR version
+    model.ir_version = min(model.ir_version, 8)
+    onnx.checker.check_model(model)
+    return model
+
+def build_mlp_graph(kernels, biases, activations, dtype=np.float32, scales=None):
+    """ONNX model of the network alone: input X (n, n_features) -> days (n, 1)"""
+    onnx = _require_onnx()
+    helper = onnx.helper
+    elem = onnx.helper.np_dtype_to_tensor_dtype(np.dtype(dtype))
+    nodes, initializers = [], []
+    out = _layers(helper, nodes, initializers, "X", kernels, biases, activations, dtype, scales)
+    nodes.append(helper.make_node("Identity", [out], ["days"]))
+    graph = helper.make_graph(
+        nodes, "mcp_mlp",
+        [helper.make_tensor_value_info("X", elem, [None, kernels[0].shape[0]])],
+        [helper.make_tensor_value_info("days", elem, [None, kernels[-1].shape[1]])],
+        initializers,
+    )
+    return _model(helper, graph)
+
+def build_pipeline_graph(encoder, kernels, biases, activations, dtype=np.float32, scales=None):
+    """ONNX model of encoder + network: inputs num (n, n_num) float and cat (n, n_cat) string -> days
+
+    Quantized kernels (quantize.py) stay quantized: the folded first-layer blocks
+    are re-quantized at the same precision, one scale per block.
+    """
+    onnx = _require_onnx()
+    from onnx import numpy_helper
+    from quantize import dequantize, quantize_kernel
+    helper = onnx.helper
+    elem = onnx.helper.np_dtype_to_tensor_dtype(np.dtype(dtype))
+    scales = scales if scales is not None else [None] * len(kernels)
+    precision = "int8" if scales[0] is not None else "float16" if kernels[0].dtype == np.float16 else None
+
+    W0 = np.asarray(dequantize(kernels[:1], scales[:1])[0] if precision else kernels[0], dtype=np.float64)
+    b0 = np.asarray(biases[0], dtype=np.float64)
+    W_num = W0[:encoder.n_num]
+    # Fold the scaler into the numeric block
+    W_num_folded = W_num / encoder.scale[:, None]
+    b0_folded = b0 - (encoder.mean / encoder.scale) @ W_num
+
+    def block(name, w):
+        stored, scale = quantize_kernel(w.astype(np.float32), precision) if precision else (w, None)
+        return _weight(helper, nodes, initializers, name, stored, scale, dtype)
+
+    nodes, initializers = [helper.make_node("Cast", ["num"], ["num_cast"], to=elem)], []
+    nodes.append(helper.make_node("MatMul", ["num_cast", block("W0_num", W_num_folded)], ["h0_num"]))
+    h = "h0_num"
+
+    for j, (col, cats, offset) in enumerate(zip(encoder.cat_cols, encoder.categories, encoder.offsets)):
+        k = len(cats)
+        # Rows of W0 for this block plus a zero row for unknown categories
+        table = np.vstack([W0[offset:offset + k], np.zeros((1, W0.shape[1]))])
+        initializers.append(numpy_helper.from_array(np.array(j, dtype=np.int64), f"col{j}"))
+        nodes += [
+            helper.make_node("Gather", ["cat", f"col{j}"], [f"cat{j}"], axis=1),
+            helper.make_node("LabelEncoder", [f"cat{j}"], [f"idx{j}"], domain="ai.onnx.ml",
+                             keys_strings=[str(c) for c in cats], values_int64s=list(range(k)),
+                             default_int64=k, name=f"encode_{col.replace(' ', '_')}"),
+            helper.make_node("Gather", [block(f"W0_cat{j}", table), f"idx{j}"], [f"h0_cat{j}"], axis=0),
+            helper.make_node("Add", [h, f"h0_cat{j}"], [f"h0_sum{j}"]),
+        ]
+        h = f"h0_sum{j}"
+
+    # First layer's bias/activation, then the remaining layers unchanged
+    out = _layers(helper, nodes, initializers, h, [None] + list(kernels[1:]),
+                  [b0_folded] + list(biases[1:]), activations, dtype, [None] + list(scales[1:]))
+    nodes.append(helper.make_node("Identity", [out], ["days"]))
+
+    graph = helper.make_graph(
+        nodes, "mcp_pipeline",
+        [
+            helper.make_tensor_value_info("num", onnx.TensorProto.DOUBLE, [None, encoder.n_num]),
+            helper.make_tensor_value_info("cat", onnx.TensorProto.STRING, [None, len(encoder.cat_cols)]),
+        ],
+        [helper.make_tensor_value_info("days", elem, [None, kernels[-1].shape[1]])],
+        initializers,
+    )
+    return _model(helper, graph)
+
+def pipeline_inputs(records, encoder):
+    """Feed dict for the pipeline graph from normalized feature dicts"""
+    num = np.array([[r[c] for c in encoder.num_cols] for r in records], dtype=np.float64)
+    cat = np.array([[r[c] for c in encoder.cat_cols] for r in records], dtype=object)
+    return {"num": num.reshape(-1, encoder.n_num), "cat": cat.reshape(-1, len(encoder.cat_cols))}
+
+def export_pipeline(pipeline, path):
+    """Export a fitted sklearn Pipeline (ColumnTransformer + MLPRegressor, as in main.py)"""
+    from fast_encoder import FastEncoder
+    from numpy_engine import extract_weights
+    encoder = FastEncoder.from_preprocessor(pipeline.steps[0][1])
+    model = build_pipeline_graph(encoder, *extract_weights(pipeline))
+    with open(path, "wb") as f:
+        f.write(model.SerializeToString())
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--artifact", help="model.py artifact root or version directory")
+    source.add_argument("--pipeline", help="main.py pickled sklearn Pipeline")
+    parser.add_argument("--out", default="model.onnx")
+    args = parser.parse_args()
+
+    if args.pipeline:
+        import pickle
+        with open(args.pipeline, "rb") as f:
+            saved = pickle.load(f)
+        export_pipeline(saved["pipeline"] if isinstance(saved, dict) else saved, args.out)
+    else:
+        from ensemble import EnsembleMLP
+        from model import MenstrualCyclePredictionModel
+        mcp_model = MenstrualCyclePredictionModel(cache_size=0).load(args.artifact)
+        engine = mcp_model.engine
+        if isinstance(engine, EnsembleMLP):
+            sys.exit(f"❌ {args.artifact}: ONNX export of ensembles is not supported")
+        model = build_pipeline_graph(mcp_model.encoder, engine.kernels, engine.biases, engine.activations,
+                                     scales=engine.scales)
+        with open(args.out, "wb") as f:
+            f.write(model.SerializeToString())
+    print(f"✅ ONNX pipeline written to '{args.out}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Request payload helpers shared by the Flask apps
+"""
+
+import json
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+def parse_batch_body(body, mimetype=None):
+    """Parse a JSON array or NDJSON request body into a list of records"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+
+    body = body.strip()
+    if not body:
+        return []
+
+    # A JSON array is the default, NDJSON is used when asked for or when the body is not one JSON value
+    if mimetype not in NDJSON_MIMETYPES:
+        try:
+            records = json.loads(body)
+        except json.JSONDecodeError:
+            records = None
+        if records is not None:
+            if not isinstance(records, list):
+                raise ValueError("Batch body must be a JSON array of records")
+            return records
+
+    records = []
+    for line_no, line in enumerate(body.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid NDJSON on line {line_no}: {e.msg}")
+    return records
@@ -0,0 +1,92 @@
+"""
+In-process LRU/TTL cache for single predictions
+Keys are normalized feature tuples; the whole cache is invalidated when a new model is loaded.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+class PredictionCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss/eviction counters"""
+
+    def __init__(self, maxsize=4096, ttl=3600.0):
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl) if ttl else None
+        self.generation = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default"""
+        if not self.enabled:
+            return default
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, generation=None):
+        """Store a value; writes computed against an older model generation are dropped"""
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, calling compute() on a miss"""
+        generation = self.generation
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value, generation)
+        return value
+
+    def clear(self):
+        """Drop every entry and start a new generation (call when the model changes)"""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def stats(self):
+        """Counters for health/metrics endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "generation": self.generation,
+            }
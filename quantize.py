@@ -0,0 +1,159 @@
+"""
+Post-training quantization of the MLP's Dense weights
+
+float16 halves the weight storage and int8 quarters it. int8 uses one symmetric
+scale per layer:
+
+    s = max|W| / 127,   q = round(W / s),   W ~ q * s
+
+Biases stay float32 (a few dozen values). Only the weights are quantized. The
+activations stay float32, so a row's prediction never depends on the other rows
+in its batch. The NumPy engine multiplies by the stored int8/float16 kernels and
+rescales each layer's output. The ONNX graph keeps them as int8 initializers
+behind DequantizeLinear (float16 behind a Cast).
+
+The report trains once, saves one artifact per precision, and compares held-out
+MAE/RMSE, latency and size against the float32 model:
+
+    python quantize.py --csv path/to/data.csv --out-dir quantized
+    python quantize.py --rows 50000            # synthetic data (synthetic_data.py)
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import time
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "int8")
+INT8_MAX = 127
+
+def quantize_kernel(w, precision):
+    """Return (stored kernel, scale) for one weight matrix; scale is None unless int8"""
+    if precision == "float32":
+        return w, None
+    w = np.asarray(w, dtype=np.float32)
+    if precision == "float16":
+        return w.astype(np.float16), None
+    if precision == "int8":
+        peak = float(np.max(np.abs(w)))
+        scale = peak / INT8_MAX if peak > 0 else 1.0
+        q = np.clip(np.rint(w / scale), -INT8_MAX, INT8_MAX).astype(np.int8)
+        return q, scale
+    raise ValueError(f"Unknown precision: {precision} (choose from {', '.join(PRECISIONS)})")
+
+def quantize(kernels, precision):
+    """Quantize every kernel, returns (kernels, scales)"""
+    pairs = [quantize_kernel(w, precision) for w in kernels]
+    return [q for q, _ in pairs], [s for _, s in pairs]
+
+def dequantize(kernels, scales):
+    """float32 kernels back from stored int8/float16 ones"""
+    return [np.asarray(w, dtype=np.float32) * np.float32(1.0 if s is None else s) for w, s in zip(kernels, scales)]
+
+def _dir_kb(path, prefix=""):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path) if f.startswith(prefix)) / 1024
+
+def _onnx_available():
+    return all(importlib.util.find_spec(name) is not None for name in ("onnx", "onnxruntime"))
+
+def quantization_report(mcp_model, precisions=PRECISIONS, out_dir="quantized", backends=None,
+                        latency_calls=2000, batch_size=1024):
+    """Save mcp_model at each precision and measure it on the held-out split of its last train()
+
+    Returns one dict per (precision, backend) with MAE/RMSE (and their change against
+    float32), single-row p50 latency, batch throughput and artifact sizes.
+    """
+    from model import MenstrualCyclePredictionModel
+    # Ensembles have no ONNX export, so no onnxruntime backend either
+    with_onnx = _onnx_available() and not mcp_model.has_intervals
+    backends = backends or (("numpy", "onnxruntime") if with_onnx else ("numpy",))
+    holdout = list(mcp_model.holdout_batches())
+    X = np.vstack([X_enc for X_enc, _ in holdout])
+    rows = [X[i:i + 1] for i in range(min(latency_calls, len(X)))]
+    batch = X[:batch_size]
+
+    results = []
+    for precision in precisions:
+        path = os.path.join(out_dir, precision)
+        version_dir = mcp_model.save(path, onnx=with_onnx, precision=precision)
+        sizes = {
+            "weights_kb": round(_dir_kb(version_dir, "W"), 2),
+            "artifact_kb": round(_dir_kb(version_dir), 2),
+            "onnx_kb": round(_dir_kb(version_dir, "model.onnx"), 2) if with_onnx else None,
+        }
+        for backend in backends:
+            served = MenstrualCyclePredictionModel(cache_size=0).load(path, backend=backend)
+            scores = served.evaluate(holdout)
+
+            for row in rows[:50]:
+                served.infer(row)
+            samples = np.empty(len(rows))
+            for i, row in enumerate(rows):
+                start = time.perf_counter()
+                served.infer(row)
+                samples[i] = time.perf_counter() - start
+            start, n = time.perf_counter(), 0
+            while time.perf_counter() - start < 0.5:
+                served.infer(batch)
+                n += 1
+            per_batch = (time.perf_counter() - start) / n
+
+            results.append({
+                "precision": precision,
+                "backend": backend,
+                "mae": round(scores["mae"], 5),
+                "rmse": round(scores["rmse"], 5),
+                "p50_us": round(float(np.median(samples)) * 1e6, 2),
+                "rows_per_s": round(len(batch) / per_batch),
+                **sizes,
+            })
+
+    baseline = {r["backend"]: r for r in results if r["precision"] == "float32"}
+    for r in results:
+        base = baseline.get(r["backend"])
+        r["mae_delta"] = round(r["mae"] - base["mae"], 5) if base else None
+        r["rmse_delta"] = round(r["rmse"] - base["rmse"], 5) if base else None
+    return results
+
+def print_report(results):
+    print("=" * 104)
+    print(f"{'precision':<10} {'backend':<12} {'MAE':>8} {'dMAE':>9} {'RMSE':>8} {'dRMSE':>9} "
+          f"{'p50 us':>8} {'rows/s':>12} {'weights KB':>11} {'ONNX KB':>8}")
+    for r in results:
+        onnx_kb = f"{r['onnx_kb']:>8.1f}" if r["onnx_kb"] is not None else f"{'-':>8}"
+        print(f"{r['precision']:<10} {r['backend']:<12} {r['mae']:>8.4f} {r['mae_delta']:>+9.5f} "
+              f"{r['rmse']:>8.4f} {r['rmse_delta']:>+9.5f} {r['p50_us']:>8.1f} {r['rows_per_s']:>12,} "
+              f"{r['weights_kb']:>11.2f} {onnx_kb}")
+    print("=" * 104)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", help="training CSV (synthetic data when omitted)")
+    parser.add_argument("--rows", type=int, default=50_000, help="synthetic rows when no --csv is given")
+    parser.add_argument("--epochs", type=int, help="override the training epochs")
+    parser.add_argument("--precisions", default=",".join(PRECISIONS))
+    parser.add_argument("--out-dir", default="quantized")
+    args = parser.parse_args()
+
+    from model import MenstrualCyclePredictionModel
+    if args.csv:
+        from dataset_cache import load_dataset
+        df = load_dataset(args.csv)
+    else:
+        from synthetic_data import generate_frame
+        df = generate_frame(args.rows)
+
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": args.epochs} if args.epochs else None)
+    mcp_model.train(df, verbose=0)
+    results = quantization_report(mcp_model, args.precisions.split(","), args.out_dir)
+    print_report(results)
+
+    report_path = os.path.join(args.out_dir, "report.json")
+    with open(report_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Report written to '{report_path}'")
+
+if __name__ == "__main__":
+    main()
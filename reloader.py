@@ -0,0 +1,152 @@
+"""
+Zero-downtime model reload
+
+A reload builds and warms a complete new model next to the one being served,
+runs smoke predictions against it, and only then swaps the serving reference.
+Requests already running keep the model object they started with. When the new
+model fails to load or validate, the old one keeps serving, and the CURRENT
+pointer of the root it was loaded from is moved back to the version still in
+service. A failed reload from any other path leaves every CURRENT alone.
+
+Reloads are triggered explicitly (reload()) or by a polling watcher on the
+artifact root's CURRENT file.
+"""
+
+import math
+import os
+import threading
+import time
+from artifact import current_version, set_current
+from metrics import MODEL_RELOADS
+
+# Fixed inputs checked on every new model before it is swapped in
+SMOKE_INPUTS = [
+    {"Age": 25, "BMI": 22.0, "Stress Level": 5, "Sleep Hours": 7.0, "Cycle Length": 28, "Period Length": 5,
+     "Exercise Frequency": "weekly", "Diet": "balanced", "Symptoms": "none"},
+    {"Age": 38, "BMI": 31.5, "Stress Level": 9, "Sleep Hours": 5.0, "Cycle Length": 35, "Period Length": 7,
+     "Exercise Frequency": "none", "Diet": "irregular", "Symptoms": "cramps"},
+]
+
+# Plausible range for days until the next period
+PREDICTION_RANGE = (1.0, 120.0)
+
+class ReloadError(RuntimeError):
+    """Raised when a candidate model fails validation"""
+
+def smoke_test(model, inputs=SMOKE_INPUTS, prediction_range=PREDICTION_RANGE):
+    """Predict the smoke inputs one by one and as a batch; raises ReloadError on bad output
+
+    Runs with the model's lookup table disabled: predict() would answer from the
+    interpolated grid while predict_batch() runs the network, and the two differ by
+    up to the table's own error bound.
+    """
+    lut, model.lut = getattr(model, "lut", None), None
+    try:
+        single = [model.predict(record) for record in inputs]
+        batch = model.predict_batch(inputs)
+    finally:
+        model.lut = lut
+        # Drop the network answers so the served model caches the same values it will compute
+        if lut is not None:
+            model.cache.clear()
+    low, high = prediction_range
+    for record, one, many in zip(inputs, single, batch):
+        many = float(many)
+        # NaN compares false everywhere, so check both paths explicitly
+        for value in (one, many):
+            if not (math.isfinite(value) and low <= value <= high):
+                raise ReloadError(f"Smoke prediction {value!r} outside {prediction_range} for {record}")
+        if abs(one - many) > 1e-3:
+            raise ReloadError(f"Single ({one}) and batch ({many}) predictions disagree")
+    return single
+
+class ModelReloader:
+    """Builds, validates and swaps in new models; serializes concurrent reloads"""
+
+    def __init__(self, build, swap, current, artifact_path):
+        # build(path) -> loaded model, swap(model) publishes it, current() -> model in service or None
+        self.build = build
+        self.swap = swap
+        self.current = current
+        self.artifact_path = artifact_path
+        self.status = {"state": "idle", "version": None, "previous": None, "error": None,
+                       "seconds": None, "finished_at": None, "reloads": 0, "failures": 0}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._failed_version = None
+        # Root the model in service was loaded from; the first load uses artifact_path
+        self._served_path = artifact_path
+
+    @staticmethod
+    def _version(model):
+        return model.manifest.get("version") if model is not None and model.manifest else None
+
+    def reload(self, artifact_path=None):
+        """Load, warm and validate a new model, then swap it in; returns the status dict"""
+        path = artifact_path or self.artifact_path
+        with self._lock:
+            previous = self.current()
+            started = time.perf_counter()
+            self.status.update(state="reloading", error=None, previous=self._version(previous))
+            try:
+                candidate = self.build(path)
+                smoke_test(candidate)
+            except Exception as e:
+                self._failed(path, previous, e, started)
+                return dict(self.status)
+
+            # Single reference assignment: new requests see the new model, running ones finish on the old
+            self.swap(candidate)
+            self._failed_version = None
+            self._served_path = path
+            self.status.update(state="succeeded", version=self._version(candidate),
+                               seconds=round(time.perf_counter() - started, 3),
+                               finished_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            self.status["reloads"] += 1
+            MODEL_RELOADS.inc("succeeded")
+            print(f"🔄 Model reloaded: {self.status['previous']} -> {self.status['version']} "
+                  f"in {self.status['seconds']:.2f}s")
+            return dict(self.status)
+
+    def _failed(self, path, previous, error, started):
+        """Keep serving the previous model and point CURRENT back at it"""
+        self._failed_version = current_version(path)
+        state, previous_version = "failed", self._version(previous)
+        # Only the served model's own root knows previous_version; another root is not ours to rewrite
+        same_root = os.path.realpath(path) == os.path.realpath(self._served_path)
+        if previous_version and same_root and self._failed_version not in (None, previous_version):
+            try:
+                set_current(path, previous_version)
+                state = "rolled_back"
+            except Exception as e:
+                print(f"⚠️  Could not restore CURRENT to {previous_version}: {e}")
+        self.status.update(state=state, error=str(error), seconds=round(time.perf_counter() - started, 3),
+                           finished_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        self.status["failures"] += 1
+        MODEL_RELOADS.inc(state)
+        print(f"❌ Model reload failed ({error}); still serving {previous_version}")
+
+    def reload_async(self, artifact_path=None):
+        """Start reload() on a background thread, returns the thread"""
+        thread = threading.Thread(target=self.reload, args=(artifact_path,), name="model-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def start_watcher(self, interval=5.0):
+        """Poll the artifact root's CURRENT and reload when it names a new version"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                version = current_version(self.artifact_path)
+                served = self._version(self.current())
+                # Skip versions that already failed so a bad artifact is not retried every poll
+                if version and version != served and version != self._failed_version:
+                    print(f"👀 {os.path.join(self.artifact_path, 'CURRENT')} now names {version}")
+                    self.reload()
+
+        self._watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
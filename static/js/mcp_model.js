@@ -0,0 +1,99 @@
+// Forward pass of the exported MCP model (web_export.py) in plain JavaScript.
+// Same steps as the server: scale the numeric features, one-hot the categories
+// (unknown ones leave their block at zero), then Dense layers.
+// Works in the browser (window.MCPModel) and in Node (require) for the parity check.
+(function (root) {
+    const ACTIVATIONS = {
+        relu: x => (x > 0 ? x : 0),
+        linear: x => x,
+        identity: x => x,
+        tanh: Math.tanh,
+        sigmoid: x => 1 / (1 + Math.exp(-x)),
+        logistic: x => 1 / (1 + Math.exp(-x))
+    };
+
+    class MCPModel {
+        constructor(payload) {
+            if (payload.format !== 'mcp-web') {
+                throw new Error('Not an MCP web model');
+            }
+            this.accuracy = payload.accuracy;
+            this.numCols = payload.num_cols;
+            this.mean = payload.mean;
+            this.scale = payload.scale;
+            this.catCols = payload.cat_cols;
+            this.layers = payload.layers;
+            this.activations = payload.activations.map(name => {
+                if (!(name in ACTIVATIONS)) {
+                    throw new Error('Unsupported activation: ' + name);
+                }
+                return ACTIVATIONS[name];
+            });
+
+            // Column offset of every category in the encoded row
+            this.indexMaps = [];
+            let offset = this.numCols.length;
+            for (const cats of payload.categories) {
+                const map = new Map();
+                cats.forEach((cat, i) => map.set(cat, offset + i));
+                this.indexMaps.push(map);
+                offset += cats.length;
+            }
+            this.nFeatures = offset;
+        }
+
+        static async load(url) {
+            const response = await fetch(url);
+            if (!response.ok) {
+                throw new Error('Could not load model (' + response.status + ')');
+            }
+            return new MCPModel(await response.json());
+        }
+
+        // record: {'Age': 25, ..., 'Diet': 'balanced', ...} keyed like the training columns
+        encode(record) {
+            const x = new Float64Array(this.nFeatures);
+            this.numCols.forEach((col, j) => {
+                x[j] = (Number(record[col]) - this.mean[j]) / this.scale[j];
+            });
+            this.catCols.forEach((col, j) => {
+                const idx = this.indexMaps[j].get(String(record[col]).toLowerCase().trim());
+                if (idx !== undefined) {
+                    x[idx] = 1;
+                }
+            });
+            return x;
+        }
+
+        // Raw network output (days, before clamping)
+        forward(record) {
+            let h = this.encode(record);
+            this.layers.forEach((layer, l) => {
+                const W = layer.W;
+                const b = layer.b;
+                const fn = this.activations[l];
+                const out = new Float64Array(b.length);
+                for (let k = 0; k < b.length; k++) {
+                    let sum = b[k];
+                    for (let i = 0; i < h.length; i++) {
+                        sum += h[i] * W[i][k];
+                    }
+                    out[k] = fn(sum);
+                }
+                h = out;
+            });
+            return h[0];
+        }
+
+        // Days until the next period, at least 1 like the server
+        predict(record) {
+            return Math.max(1, this.forward(record));
+        }
+    }
+
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = MCPModel;
+    } else {
+        root.MCPModel = MCPModel;
+    }
+})(this);
@@ -27,6 +27,15 @@ window.addEventListener('DOMContentLoaded', function() {
             document.getElementById('next-cycle').textContent = '--';
         }
         
+        // Display the likely range (ensemble models only)
+        if (results.earliest_likely_date && results.latest_likely_date) {
+            const options = { month: 'short', day: 'numeric' };
+            const earliest = new Date(results.earliest_likely_date).toLocaleDateString('en-US', options);
+            const latest = new Date(results.latest_likely_date).toLocaleDateString('en-US', options);
+            document.getElementById('likely-range').textContent = earliest + ' - ' + latest;
+            document.getElementById('likely-range-item').style.display = '';
+        }
+        
         // Display accuracy
         document.getElementById('accuracy').textContent = results.accuracy || '--';
         
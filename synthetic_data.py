@@ -0,0 +1,150 @@
+"""
+Synthetic training data at any scale
+
+Generates rows with the same schema as the Kaggle dataset, using NumPy's
+Generator API. Rows come from fixed-size blocks, each with its own seed derived
+from (seed, block number), so the output for a seed is the same whatever chunk
+size it is streamed or written in. Columns are generated one whole block at a
+time, and categorical columns stay as pandas `category` codes until written.
+
+    python synthetic_data.py --rows 10000000 --out synthetic.csv
+    python train_model.py --stream --csv synthetic.csv
+
+main.get_sample_data() is the legacy 500-row generator and is left unchanged,
+so its seeded output (and the model cache keyed on it) stays reproducible.
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+
+TARGET_COL = "days_until_next_period"
+
+# Rows per independently seeded block
+BLOCK_ROWS = 1 << 16
+
+# Column -> distribution. Defaults mirror main.get_sample_data()
+DEFAULT_SPEC = {
+    "Age": {"dist": "integers", "low": 18, "high": 45},
+    "BMI": {"dist": "uniform", "low": 18, "high": 35, "decimals": 1},
+    "Stress Level": {"dist": "integers", "low": 1, "high": 11},
+    "Sleep Hours": {"dist": "uniform", "low": 4, "high": 10, "decimals": 1},
+    "Cycle Length": {"dist": "choice", "values": [21, 24, 26, 28, 30, 32, 35],
+                     "p": [0.05, 0.1, 0.15, 0.4, 0.15, 0.1, 0.05]},
+    "Period Length": {"dist": "choice", "values": [3, 4, 5, 6, 7],
+                      "p": [0.1, 0.25, 0.35, 0.2, 0.1]},
+    "Exercise Frequency": {"dist": "category", "values": ["none", "weekly", "daily", "occasionally"],
+                           "p": [0.2, 0.3, 0.25, 0.25]},
+    "Diet": {"dist": "category", "values": ["balanced", "vegan", "keto", "irregular"],
+             "p": [0.4, 0.2, 0.15, 0.25]},
+    "Symptoms": {"dist": "category", "values": ["none", "cramps", "headache", "bloating", "fatigue"],
+                 "p": [0.3, 0.25, 0.15, 0.15, 0.15]},
+}
+
+def make_spec(**overrides):
+    """DEFAULT_SPEC with some columns replaced, e.g. make_spec(Age={"dist": "normal", "mean": 30, "std": 6})"""
+    spec = dict(DEFAULT_SPEC)
+    spec.update(overrides)
+    return spec
+
+def _column(rng, params, n):
+    dist = params["dist"]
+    if dist == "integers":
+        return rng.integers(params["low"], params["high"], n, dtype=np.int16)
+    if dist == "choice":
+        values = np.asarray(params["values"], dtype=np.int16)
+        return values[rng.choice(len(values), n, p=params.get("p"))]
+    if dist == "category":
+        codes = rng.choice(len(params["values"]), n, p=params.get("p")).astype(np.int8)
+        return pd.Categorical.from_codes(codes, categories=params["values"])
+
+    if dist == "uniform":
+        col = rng.uniform(params["low"], params["high"], n)
+    elif dist == "normal":
+        col = rng.normal(params["mean"], params["std"], n)
+    else:
+        raise ValueError(f"Unknown distribution '{dist}'")
+    if "clip" in params:
+        col = np.clip(col, *params["clip"])
+    if "decimals" in params:
+        col = np.round(col, params["decimals"])
+    return col.astype(np.float32)
+
+def generate_block(seed, block, n, spec=None, noise_std=1.0):
+    """One block of n rows, seeded by (seed, block)"""
+    rng = np.random.default_rng([seed, block])
+    spec = spec or DEFAULT_SPEC
+    data = {col: _column(rng, params, n) for col, params in spec.items()}
+
+    # Same target rule as main.get_sample_data()
+    base_days = data["Cycle Length"].astype(np.float32) - data["Period Length"]
+    variation = (data["Stress Level"] - 5) * 0.5 + (7 - data["Sleep Hours"]) * 0.3
+    noise = rng.normal(0, noise_std, n)
+    data[TARGET_COL] = np.maximum(1, base_days + variation + noise).astype(np.int16)
+    return pd.DataFrame(data)
+
+def generate(n_rows, seed=42, chunk_size=1_000_000, spec=None, noise_std=1.0):
+    """Yield DataFrames of up to chunk_size rows, n_rows in total"""
+    # Slices of blocks that make up the next chunk; every row is copied once, into its chunk
+    pieces, needed = [], chunk_size
+    for block, start in enumerate(range(0, n_rows, BLOCK_ROWS)):
+        frame = generate_block(seed, block, min(BLOCK_ROWS, n_rows - start), spec, noise_std)
+        offset = 0
+        while offset < len(frame):
+            take = min(needed, len(frame) - offset)
+            pieces.append(frame.iloc[offset:offset + take])
+            offset += take
+            needed -= take
+            if needed == 0:
+                yield pd.concat(pieces, ignore_index=True)
+                pieces, needed = [], chunk_size
+    if pieces:
+        yield pd.concat(pieces, ignore_index=True)
+
+def generate_frame(n_rows, seed=42, spec=None, noise_std=1.0):
+    """All n_rows in one DataFrame"""
+    return next(generate(n_rows, seed, chunk_size=max(n_rows, 1), spec=spec, noise_std=noise_std))
+
+def write(path, n_rows, seed=42, chunk_size=1_000_000, spec=None, noise_std=1.0):
+    """Write n_rows to a .csv or .parquet file chunk by chunk, returns the row count"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    written = 0
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        for chunk in generate(n_rows, seed, chunk_size, spec, noise_std):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            writer = writer or pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+            written += len(chunk)
+        if writer:
+            writer.close()
+    else:
+        with open(tmp_path, "w", newline="") as f:
+            for chunk in generate(n_rows, seed, chunk_size, spec, noise_std):
+                chunk.to_csv(f, index=False, header=written == 0)
+                written += len(chunk)
+    os.replace(tmp_path, path)
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--out", default="synthetic.csv", help=".csv or .parquet")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--noise-std", type=float, default=1.0, help="std of the target noise")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = write(args.out, args.rows, args.seed, args.chunk_size, noise_std=args.noise_std)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(args.out) / 2**20
+    print(f"✅ Wrote {rows:,} rows to '{args.out}' ({size_mb:.1f} MiB) in {elapsed:.1f}s "
+          f"({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
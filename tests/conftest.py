@@ -0,0 +1,26 @@
+"""
+Shared fixtures: a small model.py artifact trained once per session, and main.py
+"""
+
+import pytest
+from benchmarks.common import make_frame
+
+@pytest.fixture(scope="session")
+def artifact(tmp_path_factory):
+    """Artifact root of a model.py model trained on synthetic rows (needs TensorFlow)"""
+    pytest.importorskip("tensorflow")
+    from model import MenstrualCyclePredictionModel
+
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": 5}, cache_size=0)
+    mcp_model.train(make_frame(2000, seed=42), verbose=0)
+    path = str(tmp_path_factory.mktemp("artifact") / "model_artifact")
+    mcp_model.save(path)
+    return path
+
+@pytest.fixture(scope="session")
+def main_app(tmp_path_factory):
+    """main.py, which trains (or loads) its Pipeline on import, with its pickle kept in a temp dir"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("MCP_MODEL_DIR", str(tmp_path_factory.mktemp("main_artifacts")))
+        import main
+        yield main
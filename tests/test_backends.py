@@ -0,0 +1,48 @@
+"""
+Inference backends and ONNX exports against the NumPy forward pass
+"""
+
+import numpy as np
+import pytest
+from benchmarks.bench_backends import ATOL, encode, pipeline_parity
+from benchmarks.common import make_records
+
+@pytest.fixture(scope="module")
+def reference(artifact):
+    from model import MenstrualCyclePredictionModel
+    return MenstrualCyclePredictionModel(cache_size=0).load(artifact, backend="numpy")
+
+@pytest.fixture(scope="module")
+def records():
+    from model import normalize_record
+    return [normalize_record(r) for r in make_records(1000, seed=7)]
+
+@pytest.mark.parametrize("backend", ["onnxruntime", "sklearn", "keras"])
+def test_backend_matches_numpy(artifact, reference, records, backend):
+    from model import MenstrualCyclePredictionModel
+    try:
+        model = MenstrualCyclePredictionModel(cache_size=0).load(artifact, backend=backend)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+    X = encode(reference.encoder, records)
+    np.testing.assert_allclose(model.infer(X), reference.infer(X), rtol=0, atol=ATOL)
+    np.testing.assert_allclose([model.predict(r) for r in records[:50]],
+                               [reference.predict(r) for r in records[:50]], rtol=0, atol=ATOL)
+
+def test_onnx_pipeline_graph_matches_numpy(reference, records):
+    ort = pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    from onnx_export import build_pipeline_graph, pipeline_inputs
+
+    graph = build_pipeline_graph(reference.encoder, *reference.weights())
+    session = ort.InferenceSession(graph.SerializeToString(), providers=["CPUExecutionProvider"])
+    # Unknown categories map to an all-zero one-hot block
+    rows = [dict(r, Diet="unseen") for r in records[:3]] + records
+    actual = session.run(None, pipeline_inputs(rows, reference.encoder))[0].reshape(-1)
+    np.testing.assert_allclose(actual, reference.infer(encode(reference.encoder, rows)), rtol=0, atol=ATOL)
+
+def test_main_pipeline_export_matches_predict():
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    assert pipeline_parity(1000, seed=11)
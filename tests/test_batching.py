@@ -0,0 +1,71 @@
+"""
+MicroBatcher: batching, error propagation and close()
+"""
+
+import threading
+import numpy as np
+import pytest
+from batching import MicroBatcher
+
+def row_sums(X):
+    return X.sum(axis=1)
+
+def batcher_threads():
+    return [t for t in threading.enumerate() if t.name == "micro-batcher" and t.is_alive()]
+
+def test_concurrent_rows_share_a_batch():
+    batcher = MicroBatcher(row_sums, max_batch=64, max_wait_ms=50)
+    futures = [batcher.submit(np.full(3, i)) for i in range(10)]
+    assert [f.result(5) for f in futures] == [3.0 * i for i in range(10)]
+    assert batcher.stats()["rows"] == 10 and batcher.stats()["batches"] < 10
+    batcher.close()
+
+def test_submitted_row_is_copied():
+    batcher = MicroBatcher(row_sums, max_wait_ms=20)
+    row = np.ones(2)
+    future = batcher.submit(row)
+    row[:] = 100.0  # callers reuse their encoding buffer
+    assert future.result(5) == 2.0
+    batcher.close()
+
+def test_inference_error_reaches_every_caller():
+    def fail(X):
+        raise RuntimeError("boom")
+    batcher = MicroBatcher(fail, max_wait_ms=20)
+    futures = [batcher.submit(np.ones(2)) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(5)
+    assert batcher.stats()["errors"] >= 1
+    batcher.close()
+
+def test_close_answers_queued_rows_and_stops_the_thread():
+    before = len(batcher_threads())
+    batcher = MicroBatcher(row_sums, max_batch=4, max_wait_ms=20)
+    futures = [batcher.submit(np.ones(2)) for _ in range(20)]
+    assert len(batcher_threads()) == before + 1
+
+    batcher.close()
+    assert all(f.result(5) == 2.0 for f in futures)
+    assert len(batcher_threads()) == before
+
+def test_rows_after_close_are_answered_inline():
+    calls = []
+    before = len(batcher_threads())
+
+    def infer(X):
+        calls.append(threading.current_thread().name)
+        return row_sums(X)
+
+    batcher = MicroBatcher(infer, max_wait_ms=20)
+    batcher.close()  # never started: must not start a thread afterwards
+    assert batcher.predict(np.ones(4), timeout=5) == 4.0
+    assert calls == [threading.current_thread().name]
+    assert len(batcher_threads()) == before
+
+def test_close_is_idempotent():
+    batcher = MicroBatcher(row_sums, max_wait_ms=20)
+    batcher.predict(np.ones(2), timeout=5)
+    batcher.close()
+    batcher.close()
+    assert batcher.predict(np.ones(2), timeout=5) == 2.0
@@ -0,0 +1,42 @@
+"""
+FastEncoder against the fitted ColumnTransformer it was compiled from
+"""
+
+import numpy as np
+import pytest
+from benchmarks.bench_encoder import build_preprocessors, check_parity, dense
+from benchmarks.common import make_frame
+from fast_encoder import FastEncoder
+from model import NUM_COLS, CAT_COLS
+
+@pytest.fixture(scope="module")
+def preprocessors():
+    return build_preprocessors(make_frame(1000, seed=42))
+
+@pytest.fixture(scope="module")
+def X():
+    X = make_frame(500, seed=7)[NUM_COLS + CAT_COLS]
+    # Unseen categories must encode to an all-zero block
+    X.loc[X.index[::50], "Diet"] = "paleo"
+    return X
+
+@pytest.mark.parametrize("name", ["passthrough", "standard_scaler"])
+def test_matches_preprocessor_transform(preprocessors, X, name):
+    pre = preprocessors[name]
+    check_parity(pre, FastEncoder.from_preprocessor(pre), X)
+
+def test_unseen_category_leaves_block_zero(preprocessors, X):
+    encoder = FastEncoder.from_preprocessor(preprocessors["passthrough"])
+    j = encoder.cat_cols.index("Diet")
+    start, stop = encoder.offsets[j], encoder.offsets[j] + encoder.slots[j]
+    row = encoder.transform_one(X.iloc[0].to_dict())
+    assert X.iloc[0]["Diet"] == "paleo"
+    assert not row[0, start:stop].any()
+
+def test_transform_one_out_buffer(preprocessors, X):
+    pre = preprocessors["standard_scaler"]
+    encoder = FastEncoder.from_preprocessor(pre)
+    out = np.empty((len(X), encoder.n_features))
+    for i, record in enumerate(X.to_dict(orient="records")):
+        encoder.transform_one(record, out=out[i:i + 1])
+    np.testing.assert_array_equal(out, dense(pre.transform(X)))
@@ -0,0 +1,100 @@
+"""
+Multi-cycle forecast dates (model.forecast) and the iCalendar feed (calendar_feed.py)
+"""
+
+import math
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from benchmarks.bench_encoder import build_preprocessors
+from benchmarks.common import make_frame, make_records
+from calendar_feed import _escape, _fold, ics_lines
+from fast_encoder import FastEncoder
+from model import DAYS_PER_YEAR, MAX_HORIZON, MenstrualCyclePredictionModel
+from numpy_engine import NumpyMLP
+
+@pytest.fixture(scope="module")
+def linear_model():
+    """days = Cycle Length + 0.5 * Age + 0.25 on raw features, so every cycle has a fractional length"""
+    encoder = FastEncoder.from_preprocessor(build_preprocessors(make_frame(500, seed=1))["passthrough"])
+    kernel = np.zeros((encoder.n_features, 1))
+    kernel[encoder.num_cols.index("Cycle Length")] = 1.0
+    kernel[encoder.num_cols.index("Age")] = 0.5
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0)
+    mcp_model.encoder = encoder
+    mcp_model.engine = NumpyMLP([kernel], [np.array([0.25])], ["linear"])
+    return mcp_model
+
+@pytest.fixture
+def record():
+    return dict(make_records(1, seed=4)[0], Age=30, **{"Cycle Length": 28})
+
+def test_days_and_dates(linear_model, record):
+    result = linear_model.forecast(record, horizon=4, cycle_start="2027-12-20")
+    ages = 30 + np.arange(4) * 28 / DAYS_PER_YEAR
+    expected_days = 28 + 0.5 * ages + 0.25
+    np.testing.assert_allclose(result["days"], expected_days)
+    np.testing.assert_allclose(result["offsets"], np.cumsum(expected_days))
+
+    # Whole days from the cycle start, across a year end and February of a leap year
+    expected_dates = [date(2027, 12, 20) + timedelta(days=math.floor(o)) for o in np.cumsum(expected_days)]
+    assert result["dates"].dtype == np.dtype("datetime64[D]")
+    assert list(result["dates"].astype(object)) == expected_dates
+    assert result["low"] is None and result["high"] is None
+
+def test_matches_predict_loop(linear_model, record):
+    result = linear_model.forecast(record, horizon=MAX_HORIZON, cycle_start=date(2026, 1, 15))
+    start, dates = date(2026, 1, 15), []
+    offset = 0.0
+    for i in range(MAX_HORIZON):
+        offset += linear_model.predict(dict(record, Age=record["Age"] + i * record["Cycle Length"] / DAYS_PER_YEAR))
+        dates.append(start + timedelta(days=math.floor(offset)))
+    assert result["days"][0] == pytest.approx(linear_model.predict(record))
+    assert list(result["dates"].astype(object)) == dates
+
+def test_without_cycle_start_returns_offsets_only(linear_model, record):
+    result = linear_model.forecast(record, horizon=2)
+    assert result["dates"] is None and len(result["offsets"]) == 2
+
+@pytest.mark.parametrize("horizon", [0, MAX_HORIZON + 1])
+def test_horizon_bounds(linear_model, record, horizon):
+    with pytest.raises(ValueError):
+        linear_model.forecast(record, horizon=horizon)
+
+def unfold(text):
+    return text.replace("\r\n ", "")
+
+def test_fold_keeps_lines_within_75_octets():
+    line = "DESCRIPTION:" + "é" * 100 + "x" * 50
+    folded = _fold(line)
+    physical = folded[:-2].split("\r\n")
+    assert folded.endswith("\r\n")
+    assert all(len(part.encode("utf-8")) <= 75 for part in physical)
+    assert all(part.startswith(" ") for part in physical[1:])
+    # No UTF-8 sequence is split, and unfolding restores the line
+    assert unfold(folded[:-2]) == line
+    assert _fold("SUMMARY:short") == "SUMMARY:short\r\n"
+
+def test_escape():
+    assert _escape("a\\b;c,d\ne") == "a\\\\b\\;c\\,d\\ne"
+
+def test_ics_feed():
+    dates = np.array(["2026-01-30", "2026-02-28"], dtype="datetime64[D]")
+    earliest = np.array(["2026-01-28", "2026-02-24"], dtype="datetime64[D]")
+    latest = np.array(["2026-02-01", "2026-03-04"], dtype="datetime64[D]")
+    lines = list(ics_lines(dates, "user-1", earliest, latest, name="Cycles; mine"))
+    text = unfold("".join(lines))
+
+    assert all(line.endswith("\r\n") for line in lines)
+    assert text.startswith("BEGIN:VCALENDAR\r\n") and text.endswith("END:VCALENDAR\r\n")
+    assert "X-WR-CALNAME:Cycles\\; mine\r\n" in text
+    assert text.count("BEGIN:VEVENT") == 2
+    assert "DTSTART;VALUE=DATE:20260228\r\nDTEND;VALUE=DATE:20260301\r\n" in text
+    assert "Likely between 2026-02-24 and 2026-03-04." in text
+
+    # UIDs depend on the key and cycle number only, so subscribed calendars update in place
+    uids = [line for line in text.split("\r\n") if line.startswith("UID:")]
+    assert uids == [line for line in unfold("".join(ics_lines(dates + 3, "user-1"))).split("\r\n")
+                    if line.startswith("UID:")]
+    assert uids[0] != next(line for line in unfold("".join(ics_lines(dates, "user-2"))).split("\r\n")
+                           if line.startswith("UID:"))
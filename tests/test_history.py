@@ -0,0 +1,123 @@
+"""
+Per-user cycle history: rolling statistics (history_store.py) and access checks (app.py)
+"""
+
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from history_store import CycleHistoryStore, normalize_user_id, user_token
+
+SECRET = "test-secret"
+
+@pytest.fixture
+def store(tmp_path):
+    store = CycleHistoryStore(str(tmp_path / "history.sqlite3"))
+    yield store
+    store.close()
+
+def starts(first, lengths):
+    days = [date.fromisoformat(first)]
+    for length in lengths:
+        days.append(days[-1] + timedelta(days=length))
+    return days
+
+def test_rolling_stats_match_numpy(store):
+    lengths = [28, 31, 26, 29, 35, 27]
+    days = starts("2026-01-03", lengths)
+    for day in days:
+        store.add_cycle("u1", day, period_length=5)
+    features = store.features("u1")
+    assert features["cycles"] == len(lengths)
+    assert features["Cycle Length"] == pytest.approx(np.mean(lengths), abs=1e-12)
+    assert features["cycle_length_std"] == pytest.approx(np.std(lengths, ddof=1), abs=1e-12)
+    assert features["last_cycle_start_date"] == days[-1].isoformat()
+
+def test_single_start_has_no_cycle_length(store):
+    features = store.add_cycle("u1", "2026-01-03", period_length=4)
+    assert features["Cycle Length"] is None and features["cycle_length_std"] is None
+    assert (features["recorded_starts"], features["Period Length"]) == (1, 4)
+
+def test_gap_outside_range_is_a_start_but_not_a_length(store):
+    for day in ["2026-01-01", "2026-01-29", "2026-04-01", "2026-04-30"]:
+        store.add_cycle("u1", day)
+    features = store.features("u1")
+    # 28 and 29 count; the 62-day gap (a month not logged) does not
+    assert (features["recorded_starts"], features["cycles"]) == (4, 2)
+    assert features["Cycle Length"] == pytest.approx(28.5)
+
+def test_backfilled_start_rebuilds_the_user(store):
+    store.add_cycle("u1", "2026-01-01", period_length=5)
+    store.add_cycle("u1", "2026-02-26", period_length=6)   # 56 days: two cycles logged as one
+    store.add_cycle("u1", "2026-01-29")                    # the missing start, added later
+    features = store.features("u1")
+    assert features["cycles"] == 2
+    assert features["Cycle Length"] == pytest.approx(28.0)
+    assert features["cycle_length_std"] == pytest.approx(0.0)
+    # The latest start's period length wins, not the backfilled row's
+    assert (features["last_cycle_start_date"], features["Period Length"]) == ("2026-02-26", 6)
+
+def test_duplicate_start_is_ignored(store):
+    assert store.add_cycles([("u1", "2026-01-01", 5), ("u1", "2026-01-29", 5), ("u1", "2026-01-29", 7)]) == 2
+    assert store.features("u1")["cycles"] == 1
+    assert store.history("u1") == [("2026-01-29", 5), ("2026-01-01", 5)]
+
+def test_user_ids_are_normalized(store):
+    store.add_cycle(" 42 ", "2026-01-01")
+    store.add_cycle(42, "2026-01-29")
+    assert store.features("42")["cycles"] == 1
+    assert normalize_user_id(None) == "" and normalize_user_id(" a ") == "a"
+    assert user_token(SECRET, 42) == user_token(SECRET, " 42")
+
+@pytest.fixture
+def app_module(store, monkeypatch):
+    import app
+    monkeypatch.setattr(app, "history", store)
+    monkeypatch.setenv("MCP_HISTORY_SECRET", SECRET)
+    monkeypatch.setenv("MCP_ADMIN_TOKEN", "admin-token")
+    return app
+
+def test_history_routes_need_the_users_token(app_module):
+    client = app_module.app.test_client()
+    record = {"user_id": "u1", "cycle_start_date": "2026-01-01", "period_length": 5}
+    assert client.post("/history", json=record).status_code == 403
+    assert client.post("/history", json=record, headers={"X-User-Token": user_token(SECRET, "u2")}).status_code == 403
+    assert client.post("/history", json=record, headers={"X-User-Token": user_token(SECRET, "u1")}).status_code == 200
+    assert client.post("/history", json=dict(record, cycle_start_date="2026-01-29",
+                                             user_token=user_token(SECRET, "u1"))).status_code == 200
+
+    assert client.get("/history/u1").status_code == 403
+    assert client.get(f"/history/u1?user_token={user_token(SECRET, 'u1')}").get_json()["history"]["cycles"] == 1
+    assert client.get("/history/u1", headers={"X-Admin-Token": "admin-token"}).status_code == 200
+    assert client.get("/history/u1", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+def test_no_secret_means_admin_only(app_module, monkeypatch):
+    monkeypatch.delenv("MCP_HISTORY_SECRET")
+    client = app_module.app.test_client()
+    record = {"user_id": "u1", "cycle_start_date": "2026-01-01", "user_token": user_token(SECRET, "u1")}
+    assert client.post("/history", json=record).status_code == 403
+    assert client.post("/history", json=record, headers={"X-Admin-Token": "admin-token"}).status_code == 200
+
+def test_apply_history_fills_fields(app_module, store):
+    for day in starts("2026-01-01", [28, 29]):
+        store.add_cycle("u1", day, period_length=5)
+    data = {"user_id": " u1", "user_token": user_token(SECRET, "u1"), "age": 30}
+    with app_module.app.test_request_context():
+        filled, features = app_module.apply_history(data)
+    # 28.5 rounds half up, not to the even 28
+    assert (filled["cycle_length"], filled["period_length"], filled["cycle_start_date"]) == (29, 5, "2026-02-27")
+    assert features["cycles"] == 2
+
+    # Fields sent with the request win over the history
+    with app_module.app.test_request_context():
+        filled, _ = app_module.apply_history(dict(data, cycle_length=31))
+    assert filled["cycle_length"] == 31
+
+def test_apply_history_errors(app_module, store):
+    store.add_cycle("u1", "2026-01-01", period_length=5)
+    with app_module.app.test_request_context():
+        with pytest.raises(PermissionError):
+            app_module.apply_history({"user_id": "u1"})
+        with pytest.raises(ValueError, match="at least two recorded cycle starts"):
+            app_module.apply_history({"user_id": "u1", "user_token": user_token(SECRET, "u1")})
+        # No user_id: the request is used as sent
+        assert app_module.apply_history({"user_id": " ", "age": 30}) == ({"user_id": " ", "age": 30}, None)
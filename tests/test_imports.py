@@ -0,0 +1,31 @@
+"""
+Import budget of the serving path (python -X importtime in a fresh interpreter)
+"""
+
+import os
+import pytest
+from benchmarks.bench_imports import FORBIDDEN, import_times
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Same default budget as python -m benchmarks.bench_imports
+BUDGET_MS = 1000
+
+@pytest.fixture(scope="module")
+def app_imports():
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        # Best of three fresh interpreters
+        runs = [import_times("app") for _ in range(3)]
+    finally:
+        os.chdir(cwd)
+    return min(runs, key=lambda rows: sum(self_us for _, self_us, _, _ in rows))
+
+def test_no_training_only_packages(app_imports):
+    loaded = {name for name, *_ in app_imports}
+    assert not [pkg for pkg in FORBIDDEN if pkg in loaded]
+
+def test_within_budget(app_imports):
+    total_ms = sum(self_us for _, self_us, _, _ in app_imports) / 1000
+    assert total_ms <= BUDGET_MS
@@ -0,0 +1,24 @@
+"""
+lut.py: grid lookups, interpolation and off-grid fallbacks
+"""
+
+import numpy as np
+import pytest
+from lut import PredictionLUT
+
+@pytest.fixture
+def lut():
+    # One discrete axis and a single interpolated Age axis: values 20, 30, 40 at ages 10, 20, 30
+    values = np.array([[20.0, 30.0, 40.0], [21.0, 31.0, 41.0]])
+    return PredictionLUT(values, [("Diet", ["balanced", "vegan"])], [("Age", 10, 10, 3)])
+
+def test_lookup_interpolates(lut):
+    assert lut.lookup({"Diet": "balanced", "Age": 15.0}) == pytest.approx(25.0)
+    assert lut.lookup({"Diet": "vegan", "Age": 30.0}) == pytest.approx(41.0)
+
+@pytest.mark.parametrize("age", [9.9, 30.1, float("nan"), float("inf"), float("-inf")])
+def test_off_grid_falls_back(lut, age):
+    assert lut.lookup({"Diet": "balanced", "Age": age}) is None
+
+def test_unknown_category_falls_back(lut):
+    assert lut.lookup({"Diet": "keto", "Age": 20.0}) is None
@@ -0,0 +1,16 @@
+"""
+main.py: the batch path predicts like predict_cycle()
+"""
+
+import numpy as np
+from benchmarks.common import make_records
+
+def test_batch_matches_single_with_unnormalized_categories(main_app):
+    records = make_records(50, seed=1)
+    records[0] = dict(records[0], Diet="Balanced", **{"Exercise Frequency": "WEEKLY"})
+    # Non-string categories are str()-ed in both paths (unknown here, so an all-zero block)
+    records[1] = dict(records[1], Symptoms=3)
+    records[2] = dict(records[2], Diet=" Balanced ")
+    batch = main_app.predict_cycle_batch(records)
+    single = [main_app.predict_cycle(r) for r in records]
+    np.testing.assert_allclose(batch, single, rtol=0, atol=1e-9)
@@ -0,0 +1,62 @@
+"""
+PredictionCache: LRU eviction, TTL expiry and model generations
+"""
+
+import types
+import pytest
+import prediction_cache
+from prediction_cache import PredictionCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the cache module"""
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(prediction_cache, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(maxsize=2, ttl=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(maxsize=10, ttl=60)
+    cache.put("a", 1)
+    clock.now += 59.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["expirations"], stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1, 0)
+
+def test_zero_ttl_never_expires(clock):
+    cache = PredictionCache(maxsize=10, ttl=0)
+    cache.put("a", 1)
+    clock.now += 1e9
+    assert cache.get("a") == 1
+
+def test_write_from_an_older_generation_is_dropped():
+    cache = PredictionCache(maxsize=10)
+
+    def compute():
+        # The model is replaced while this prediction is being computed
+        cache.clear()
+        return "old model"
+
+    assert cache.get_or_compute("a", compute) == "old model"
+    assert cache.get("a") is None
+    assert cache.get_or_compute("a", lambda: "new model") == "new model"
+    assert cache.get("a") == "new model"
+    assert cache.stats()["generation"] == 1
+
+def test_disabled_cache_always_computes():
+    cache = PredictionCache(maxsize=0)
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute("a", lambda: calls.append(1) or len(calls))
+    assert len(calls) == 3 and cache.stats()["size"] == 0
@@ -0,0 +1,33 @@
+"""
+Quantization (quantize.py): the report for ensembles and int8 engine round-trips
+"""
+
+import numpy as np
+import pytest
+from benchmarks.common import make_frame
+from numpy_engine import NumpyMLP
+from quantize import PRECISIONS, quantization_report, quantize
+
+def test_report_on_ensemble_skips_onnx(tmp_path):
+    pytest.importorskip("tensorflow")
+    from model import MenstrualCyclePredictionModel
+
+    mcp_model = MenstrualCyclePredictionModel(hyperparams={"epochs": 2}, cache_size=0)
+    mcp_model.train_ensemble(make_frame(600, seed=1), n_members=2, workers=1)
+    results = quantization_report(mcp_model, out_dir=str(tmp_path), latency_calls=20, batch_size=32)
+
+    # numpy only, even when onnx/onnxruntime are installed
+    assert [(r["precision"], r["backend"]) for r in results] == [(p, "numpy") for p in PRECISIONS]
+    assert all(r["onnx_kb"] is None for r in results)
+    assert not (tmp_path / "float32" / "v0001" / "model.onnx").exists()
+
+def test_int8_engine_round_trips_scales(tmp_path):
+    rng = np.random.default_rng(0)
+    kernels, scales = quantize([rng.normal(size=(5, 4)), rng.normal(size=(4, 1))], "int8")
+    biases = [rng.normal(size=4), rng.normal(size=1)]
+    engine = NumpyMLP(kernels, biases, ["relu", "linear"], scales=scales)
+
+    loaded = NumpyMLP.load(engine.save(str(tmp_path / "int8.npz")))
+    assert loaded.scales == scales
+    X = rng.normal(size=(8, 5))
+    np.testing.assert_array_equal(loaded.predict(X), engine.predict(X))
@@ -0,0 +1,134 @@
+"""
+ModelReloader: swaps, smoke tests and which CURRENT a failed reload rolls back
+"""
+
+import json
+import os
+import time
+import numpy as np
+import pytest
+from artifact import ArtifactError, current_version, resolve_artifact, set_current
+from prediction_cache import PredictionCache
+from reloader import ModelReloader, ReloadError, smoke_test
+
+class FakeModel:
+    """Stands in for a loaded model: predicts a constant, or its LUT's constant when one is enabled"""
+
+    def __init__(self, version, value):
+        self.manifest = {"version": version}
+        self.value = value
+        self.lut = None
+        self.cache = PredictionCache()
+
+    def predict(self, record):
+        return self.lut if self.lut is not None else self.value
+
+    def predict_batch(self, records):
+        return np.full(len(records), self.value)
+
+def make_root(path, versions):
+    """Artifact root with {version: predicted value, or None for a version that fails to load}"""
+    for version, value in versions.items():
+        os.makedirs(os.path.join(path, version))
+        with open(os.path.join(path, version, "manifest.json"), "w") as f:
+            json.dump({"version": version, "value": value}, f)
+    set_current(str(path), next(iter(versions)))
+    return str(path)
+
+def build(path):
+    with open(os.path.join(resolve_artifact(path), "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest["value"] is None:
+        raise ArtifactError("corrupt artifact")
+    return FakeModel(manifest["version"], manifest["value"])
+
+@pytest.fixture
+def served():
+    return {}
+
+def make_reloader(served, root):
+    builds = []
+
+    def counting_build(path):
+        builds.append(path)
+        return build(path)
+
+    reloader = ModelReloader(counting_build, lambda m: served.update(model=m), lambda: served.get("model"), root)
+    reloader.builds = builds
+    assert reloader.reload()["state"] == "succeeded"
+    return reloader
+
+def test_reload_swaps_in_new_version(tmp_path, served):
+    root = make_root(tmp_path / "a", {"v0001": 28.0, "v0002": 30.0})
+    reloader = make_reloader(served, root)
+    set_current(root, "v0002")
+    status = reloader.reload()
+    assert (status["state"], status["previous"], status["version"]) == ("succeeded", "v0001", "v0002")
+    assert served["model"].value == 30.0
+
+def test_failed_load_rolls_back_served_root(tmp_path, served):
+    root = make_root(tmp_path / "a", {"v0001": 28.0, "v0002": None})
+    reloader = make_reloader(served, root)
+    set_current(root, "v0002")
+    status = reloader.reload()
+    assert status["state"] == "rolled_back"
+    assert current_version(root) == "v0001"
+    assert served["model"].manifest["version"] == "v0001"
+
+def test_failed_smoke_test_rolls_back(tmp_path, served):
+    root = make_root(tmp_path / "a", {"v0001": 28.0, "v0002": float("nan")})
+    reloader = make_reloader(served, root)
+    set_current(root, "v0002")
+    assert reloader.reload()["state"] == "rolled_back"
+    assert current_version(root) == "v0001"
+
+def test_failure_on_foreign_root_leaves_its_current(tmp_path, served):
+    root = make_root(tmp_path / "a", {"v0001": 28.0})
+    other = make_root(tmp_path / "b", {"v0001": 28.0, "v0002": None})
+    reloader = make_reloader(served, root)
+    set_current(other, "v0002")
+    status = reloader.reload(other)
+    assert status["state"] == "failed"
+    assert current_version(other) == "v0002"
+    assert current_version(root) == "v0001"
+
+def test_rollback_follows_the_root_being_served(tmp_path, served):
+    root = make_root(tmp_path / "a", {"v0001": 28.0, "v0002": None})
+    other = make_root(tmp_path / "b", {"v0001": 29.0, "v0002": None})
+    reloader = make_reloader(served, root)
+    assert reloader.reload(other)["state"] == "succeeded"
+
+    # Now serving b: a failure on b rolls b back, a failure on a leaves a alone
+    set_current(other, "v0002")
+    assert reloader.reload(other)["state"] == "rolled_back"
+    assert current_version(other) == "v0001"
+    set_current(root, "v0002")
+    assert reloader.reload(root)["state"] == "failed"
+    assert current_version(root) == "v0002"
+
+def test_watcher_does_not_retry_a_failed_version(tmp_path, served):
+    root = make_root(tmp_path / "a", {"v0001": 28.0, "v0002": None})
+    other = make_root(tmp_path / "b", {"v0001": 29.0})
+    reloader = make_reloader(served, root)
+    assert reloader.reload(other)["state"] == "succeeded"
+    builds = len(reloader.builds)
+
+    # a is not the served root, so its bad CURRENT stays and the watcher keeps seeing it
+    set_current(root, "v0002")
+    reloader.start_watcher(interval=0.01)
+    time.sleep(0.3)
+    assert len(reloader.builds) == builds + 1
+    assert reloader.status["state"] == "failed"
+    assert reloader.status["failures"] == 1
+
+def test_smoke_test_bypasses_lut():
+    model = FakeModel("v0001", 28.0)
+    model.lut = 28.5  # within its own error bound, but not within 1e-3 of the network
+    assert smoke_test(model) == [28.0, 28.0]
+    assert model.lut == 28.5
+
+def test_smoke_test_rejects_single_batch_mismatch():
+    model = FakeModel("v0001", 28.0)
+    model.predict = lambda record: 27.0
+    with pytest.raises(ReloadError):
+        smoke_test(model)
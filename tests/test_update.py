@@ -0,0 +1,68 @@
+"""
+Reserved one-hot slots and incremental updates (model.update)
+"""
+
+import numpy as np
+import pytest
+from benchmarks.bench_encoder import build_preprocessors, dense
+from benchmarks.common import make_frame
+from fast_encoder import FastEncoder
+from model import NUM_COLS, CAT_COLS, TARGET_COL
+
+# make_frame's categories: 4 exercise levels, 4 diets, 5 symptoms, each block + 2 reserved slots
+RESERVED_COLUMNS = [10, 11, 16, 17, 23, 24]
+N_FEATURES = 25
+
+@pytest.fixture(scope="module")
+def preprocessor():
+    return build_preprocessors(make_frame(1000, seed=42))["passthrough"]
+
+def test_reserved_slot_layout(preprocessor):
+    encoder = FastEncoder.from_preprocessor(preprocessor, reserved=2)
+    assert encoder.n_features == N_FEATURES
+    assert encoder.offsets == [6, 12, 18]
+    assert encoder.free_slots() == {col: 2 for col in CAT_COLS}
+
+    # preprocessor.transform with zero columns after every one-hot block
+    X = make_frame(300, seed=7)[NUM_COLS + CAT_COLS]
+    encoded = encoder.transform(X)
+    assert not encoded[:, RESERVED_COLUMNS].any()
+    np.testing.assert_array_equal(np.delete(encoded, RESERVED_COLUMNS, axis=1), dense(preprocessor.transform(X)))
+
+def test_new_category_takes_first_free_slot(preprocessor):
+    encoder, assigned = FastEncoder.from_preprocessor(preprocessor, reserved=2).with_categories(
+        {"Diet": ["keto", "pescatarian"]})
+    assert assigned == [("Diet", "pescatarian", 16)]
+    assert encoder.free_slots()["Diet"] == 1
+
+    record = dict(make_frame(1, seed=3)[NUM_COLS + CAT_COLS].iloc[0], Diet="pescatarian")
+    row = encoder.transform_one(record)
+    assert row[0, 16] == 1.0 and not row[0, 12:16].any()
+
+    with pytest.raises(ValueError):
+        encoder.with_categories({"Diet": ["paleo", "carnivore"]})
+
+def test_update_assigns_and_trains_reserved_slot(artifact):
+    from model import MenstrualCyclePredictionModel
+
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0).load(artifact)
+    diet = mcp_model.encoder.cat_cols.index("Diet")
+    index = mcp_model.encoder.offsets[diet] + len(mcp_model.encoder.categories[diet])
+    assert mcp_model.encoder.free_slots()["Diet"] == 2
+    # Never trained (its input is always zero): update() resets it before fitting
+    untrained = np.array(mcp_model.weights()[0][0][index])
+
+    # A diet the model has never seen, with cycles 3 days longer
+    new = make_frame(400, seed=5)
+    new["Diet"] = "pescatarian"
+    new[TARGET_COL] += 3
+    stats = mcp_model.update(new, epochs=3)
+
+    assert stats["new_categories"] == [["Diet", "pescatarian"]]
+    assert mcp_model.encoder.index_maps[diet]["pescatarian"] == index
+    assert mcp_model.encoder.free_slots()["Diet"] == 1
+    # The reserved row of the first layer now carries the new category's weights
+    learned = mcp_model.weights()[0][0][index]
+    assert np.any(learned) and not np.allclose(learned, untrained)
+    record = dict(new[NUM_COLS + CAT_COLS].iloc[0])
+    assert mcp_model.predict(record) != mcp_model.predict(dict(record, Diet="paleo"))
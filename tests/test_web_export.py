@@ -0,0 +1,51 @@
+"""
+Browser model (static/js/mcp_model.js + web_export.py JSON) against the server, under Node
+"""
+
+import json
+import os
+import shutil
+import numpy as np
+import pytest
+from benchmarks.bench_web import ATOL, ROOT, run_node, server_predictions
+from benchmarks.common import make_records
+
+SHIPPED_ASSET = os.path.join(ROOT, "static", "model", "mcp_model.json")
+
+@pytest.fixture(scope="module")
+def node():
+    path = shutil.which("node")
+    if not path:
+        pytest.skip("node is not installed")
+    return path
+
+@pytest.fixture(scope="module")
+def records():
+    records = make_records(500, seed=21)
+    # Mixed case, padded and unseen categories, handled like the server
+    records[0] = dict(records[0], Diet="Balanced", Symptoms="unknown")
+    records[1] = dict(records[1], Diet=" Balanced ", **{"Exercise Frequency": "Daily\t"})
+    return records
+
+def predict_in_node(node, payload, records, tmp_path):
+    asset = str(tmp_path / "mcp_model.json")
+    with open(asset, "w") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    return np.array(run_node(node, asset, records, str(tmp_path))["predictions"])
+
+def test_main_pipeline_export(node, records, main_app, tmp_path):
+    expected, payload = server_predictions(records, None)
+    np.testing.assert_allclose(predict_in_node(node, payload, records, tmp_path), expected, rtol=0, atol=ATOL)
+
+def test_artifact_export(node, records, artifact, tmp_path):
+    expected, payload = server_predictions(records, artifact)
+    np.testing.assert_allclose(predict_in_node(node, payload, records, tmp_path), expected, rtol=0, atol=ATOL)
+
+def test_shipped_asset(node, records, main_app, tmp_path):
+    expected, payload = server_predictions(records, None)
+    with open(SHIPPED_ASSET) as f:
+        shipped = json.load(f)
+    if shipped.get("source") != payload["source"]:
+        pytest.skip(f"{SHIPPED_ASSET} was exported from {shipped.get('source')}, this checkout trains {payload['source']}")
+    actual = np.array(run_node(node, SHIPPED_ASSET, records, str(tmp_path))["predictions"])
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=ATOL)
@@ -3,61 +3,136 @@ One-time script to train and save the MLP model
 Run this once to train the model, then the Flask app will load the saved model
 """
 
-import pandas as pd
+import argparse
 import os
-import kagglehub
+from dataset_cache import load_dataset
 from model import MenstrualCyclePredictionModel
+from quantize import PRECISIONS, quantization_report, print_report
+
+KAGGLE_DATASET = "akshayas02/menstrual-cycle-data-with-factors-dataset"
+KAGGLE_FILE = "menstrual_cycle_dataset_with_factors.csv"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train and save the MCP model")
+    parser.add_argument("--stream", action="store_true",
+                        help="train out-of-core, reading the CSV in chunks (for datasets larger than memory)")
+    parser.add_argument("--chunksize", type=int, default=100_000,
+                        help="rows per chunk in --stream mode")
+    parser.add_argument("--csv", help="local CSV to train on (skips the Kaggle download, works offline)")
+    parser.add_argument("--cache-dir", default=".dataset_cache",
+                        help="where the typed columnar copy of the CSV is cached")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse the CSV")
+    parser.add_argument("--onnx", action="store_true", help="also write model.onnx (needs onnx installed)")
+    parser.add_argument("--ensemble", type=int, metavar="K",
+                        help="train K bootstrap models in parallel and serve their mean with a P10-P90 range")
+    parser.add_argument("--workers", type=int, help="processes for --ensemble (default: one per core)")
+    parser.add_argument("--update", action="store_true",
+                        help="fine-tune the saved model on the new labelled rows in --csv instead of retraining")
+    parser.add_argument("--artifact", default="model_artifact", help="model artifact to save to (and update)")
+    parser.add_argument("--precision", choices=PRECISIONS,
+                        help="store the Dense weights as float16 or int8 (see quantize.py, default float32 "
+                             "or, with --update, the updated artifact's precision)")
+    parser.add_argument("--quantization-report", action="store_true",
+                        help="also save float16/int8 copies under quantized/ and compare them on the test split")
+    args = parser.parse_args()
+    if args.ensemble and args.onnx:
+        parser.error("ensembles cannot be exported to ONNX yet, drop --onnx")
+    if args.stream and args.ensemble:
+        parser.error("--ensemble trains in memory and cannot be combined with --stream")
+    if args.update and (args.stream or args.ensemble or not args.csv):
+        parser.error("--update needs --csv with the new rows and cannot be combined with --stream or --ensemble")
+    return args
 
 def main():
+    args = parse_args()
+    
     print("="*70)
     print("🚀 MCP Model Training Script")
     print("="*70)
     print()
     
-    # Download dataset
-    print("📥 Downloading dataset from Kaggle...")
-    try:
-        path = kagglehub.dataset_download("akshayas02/menstrual-cycle-data-with-factors-dataset")
-        print(f"✅ Dataset downloaded to: {path}")
-    except Exception as e:
-        print(f"❌ Error downloading dataset: {e}")
-        print("\nAlternative: If you have the CSV file, place it in the project folder")
-        print("and update the path below.")
-        return
-    
-    # Load dataset
-    file_name = "menstrual_cycle_dataset_with_factors.csv"
-    csv_path = os.path.join(path, file_name)
+    if args.csv:
+        csv_path = args.csv
+        print(f"📁 Using local dataset: {csv_path}")
+    else:
+        # Download dataset
+        print("📥 Downloading dataset from Kaggle...")
+        try:
+            import kagglehub
+            path = kagglehub.dataset_download(KAGGLE_DATASET)
+            print(f"✅ Dataset downloaded to: {path}")
+        except Exception as e:
+            print(f"❌ Error downloading dataset: {e}")
+            print("\nAlternative: If you have the CSV file, pass it with")
+            print("   python train_model.py --csv path/to/menstrual_cycle_dataset_with_factors.csv")
+            return
+        csv_path = os.path.join(path, KAGGLE_FILE)
     
-    print(f"\n📊 Loading dataset from: {csv_path}")
-    df = pd.read_csv(csv_path)
-    print(f"✅ Dataset loaded! Shape: {df.shape}")
-    print(f"   Rows: {len(df)}, Columns: {len(df.columns)}")
+    model = MenstrualCyclePredictionModel()
     
-    # Create and train model
-    print("\n" + "="*70)
-    print("🧠 Creating and training model...")
-    print("="*70)
+    if args.update:
+        # Incremental: reuse the saved model and encoder, fit only the new rows
+        print(f"\n📊 Loading new rows from: {csv_path}")
+        df = load_dataset(csv_path, cache_dir=args.cache_dir, use_cache=not args.no_cache)
+        print(f"✅ Dataset loaded! Shape: {df.shape}")
+        model.load(args.artifact)
+        precision = args.precision or model.manifest.get("precision", "float32")
+        
+        print("\n" + "="*70)
+        print("🔁 Updating model...")
+        print("="*70)
+        stats = model.update(df)
+        version_dir = model.save(artifact_path=args.artifact, onnx=args.onnx, precision=precision)
+        
+        print("\n" + "="*70)
+        print("✅ UPDATE COMPLETE!")
+        print("="*70)
+        print(f"   • New artifact version: {version_dir}/")
+        print(f"   • Rows: {stats['rows']}, new categories: {len(stats['new_categories'])}")
+        print(f"   • MAE on the new rows: {stats['batch_mae_before']:.4f} -> {stats['batch_mae_after']:.4f} days")
+        print(f"   • Took {stats['seconds']:.1f}s; POST /admin/reload or MCP_WATCH_INTERVAL picks it up without a restart")
+        return
     
-    model = MenstrualCyclePredictionModel()
-    history, mae, rmse = model.train(df)
+    if args.stream:
+        # Out-of-core: the CSV is never fully loaded
+        print(f"\n📊 Streaming dataset from: {csv_path} ({args.chunksize:,} rows per chunk)")
+        print("\n" + "="*70)
+        print("🧠 Creating and training model...")
+        print("="*70)
+        history, mae, rmse = model.train_streaming(csv_path, chunksize=args.chunksize)
+    else:
+        print(f"\n📊 Loading dataset from: {csv_path}")
+        df = load_dataset(csv_path, cache_dir=args.cache_dir, use_cache=not args.no_cache)
+        print(f"✅ Dataset loaded! Shape: {df.shape}")
+        print(f"   Rows: {len(df)}, Columns: {len(df.columns)}")
+        
+        # Create and train model
+        print("\n" + "="*70)
+        print("🧠 Creating and training model...")
+        print("="*70)
+        
+        if args.ensemble:
+            mae, rmse = model.train_ensemble(df, n_members=args.ensemble, workers=args.workers)
+        else:
+            history, mae, rmse = model.train(df)
     
     # Save model
     print("\n" + "="*70)
     print("💾 Saving model...")
     print("="*70)
     
-    model.save(
-        model_path="saved_model",
-        preprocessor_path="preprocessor.pkl"
-    )
+    version_dir = model.save(artifact_path=args.artifact, onnx=args.onnx, precision=args.precision or "float32")
+    
+    if args.quantization_report:
+        print("\n" + "="*70)
+        print("📉 Quantization report (held-out split)...")
+        print_report(quantization_report(model))
     
     print("\n" + "="*70)
     print("✅ TRAINING COMPLETE!")
     print("="*70)
     print("\n📋 Summary:")
-    print(f"   • Model saved to: saved_model/")
-    print(f"   • Preprocessor saved to: preprocessor.pkl")
+    print(f"   • Model artifact saved to: {version_dir}/")
     print(f"   • Model accuracy: {model.model_accuracy:.2f}%")
     print(f"   • MAE: {mae:.4f} days")
     print(f"   • RMSE: {rmse:.4f} days")
@@ -0,0 +1,187 @@
+"""
+Parallel hyperparameter search for the MLP
+
+Runs a grid or random search over hidden sizes, learning rate, batch size and
+early-stopping patience. Each trial trains one model in its own process (one per
+core by default), with BLAS/OpenMP and TensorFlow pinned to a fixed thread count
+so workers don't oversubscribe the CPU. Results go to a CSV table, and the best
+configuration is published as a new version of the artifact app.py loads.
+
+    python tuning.py --csv data.csv --mode random --trials 16 --threads 1
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+SEARCH_SPACE = {
+    "hidden_units": [(16, 8), (32, 16), (64, 32), (32,), (64, 32, 16)],
+    "learning_rate": [0.0003, 0.001, 0.003],
+    "batch_size": [32, 64, 128],
+    "patience": [5, 10],
+}
+
+# Thread-count variables read by NumPy's BLAS, OpenMP and TensorFlow at import time
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+    "TF_NUM_INTEROP_THREADS",
+]
+
+def grid_configs(space=SEARCH_SPACE):
+    """Every combination in the search space"""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+def random_configs(n_trials, space=SEARCH_SPACE, seed=42):
+    """n_trials distinct configurations sampled from the grid"""
+    configs = grid_configs(space)
+    return random.Random(seed).sample(configs, min(n_trials, len(configs)))
+
+def init_worker(threads):
+    """Pin TensorFlow's thread pools before any op runs in this worker"""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+@contextlib.contextmanager
+def training_pool(workers, threads):
+    """Spawn-based process pool of training workers, each pinned to `threads` threads"""
+    # Spawned workers inherit these before NumPy/TensorFlow are imported
+    saved_env = {k: os.environ.get(k) for k in THREAD_ENV_VARS}
+    os.environ.update({k: str(threads) for k in THREAD_ENV_VARS})
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                                 initializer=init_worker, initargs=(threads,)) as pool:
+            yield pool
+    finally:
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+def run_trial(trial_id, config, data_path, cache_dir, out_dir, latency_calls=200):
+    """Train and evaluate one configuration, saving its artifact under out_dir"""
+    import numpy as np
+    from dataset_cache import load_dataset
+    from model import MenstrualCyclePredictionModel, NUM_COLS, CAT_COLS
+
+    df = load_dataset(data_path, cache_dir=cache_dir)
+    mcp_model = MenstrualCyclePredictionModel(hyperparams=config, cache_size=0)
+
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        history, mae, rmse = mcp_model.train(df, verbose=0)
+    train_time = time.perf_counter() - start
+
+    # Single-row serving latency through the NumPy engine
+    records = df[NUM_COLS + CAT_COLS].head(latency_calls).to_dict(orient="records")
+    samples = np.empty(len(records))
+    for i, record in enumerate(records):
+        t = time.perf_counter()
+        mcp_model.predict(record)
+        samples[i] = time.perf_counter() - t
+
+    artifact_dir = os.path.join(out_dir, "runs", f"trial-{trial_id:03d}")
+    with contextlib.redirect_stdout(log):
+        mcp_model.save(artifact_dir)
+
+    return {
+        "trial": trial_id,
+        "hidden_units": "-".join(str(u) for u in config["hidden_units"]),
+        "learning_rate": config["learning_rate"],
+        "batch_size": config["batch_size"],
+        "patience": config["patience"],
+        "epochs_run": len(history.history["loss"]),
+        "mae": float(mae),
+        "rmse": float(rmse),
+        "accuracy": mcp_model.model_accuracy,
+        "train_seconds": round(train_time, 2),
+        "predict_p50_us": round(float(np.median(samples)) * 1e6, 1),
+        "artifact": artifact_dir,
+    }
+
+def run_search(configs, data_path, cache_dir=".dataset_cache", out_dir="tuning_runs",
+               workers=None, threads=1):
+    """Run every config across a spawn-based process pool, returns a results DataFrame"""
+    import pandas as pd
+    from dataset_cache import load_dataset
+
+    # Build the dataset cache once, before the workers race to create it
+    load_dataset(data_path, cache_dir=cache_dir)
+    shutil.rmtree(os.path.join(out_dir, "runs"), ignore_errors=True)
+
+    workers = workers or max(1, (os.cpu_count() or 1) // threads)
+    print(f"🔎 {len(configs)} trials on {workers} workers x {threads} thread(s)")
+
+    results = []
+    with training_pool(workers, threads) as pool:
+        futures = {
+            pool.submit(run_trial, i, config, data_path, cache_dir, out_dir): config
+            for i, config in enumerate(configs)
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"   ❌ {futures[future]}: {e}")
+                continue
+            results.append(result)
+            print(f"   trial {result['trial']:3d}  {result['hidden_units']:>9}  lr={result['learning_rate']:<7g}"
+                  f" batch={result['batch_size']:<4} MAE={result['mae']:.4f}  {result['train_seconds']:.1f}s")
+
+    return pd.DataFrame(results).sort_values(["mae", "rmse"]).reset_index(drop=True)
+
+def publish_best(results, artifact_path="model_artifact"):
+    """Copy the best trial's model into the serving artifact as a new version"""
+    from model import MenstrualCyclePredictionModel
+
+    best = results.iloc[0]
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0).load(best["artifact"], mmap=False)
+    return mcp_model.save(artifact_path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", required=True, help="training CSV")
+    parser.add_argument("--mode", choices=["grid", "random"], default="random")
+    parser.add_argument("--trials", type=int, default=12, help="number of random-search trials")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, help="processes (default: cores / threads)")
+    parser.add_argument("--threads", type=int, default=1, help="TF/BLAS threads per worker")
+    parser.add_argument("--cache-dir", default=".dataset_cache")
+    parser.add_argument("--out-dir", default="tuning_runs")
+    parser.add_argument("--artifact", default="model_artifact", help="where the best model is published")
+    parser.add_argument("--no-publish", action="store_true", help="only write the results table")
+    args = parser.parse_args()
+
+    configs = grid_configs() if args.mode == "grid" else random_configs(args.trials, seed=args.seed)
+    results = run_search(configs, args.csv, cache_dir=args.cache_dir, out_dir=args.out_dir,
+                         workers=args.workers, threads=args.threads)
+    if results.empty:
+        print("❌ Every trial failed")
+        return
+
+    table_path = os.path.join(args.out_dir, "results.csv")
+    results.to_csv(table_path, index=False)
+
+    print("=" * 70)
+    print(results.drop(columns=["artifact"]).head(10).to_string(index=False))
+    print("=" * 70)
+    print(f"📋 Results table: {table_path}")
+    if not args.no_publish:
+        version_dir = publish_best(results, args.artifact)
+        print(f"🏆 Best config (trial {results.iloc[0]['trial']}) published to {version_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Export a trained model for the static browser build (index.html)
+
+Writes one small JSON asset with everything the forward pass needs: scaler
+statistics, one-hot vocabularies and the Dense layer weights. static/js/mcp_model.js
+runs the pipeline in plain JavaScript, so the page loads no Python runtime and
+trains nothing.
+
+    python web_export.py                              # main.py's Pipeline (trains it once if needed)
+    python web_export.py --artifact model_artifact    # the model.py artifact
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+
+FORMAT_NAME = "mcp-web"
+FORMAT_VERSION = 1
+DEFAULT_OUT = os.path.join("static", "model", "mcp_model.json")
+
+def _floats(arr):
+    # float32 weights written at full float32 precision, float64 ones at full float64 precision
+    return np.asarray(arr).tolist()
+
+def _used_rows(encoder):
+    """First-layer rows of the numeric block and the assigned one-hot slots"""
+    rows = list(range(encoder.n_num))
+    for cats, offset in zip(encoder.categories, encoder.offsets):
+        rows.extend(range(offset, offset + len(cats)))
+    return rows
+
+def web_payload(encoder, kernels, biases, activations, accuracy=None, source=None):
+    """JSON-serializable dict for static/js/mcp_model.js"""
+    # Unassigned reserved slots (model.update()) always encode to zero, so their rows are dropped
+    kernels = [np.asarray(kernels[0])[_used_rows(encoder)]] + list(kernels[1:])
+    return {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "source": source,
+        "accuracy": None if accuracy is None else float(accuracy),
+        "num_cols": list(encoder.num_cols),
+        "mean": _floats(encoder.mean),
+        "scale": _floats(encoder.scale),
+        "cat_cols": list(encoder.cat_cols),
+        "categories": [[str(c) for c in cats] for cats in encoder.categories],
+        "activations": [str(a) for a in activations],
+        "layers": [{"W": _floats(w), "b": _floats(b)} for w, b in zip(kernels, biases)],
+    }
+
+def write_payload(payload, path=DEFAULT_OUT):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+def export_artifact(artifact_path, path=DEFAULT_OUT):
+    """Export a model.py artifact (quantized weights are expanded to float32)"""
+    from model import MenstrualCyclePredictionModel
+    mcp_model = MenstrualCyclePredictionModel(cache_size=0).load(artifact_path)
+    if mcp_model.has_intervals:
+        raise ValueError("Ensemble artifacts cannot be exported for the browser yet")
+    source = f"model.py artifact {mcp_model.manifest['version']} ({mcp_model.manifest['artifact_id']})"
+    payload = web_payload(mcp_model.encoder, *mcp_model.weights(), accuracy=mcp_model.model_accuracy, source=source)
+    return write_payload(payload, path)
+
+def export_main_pipeline(path=DEFAULT_OUT):
+    """Export main.py's Pipeline, the model the browser build used to train itself"""
+    import main as main_app
+    from numpy_engine import extract_weights
+    source = f"main.py pipeline {main_app.model_fingerprint()}"
+    payload = web_payload(main_app.encoder, *extract_weights(main_app.model), accuracy=main_app.model_accuracy, source=source)
+    return write_payload(payload, path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact", help="export this model.py artifact instead of main.py's Pipeline")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    args = parser.parse_args()
+
+    path = export_artifact(args.artifact, args.out) if args.artifact else export_main_pipeline(args.out)
+    print(f"✅ Web model written to '{path}' ({os.path.getsize(path) / 1024:.1f} KiB)")
+
+if __name__ == "__main__":
+    main()